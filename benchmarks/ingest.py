@@ -0,0 +1,325 @@
+"""
+Ingest throughput benchmarks for RTDClient and RTDWorker publishing.
+
+Drives RTDClient.UpdateNotify -> refresh_topics -> _handle_quote_update
+with pre-built RefreshData payloads, then publishes the drained changes
+the way RTDWorker does, and times each batch.
+
+batch_ms is per-batch processing time: one synchronous UpdateNotify ->
+consume_updates -> _publish call. It leaves out RTDWorker's wait loop
+and publish_interval coalescing, so it is not RefreshData-to-snapshot
+latency.
+
+Usage:
+    python -m benchmarks.ingest                          # full matrix
+    python -m benchmarks.ingest --topics 1000 --ratios 0.1
+    python -m benchmarks.ingest --compare benchmarks/results/<old>.json <new>.json
+
+Each case runs in a fresh process so peak RSS is per case. Results are
+written to benchmarks/results/ingest-<commit>-<time>.json.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.rtd.client import RTDClient
+from src.rtd.rtd_worker import RTDWorker
+from src.rtd.simulator import PERCENT_QUOTE_TYPES, synthetic_subscriptions
+from src.rtd.snapshot import SnapshotBuffer
+from src.rtd.subscription import SubscriptionPipeline
+from src.rtd.transport import SimulatedTransport
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+DEFAULT_TOPICS = (1000, 10000, 100000)
+DEFAULT_RATIOS = (0.01, 0.1, 1.0)
+# Distinct payloads cycled through while measuring
+PAYLOAD_VARIANTS = 8
+
+
+class PayloadServer:
+    """
+    Minimal IRtdServer returning pre-built RefreshData payloads.
+
+    Payload construction happens before measuring, so the benchmark only
+    times the client and publishing path.
+    """
+
+    def __init__(self) -> None:
+        self.notify_event = None
+        self.topics: Dict[int, Tuple[str, str]] = {}
+        self.payloads: List[List[Any]] = []
+        self._next = 0
+
+    def ServerStart(self, callback: Any) -> int:
+        return 1
+
+    def ConnectData(self, topic_id: int, strings: Sequence[str], get_new_values: Any) -> List[Any]:
+        self.topics[topic_id] = (strings[1], strings[0])
+        return [True, 'N/A']
+
+    def RefreshData(self) -> List[Any]:
+        payload = self.payloads[self._next]
+        self._next = (self._next + 1) % len(self.payloads)
+        return payload
+
+    def DisconnectData(self, topic_id: int) -> int:
+        self.topics.pop(topic_id, None)
+        return 0
+
+    def Heartbeat(self) -> int:
+        return 1
+
+    def ServerTerminate(self) -> None:
+        pass
+
+    def deliver_notifications(self) -> None:
+        pass
+
+    def build_payloads(self, change_ratio: float, seed: int = 7) -> int:
+        """
+        Pre-build RefreshData payloads updating change_ratio of all topics.
+
+        Returns:
+            int: Topics per payload
+        """
+        rng = np.random.default_rng(seed)
+        topic_ids = np.fromiter(self.topics, dtype=np.int64)
+        batch = max(1, int(round(len(topic_ids) * change_ratio)))
+        self.payloads = []
+        for _ in range(PAYLOAD_VARIANTS):
+            ids = rng.choice(topic_ids, size=batch, replace=False).tolist()
+            values = rng.uniform(0.01, 500.0, size=batch).round(4).tolist()
+            raw = tuple(
+                f"{value:.2f}%" if self.topics[topic_id][1] in PERCENT_QUOTE_TYPES else value
+                for topic_id, value in zip(ids, values)
+            )
+            self.payloads.append([batch, (tuple(ids), raw)])
+        return batch
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    except ImportError:
+        return None
+
+
+def _percentile_ms(samples_ns: List[int], q: float) -> float:
+    return float(np.percentile(np.asarray(samples_ns, dtype=np.float64), q)) / 1e6
+
+
+def run_case(topic_count: int, change_ratio: float, batches: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Benchmark one (topic count, change ratio) case.
+
+    Args:
+        topic_count: Subscribed topics
+        change_ratio: Fraction of topics in every RefreshData payload
+        batches: Measured batches, defaults to about 500k topic updates
+
+    Returns:
+        dict: Case parameters and measurements
+    """
+    server = PayloadServer()
+    # Synthetic values must not reach the LMDB stores
+    client = RTDClient(
+        transport=SimulatedTransport(server_factory=lambda: server), quote_db=None, tick_db=None
+    )
+    client.initialize()
+
+    setup_start = time.perf_counter()
+    subscriptions = synthetic_subscriptions(topic_count)
+    SubscriptionPipeline(client, chunk_size=1000, chunk_delay=0, pump=lambda: None).subscribe(subscriptions)
+    setup_seconds = time.perf_counter() - setup_start
+
+    batch_size = server.build_payloads(change_ratio)
+    if batches is None:
+        batches = int(min(2000, max(20, 500_000 // batch_size)))
+
+    worker = RTDWorker(SnapshotBuffer(), threading.Event(), transport=client.transport)
+    worker.client = client
+
+    def ingest_and_publish() -> None:
+        client.UpdateNotify()
+        client.consume_updates()
+        worker._publish()
+
+    for _ in range(PAYLOAD_VARIANTS):  # warm up: every topic has a value
+        ingest_and_publish()
+
+    batch_times: List[int] = []
+    start = time.perf_counter_ns()
+    for _ in range(batches):
+        t0 = time.perf_counter_ns()
+        ingest_and_publish()
+        batch_times.append(time.perf_counter_ns() - t0)
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+
+    # Allocation profile on a separate pass; tracemalloc slows everything down
+    traced_batches = max(5, min(batches, 50))
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot()
+    for _ in range(traced_batches):
+        ingest_and_publish()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    allocated_blocks = sum(max(s.count_diff, 0) for s in stats)
+
+    updates = batches * batch_size
+    result = {
+        'topics': topic_count,
+        'subscribed': len(client.topics),
+        'change_ratio': change_ratio,
+        'batch_size': batch_size,
+        'batches': batches,
+        'updates': updates,
+        'elapsed_sec': elapsed,
+        'updates_per_sec': updates / elapsed,
+        # Per-batch processing time, see the module docstring
+        'batch_ms': {
+            'p50': _percentile_ms(batch_times, 50),
+            'p99': _percentile_ms(batch_times, 99),
+            'max': max(batch_times) / 1e6,
+        },
+        'alloc': {
+            'peak_bytes_per_batch': peak - baseline,
+            'retained_bytes': current - baseline,
+            'retained_blocks': allocated_blocks,
+        },
+        'setup_sec': setup_seconds,
+        'peak_rss_bytes': _peak_rss_bytes(),
+        'snapshot_version': worker.snapshots.version,
+    }
+    # No Disconnect(): unsubscribing is paced by config and the case
+    # process exits right after
+    return result
+
+
+def _run_case_in_process(args: Tuple[int, float, Optional[int]]) -> Dict[str, Any]:
+    return run_case(*args)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
+
+
+def run_suite(
+    topic_counts: Sequence[int] = DEFAULT_TOPICS,
+    ratios: Sequence[float] = DEFAULT_RATIOS,
+    batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run every (topic count, change ratio) combination, each in its own process.
+
+    Returns:
+        dict: Run metadata and the list of case results
+    """
+    context = multiprocessing.get_context('spawn')
+    cases = []
+    for topic_count in topic_counts:
+        for ratio in ratios:
+            with context.Pool(1) as pool:
+                result = pool.apply(_run_case_in_process, ((topic_count, ratio, batches),))
+            cases.append(result)
+            print(_format_case(result))
+
+    return {
+        'benchmark': 'ingest',
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'cases': cases,
+    }
+
+
+def _format_case(case: Dict[str, Any]) -> str:
+    rss = case['peak_rss_bytes']
+    return (
+        f"{case['topics']:>7} topics  ratio {case['change_ratio']:<5} "
+        f"{case['updates_per_sec']:>12,.0f} upd/s  "
+        f"batch p50 {_batch_ms(case)['p50']:8.3f} ms  p99 {_batch_ms(case)['p99']:8.3f} ms  "
+        f"alloc/batch {case['alloc']['peak_bytes_per_batch'] / 1024:9.1f} KiB  "
+        f"peak RSS {rss / 2**20 if rss else float('nan'):7.1f} MiB"
+    )
+
+
+def _batch_ms(case: Dict[str, Any]) -> Dict[str, float]:
+    """Per-batch timings of a case; results from before the rename call them latency_ms."""
+    return case.get('batch_ms') or case['latency_ms']
+
+
+def compare(baseline_path: Path, current_path: Path) -> None:
+    """Print the relative change of each case between two result files."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    current = json.loads(Path(current_path).read_text())
+    by_key = {(c['topics'], c['change_ratio']): c for c in baseline['cases']}
+    print(f"{baseline.get('commit')} -> {current.get('commit')}")
+    for case in current['cases']:
+        old = by_key.get((case['topics'], case['change_ratio']))
+        if old is None:
+            continue
+        throughput = case['updates_per_sec'] / old['updates_per_sec'] - 1
+        p99 = _batch_ms(case)['p99'] / _batch_ms(old)['p99'] - 1
+        print(
+            f"{case['topics']:>7} topics  ratio {case['change_ratio']:<5} "
+            f"throughput {throughput:+7.1%}  p99 batch time {p99:+7.1%}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--topics', type=int, nargs='+', default=list(DEFAULT_TOPICS))
+    parser.add_argument('--ratios', type=float, nargs='+', default=list(DEFAULT_RATIOS))
+    parser.add_argument('--batches', type=int, default=None, help='measured batches per case')
+    parser.add_argument('--output', type=Path, default=None, help='result file (default: benchmarks/results/)')
+    parser.add_argument('--compare', type=Path, nargs=2, metavar=('BASELINE', 'CURRENT'))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run_suite(args.topics, args.ratios, args.batches)
+    output = args.output or RESULTS_DIR / (
+        f"ingest-{results['commit'] or 'nogit'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
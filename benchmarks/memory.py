@@ -0,0 +1,159 @@
+"""
+Memory per subscribed topic of RTDClient's topic and quote structures.
+
+Subscribes N synthetic topics through RTDClient (TopicRegistry, QuoteStore
+slots and parser table), fills every topic with a value, and measures the
+Python heap growth with tracemalloc. For reference the same values are
+also held as a {(symbol, quote_type): Quote} dict, the per-tick object
+representation the columnar store replaced.
+
+Usage:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --topics 1000 20000
+
+Each case runs in a fresh process. Results are written to
+benchmarks/results/memory-<commit>-<time>.json.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.ingest import PayloadServer, RESULTS_DIR, _git_commit, _peak_rss_bytes
+from src.rtd.client import RTDClient
+from src.rtd.simulator import synthetic_subscriptions
+from src.rtd.subscription import SubscriptionPipeline
+from src.rtd.transport import SimulatedTransport
+from src.utils.quote import Quote
+
+DEFAULT_TOPICS = (1000, 10000, 20000, 50000)
+
+
+def _traced_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def run_case(topic_count: int) -> Dict[str, Any]:
+    """
+    Measure memory per topic for one topic count.
+
+    Args:
+        topic_count: Subscribed topics
+
+    Returns:
+        dict: Case parameters and measurements
+    """
+    subscriptions = synthetic_subscriptions(topic_count)
+    tracemalloc.start()
+
+    # Client structures: registry, store slots, parser kinds and values
+    before = _traced_bytes()
+    server = PayloadServer()
+    # Synthetic values must not reach the LMDB stores
+    client = RTDClient(
+        transport=SimulatedTransport(server_factory=lambda: server), quote_db=None, tick_db=None
+    )
+    client.initialize()
+    SubscriptionPipeline(client, chunk_size=1000, chunk_delay=0, pump=lambda: None).subscribe(subscriptions)
+    server.build_payloads(1.0)
+    client.UpdateNotify()
+    # PayloadServer keeps its own topic map and payloads; don't count them
+    server.payloads = []
+    server.topics = {}
+    client_bytes = _traced_bytes() - before
+
+    store = client.store
+    array_bytes = (
+        store.values.nbytes + store.timestamps.nbytes + store.changed_at.nbytes
+        + store.update_counts.nbytes
+    )
+
+    # Reference: one Quote object per topic in a tuple-keyed dict
+    before = _traced_bytes()
+    now = time.time()
+    quotes = {
+        (symbol, quote_type.value): Quote(quote_type, symbol, 1.0, now)
+        for quote_type, symbol in subscriptions
+    }
+    quote_dict_bytes = _traced_bytes() - before
+    tracemalloc.stop()
+
+    return {
+        'topics': topic_count,
+        'subscribed': len(client.topics),
+        'client_bytes_per_topic': client_bytes / topic_count,
+        'store_array_bytes_per_topic': array_bytes / topic_count,
+        'quote_dict_bytes_per_topic': quote_dict_bytes / len(quotes),
+        'quote_object_bytes': sys.getsizeof(next(iter(quotes.values()))),
+        'client_bytes': client_bytes,
+        'peak_rss_bytes': _peak_rss_bytes(),
+    }
+
+
+def run_suite(topic_counts: Sequence[int] = DEFAULT_TOPICS) -> Dict[str, Any]:
+    """
+    Run every topic count, each in its own process.
+
+    Returns:
+        dict: Run metadata and the list of case results
+    """
+    context = multiprocessing.get_context('spawn')
+    cases = []
+    for topic_count in topic_counts:
+        with context.Pool(1) as pool:
+            result = pool.apply(run_case, (topic_count,))
+        cases.append(result)
+        print(_format_case(result))
+
+    return {
+        'benchmark': 'memory',
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'cases': cases,
+    }
+
+
+def _format_case(case: Dict[str, Any]) -> str:
+    return (
+        f"{case['topics']:>7} topics  "
+        f"client {case['client_bytes_per_topic']:7.0f} B/topic "
+        f"(store arrays {case['store_array_bytes_per_topic']:5.0f})  "
+        f"Quote dict {case['quote_dict_bytes_per_topic']:7.0f} B/topic  "
+        f"client total {case['client_bytes'] / 2**20:7.1f} MiB"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--topics', type=int, nargs='+', default=list(DEFAULT_TOPICS))
+    parser.add_argument('--output', type=Path, default=None, help='result file (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.topics)
+    output = args.output or RESULTS_DIR / (
+        f"memory-{results['commit'] or 'nogit'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
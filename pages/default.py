@@ -1,26 +1,28 @@
 #  default.py
 import time
-import threading
-from queue import Queue
 import streamlit as st
-from src.rtd.rtd_worker import RTDWorker
 from src.utils.option_symbol_builder import OptionSymbolBuilder
+from src.analytics.chain_frame import ChainFrame
+from src.analytics.zero_gamma import ZeroGammaSolver
 from src.ui.gamma_chart import GammaChartBuilder
 from src.ui.iv_chart import IVChartBuilder
 from src.ui.greeks_chart import GreeksChartBuilder
 from src.ui.probability_chart import ProbabilityChartBuilder
 from src.ui.expected_move_chart import ExpectedMoveChartBuilder
+from src.ui.stale_strikes import StaleStrikeOverlay
+from src.ui.chart_cache import ChartCache
 from src.ui.dashboard_layout import DashboardLayout
+from src.ui.session import get_broker, get_chart_cache, get_lease_id
 
 # Initialize session state
 if 'initialized' not in st.session_state:
     print("Initializing")
     st.session_state.initialized = False
-    st.session_state.data_queue = Queue()
-    st.session_state.stop_event = threading.Event()
+    st.session_state.last_version = 0
+    st.session_state.subscribed_symbols = []
     st.session_state.current_price = None
     st.session_state.option_symbols = []
-    st.session_state.active_thread = None
+    st.session_state.option_chain = None
     st.session_state.last_figure = None
     st.session_state.loading_complete = False
     st.session_state.last_iv_figure = None
@@ -28,6 +30,10 @@ if 'initialized' not in st.session_state:
     st.session_state.last_prob_figure = None
     st.session_state.last_expected_move_text = None
 
+# One RTD connection per process, shared with other sessions and pages
+broker = get_broker()
+lease_id = get_lease_id("default")
+
 # Setup UI
 DashboardLayout.setup_page()
 symbol, expiry_date, strike_range, strike_spacing, refresh_rate, start_stop_button = DashboardLayout.create_input_section()
@@ -46,6 +52,8 @@ if 'chart_builder' not in st.session_state:
     st.session_state.greeks_chart_builder = GreeksChartBuilder(symbol)
     st.session_state.prob_chart_builder = ProbabilityChartBuilder(symbol)
     st.session_state.expected_move_builder = ExpectedMoveChartBuilder(symbol)
+    st.session_state.stale_overlay = StaleStrikeOverlay()
+    st.session_state.zero_gamma_solver = ZeroGammaSolver()
     st.session_state.last_figure = st.session_state.chart_builder.create_empty_chart()
 
 if st.session_state.last_figure:
@@ -54,15 +62,8 @@ if st.session_state.last_figure:
 # Handle start/stop button clicks
 if start_stop_button:
     if not st.session_state.initialized:
-        # Clean stop any existing thread
-        if st.session_state.active_thread:
-            st.session_state.stop_event.set()
-            st.session_state.active_thread.join(timeout=2.0)  # Increased timeout
-        
         # Reset state
-        st.session_state.stop_event = threading.Event()
-        st.session_state.data_queue = Queue()
-        st.session_state.rtd_worker = RTDWorker(st.session_state.data_queue, st.session_state.stop_event)
+        st.session_state.last_version = 0
         st.session_state.option_symbols = []  # Reset option symbols
         
         # Only reset chart if symbol changed
@@ -76,15 +77,11 @@ if start_stop_button:
             gamma_chart.plotly_chart(st.session_state.last_figure, use_container_width=True, key="reset_chart")
             st.session_state.last_symbol = symbol
         
-        # Start with stock symbol only to get price first
+        # Start with stock symbol only to get price first. The shared broker
+        # reuses the running connection if another session already has one.
         try:
-            thread = threading.Thread(
-                target=st.session_state.rtd_worker.start,
-                args=([symbol],),
-                daemon=True
-            )
-            thread.start()
-            st.session_state.active_thread = thread
+            st.session_state.subscribed_symbols = [symbol]
+            broker.subscribe(lease_id, st.session_state.subscribed_symbols)
             st.session_state.initialized = True
             time.sleep(0.5)  # Give time for initial connection
             st.rerun()
@@ -93,10 +90,8 @@ if start_stop_button:
             st.session_state.initialized = False
     else:
         # Stop tracking but keep the chart
-        st.session_state.stop_event.set()
-        if st.session_state.active_thread:
-            st.session_state.active_thread.join(timeout=1.0)  # Increased timeout
-        st.session_state.active_thread = None
+        broker.release(lease_id)
+        st.session_state.subscribed_symbols = []
         st.session_state.initialized = False
         st.session_state.loading_complete = False
         st.session_state.option_symbols = []  # Reset option symbols
@@ -106,67 +101,87 @@ if start_stop_button:
 # Display updates
 if st.session_state.initialized:
     try:
-        if not st.session_state.data_queue.empty():
-            data = st.session_state.data_queue.get()
+        # Renew this session's lease, then block briefly until the shared
+        # worker publishes a newer snapshot
+        snapshots = broker.subscribe(lease_id, st.session_state.subscribed_symbols)
+        snapshot = snapshots.wait_for_version(
+            st.session_state.last_version, timeout=0.5
+        )
+        if snapshot is not None:
+            st.session_state.last_version = snapshot.version
+            data = snapshot.data
             
-            if "error" in data:
-                st.error(data["error"])
-            elif "status" not in data:
+            if snapshot.error:
+                st.error(snapshot.error)
+            else:
                 price_key = f"{symbol}:LAST"
                 price = data.get(price_key)
                 
                 if price:
-                    # If we just got the price and don't have option symbols yet,
-                    # restart with all symbols
-                    if not st.session_state.option_symbols:
-                        option_symbols = OptionSymbolBuilder.build_symbols(
+                    # Build the option chain once we have a price, and again whenever
+                    # expiry, range or spacing change. Only the difference is
+                    # (un)subscribed on the live connection; no reconnect.
+                    chain_params = (symbol, expiry_date, strike_range, strike_spacing)
+                    if (not st.session_state.option_symbols or
+                            st.session_state.get('chain_params') != chain_params):
+                        option_chain = OptionSymbolBuilder.build_chain(
                             symbol, expiry_date, price, strike_range, strike_spacing
                         )
-                        
-                        # Stop current thread
-                        st.session_state.stop_event.set()
-                        if st.session_state.active_thread:
-                            st.session_state.active_thread.join(timeout=1.0)
-                        
-                        # Start new thread with all symbols
-                        st.session_state.stop_event = threading.Event()
+                        option_symbols = list(option_chain.symbols)
+                        st.session_state.option_chain = option_chain
                         st.session_state.option_symbols = option_symbols
-                        all_symbols = [symbol] + option_symbols
-                        
-                        # Create new RTD worker and thread
-                        st.session_state.rtd_worker = RTDWorker(st.session_state.data_queue, st.session_state.stop_event)
-                        thread = threading.Thread(
-                            target=st.session_state.rtd_worker.start,
-                            args=(all_symbols,),
-                            daemon=True
-                        )
-                        thread.start()
-                        st.session_state.active_thread = thread
-                        time.sleep(0.2)
+                        st.session_state.chain_params = chain_params
+                        st.session_state.subscribed_symbols = [symbol] + option_symbols
+                        broker.subscribe(lease_id, st.session_state.subscribed_symbols)
                 
                 # Update chart
                 if st.session_state.option_symbols:
-                    strikes = []
-                    for sym in st.session_state.option_symbols:
-                        if 'C' in sym:
-                            strike_str = sym.split('C')[-1]
-                            if '.5' in strike_str:
-                                strikes.append(float(strike_str))
-                            else:
-                                strikes.append(int(strike_str))
-                    strikes.sort()
+                    option_chain = st.session_state.option_chain
+                    strikes = option_chain.strike_list()
 
-                    # Create all charts
-                    gamma_fig = st.session_state.chart_builder.create_chart(data, strikes, st.session_state.option_symbols)
-                    iv_fig = st.session_state.iv_chart_builder.create_chart(data, strikes, st.session_state.option_symbols)
-                    greeks_fig = st.session_state.greeks_chart_builder.create_chart(data, strikes, st.session_state.option_symbols)
-                    prob_fig = st.session_state.prob_chart_builder.create_chart(data, strikes, st.session_state.option_symbols)
+                    # Charts and derived metrics are memoized per snapshot version and
+                    # chain, so reruns, pages and sessions on the same data share them
+                    cache = get_chart_cache()
+                    key = ChartCache.chain_key(snapshot.version, option_chain, strike_range, strike_spacing)
 
-                    # Add expected move bands to gamma chart
-                    st.session_state.expected_move_builder.create_reference_lines(gamma_fig, data)
+                    # Gather the chain once; every chart reads the same frame
+                    frame = cache.get_or_create(key + ('frame',), lambda: ChainFrame.from_chain(data, option_chain))
+                    zero_gamma = cache.get_or_create(
+                        key + ('zero_gamma',),
+                        lambda: st.session_state.zero_gamma_solver.solve(frame, snapshot.version)
+                    )
+                    expected_move = cache.get_or_create(
+                        key + ('expected_move',), lambda: st.session_state.expected_move_builder.extract_metrics(data)
+                    )
+
+                    # Staleness moves with the clock, not the snapshot, so it is part of the key
+                    stale = st.session_state.stale_overlay.stale_strikes(data, frame)
+
+                    def build_gamma_fig():
+                        fig = st.session_state.chart_builder.create_chart(data, strikes, st.session_state.option_symbols, frame, zero_gamma)
+                        # Add expected move bands to gamma chart
+                        st.session_state.expected_move_builder.create_reference_lines(fig, data, expected_move)
+                        # Grey out strikes whose quotes stopped changing
+                        st.session_state.stale_overlay.add_to_chart(fig, strikes, stale)
+                        return fig
+
+                    # Create all charts
+                    gamma_fig = cache.get_or_create(key + ('gamma_expected_move', tuple(stale)), build_gamma_fig)
+                    iv_fig = cache.get_or_create(
+                        key + ('iv',),
+                        lambda: st.session_state.iv_chart_builder.create_chart(data, strikes, st.session_state.option_symbols, frame)
+                    )
+                    greeks_fig = cache.get_or_create(
+                        key + ('greeks',),
+                        lambda: st.session_state.greeks_chart_builder.create_chart(data, strikes, st.session_state.option_symbols, frame)
+                    )
+                    prob_fig = cache.get_or_create(
+                        key + ('probability',),
+                        lambda: st.session_state.prob_chart_builder.create_chart(data, strikes, st.session_state.option_symbols, frame)
+                    )
 
                     # Get expected move text
-                    expected_move_text = st.session_state.expected_move_builder.get_display_text(data)
+                    expected_move_text = st.session_state.expected_move_builder.get_display_text(data, expected_move)
 
                     # Update all displays
                     st.session_state.last_figure = gamma_fig
@@ -187,9 +202,11 @@ if st.session_state.initialized:
                         time.sleep(refresh_rate)                     
                     if st.session_state.initialized:
                         st.rerun()
+                elif st.session_state.initialized:
+                    # Still waiting for the underlying price
+                    st.rerun()
         else:
             if st.session_state.initialized:
-                st.sleep(0.5)
                 st.rerun()
                 
     except Exception as e:
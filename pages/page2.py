@@ -1,12 +1,12 @@
 #  page2.py
 import time
-import threading
-from queue import Queue
 from datetime import datetime, date
 import streamlit as st
+import plotly.graph_objects as go
 import plotly.io as pio
-from src.rtd.rtd_worker import RTDWorker
 from src.utils.option_symbol_builder import OptionSymbolBuilder
+from src.analytics.chain_frame import ChainFrame
+from src.analytics.zero_gamma import ZeroGammaSolver
 from src.ui.gamma_chart import GammaChartBuilder
 from src.ui.absolute_gamma_chart import AbsoluteGammaChartBuilder
 from src.ui.iv_chart import IVChartBuilder
@@ -14,6 +14,9 @@ from src.ui.greeks_chart import GreeksChartBuilder
 from src.ui.probability_chart import ProbabilityChartBuilder
 from src.ui.expected_move_chart import ExpectedMoveChartBuilder
 from src.ui.volume_chart import VolumeChartBuilder
+from src.ui.stale_strikes import StaleStrikeOverlay
+from src.ui.chart_cache import ChartCache
+from src.ui.session import get_broker, get_chart_cache, get_lease_id
 
 # Page configuration
 st.set_page_config(page_title="Page 2 - 5 Charts View", layout="wide")
@@ -22,11 +25,11 @@ st.set_page_config(page_title="Page 2 - 5 Charts View", layout="wide")
 if 'p2_initialized' not in st.session_state:
     print("Initializing Page 2")
     st.session_state.p2_initialized = False
-    st.session_state.p2_data_queue = Queue()
-    st.session_state.p2_stop_event = threading.Event()
+    st.session_state.p2_last_version = 0
+    st.session_state.p2_subscribed_symbols = []
     st.session_state.p2_current_price = None
     st.session_state.p2_option_symbols = []
-    st.session_state.p2_active_thread = None
+    st.session_state.p2_option_chain = None
     st.session_state.p2_last_gamma_figure = None
     st.session_state.p2_last_abs_gamma_figure = None
     st.session_state.p2_last_iv_figure = None
@@ -46,6 +49,10 @@ if 'p2_initialized' not in st.session_state:
     st.session_state.p2_show_expected = True
     st.session_state.p2_show_volume = True
 
+# One RTD connection per process, shared with other sessions and pages
+broker = get_broker()
+lease_id = get_lease_id("page2")
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -219,6 +226,8 @@ if 'p2_chart_builder' not in st.session_state:
     st.session_state.p2_greeks_chart_builder = GreeksChartBuilder(symbol)
     st.session_state.p2_prob_chart_builder = ProbabilityChartBuilder(symbol)
     st.session_state.p2_expected_move_builder = ExpectedMoveChartBuilder(symbol)
+    st.session_state.p2_stale_overlay = StaleStrikeOverlay()
+    st.session_state.p2_zero_gamma_solver = ZeroGammaSolver()
     st.session_state.p2_last_gamma_figure = st.session_state.p2_chart_builder.create_empty_chart()
 
 # Display initial empty chart
@@ -229,15 +238,8 @@ if st.session_state.p2_last_gamma_figure and st.session_state.p2_show_gex:
 # Handle start/stop button clicks
 if start_stop_button:
     if not st.session_state.p2_initialized:
-        # Clean stop any existing thread
-        if st.session_state.p2_active_thread:
-            st.session_state.p2_stop_event.set()
-            st.session_state.p2_active_thread.join(timeout=2.0)
-        
         # Reset state
-        st.session_state.p2_stop_event = threading.Event()
-        st.session_state.p2_data_queue = Queue()
-        st.session_state.p2_rtd_worker = RTDWorker(st.session_state.p2_data_queue, st.session_state.p2_stop_event)
+        st.session_state.p2_last_version = 0
         st.session_state.p2_option_symbols = []
         
         # Only reset chart if symbol changed
@@ -255,15 +257,11 @@ if start_stop_button:
                 chart_placeholders['gex'].plotly_chart(st.session_state.p2_last_gamma_figure, use_container_width=True, key="p2_reset_chart")
             st.session_state.p2_last_symbol = symbol
         
-        # Start with stock symbol only to get price first
+        # Start with stock symbol only to get price first. The shared broker
+        # reuses the running connection if another session already has one.
         try:
-            thread = threading.Thread(
-                target=st.session_state.p2_rtd_worker.start,
-                args=([symbol],),
-                daemon=True
-            )
-            thread.start()
-            st.session_state.p2_active_thread = thread
+            st.session_state.p2_subscribed_symbols = [symbol]
+            broker.subscribe(lease_id, st.session_state.p2_subscribed_symbols)
             st.session_state.p2_initialized = True
             time.sleep(0.5)
             st.rerun()
@@ -272,10 +270,8 @@ if start_stop_button:
             st.session_state.p2_initialized = False
     else:
         # Stop tracking but keep the charts
-        st.session_state.p2_stop_event.set()
-        if st.session_state.p2_active_thread:
-            st.session_state.p2_active_thread.join(timeout=1.0)
-        st.session_state.p2_active_thread = None
+        broker.release(lease_id)
+        st.session_state.p2_subscribed_symbols = []
         st.session_state.p2_initialized = False
         st.session_state.p2_loading_complete = False
         st.session_state.p2_option_symbols = []
@@ -284,68 +280,106 @@ if start_stop_button:
 # Display updates
 if st.session_state.p2_initialized and st.session_state.p2_auto_refresh:
     try:
-        if not st.session_state.p2_data_queue.empty():
-            data = st.session_state.p2_data_queue.get()
+        # Renew this session's lease, then block briefly until the shared
+        # worker publishes a newer snapshot
+        snapshots = broker.subscribe(lease_id, st.session_state.p2_subscribed_symbols)
+        snapshot = snapshots.wait_for_version(
+            st.session_state.p2_last_version, timeout=0.5
+        )
+        if snapshot is not None:
+            st.session_state.p2_last_version = snapshot.version
+            data = snapshot.data
             
-            if "error" in data:
-                st.error(data["error"])
-            elif "status" not in data:
+            if snapshot.error:
+                st.error(snapshot.error)
+            else:
                 price_key = f"{symbol}:LAST"
                 price = data.get(price_key)
                 
                 if price:
-                    # If we just got the price and don't have option symbols yet,
-                    # restart with all symbols
-                    if not st.session_state.p2_option_symbols:
-                        option_symbols = OptionSymbolBuilder.build_symbols(
+                    # Build the option chain once we have a price, and again whenever
+                    # expiry, range or spacing change. Only the difference is
+                    # (un)subscribed on the live connection; no reconnect.
+                    chain_params = (symbol, expiry_date, strike_range, strike_spacing)
+                    if (not st.session_state.p2_option_symbols or
+                            st.session_state.get('p2_chain_params') != chain_params):
+                        option_chain = OptionSymbolBuilder.build_chain(
                             symbol, expiry_date, price, strike_range, strike_spacing
                         )
-                        
-                        # Stop current thread
-                        st.session_state.p2_stop_event.set()
-                        if st.session_state.p2_active_thread:
-                            st.session_state.p2_active_thread.join(timeout=1.0)
-                        
-                        # Start new thread with all symbols
-                        st.session_state.p2_stop_event = threading.Event()
+                        option_symbols = list(option_chain.symbols)
+                        st.session_state.p2_option_chain = option_chain
                         st.session_state.p2_option_symbols = option_symbols
-                        all_symbols = [symbol] + option_symbols
-                        
-                        # Create new RTD worker and thread
-                        st.session_state.p2_rtd_worker = RTDWorker(st.session_state.p2_data_queue, st.session_state.p2_stop_event)
-                        thread = threading.Thread(
-                            target=st.session_state.p2_rtd_worker.start,
-                            args=(all_symbols,),
-                            daemon=True
-                        )
-                        thread.start()
-                        st.session_state.p2_active_thread = thread
-                        time.sleep(0.2)
+                        st.session_state.p2_chain_params = chain_params
+                        st.session_state.p2_subscribed_symbols = [symbol] + option_symbols
+                        broker.subscribe(lease_id, st.session_state.p2_subscribed_symbols)
                 
                 # Update charts
                 if st.session_state.p2_option_symbols:
-                    strikes = []
-                    for sym in st.session_state.p2_option_symbols:
-                        if 'C' in sym:
-                            strike_str = sym.split('C')[-1]
-                            if '.5' in strike_str:
-                                strikes.append(float(strike_str))
-                            else:
-                                strikes.append(int(strike_str))
-                    strikes.sort()
+                    option_chain = st.session_state.p2_option_chain
+                    strikes = option_chain.strike_list()
+
+                    # Charts and derived metrics are memoized per snapshot version and
+                    # chain, so reruns, pages and sessions on the same data share them
+                    cache = get_chart_cache()
+                    key = ChartCache.chain_key(snapshot.version, option_chain, strike_range, strike_spacing)
+                    option_symbols = st.session_state.p2_option_symbols
+
+                    # Gather the chain once; every chart reads the same frame
+                    frame = cache.get_or_create(key + ('frame',), lambda: ChainFrame.from_chain(data, option_chain))
+                    zero_gamma = cache.get_or_create(
+                        key + ('zero_gamma',),
+                        lambda: st.session_state.p2_zero_gamma_solver.solve(frame, snapshot.version)
+                    )
+                    expected_move = cache.get_or_create(
+                        key + ('expected_move',), lambda: st.session_state.p2_expected_move_builder.extract_metrics(data)
+                    )
+
+                    # Staleness moves with the clock, not the snapshot, so it is part of the key
+                    stale = st.session_state.p2_stale_overlay.stale_strikes(data, frame)
+
+                    # GEX is built once; the GEX and expected move charts decorate copies of it
+                    gamma_base = cache.get_or_create(
+                        key + ('gamma',),
+                        lambda: st.session_state.p2_chart_builder.create_chart(data, strikes, option_symbols, frame, zero_gamma)
+                    )
+
+                    def build_gamma_fig():
+                        fig = go.Figure(gamma_base)
+                        # Grey out strikes whose quotes stopped changing
+                        st.session_state.p2_stale_overlay.add_to_chart(fig, strikes, stale)
+                        return fig
+
+                    def build_abs_gamma_fig():
+                        fig = st.session_state.p2_abs_gamma_chart_builder.create_chart(data, strikes, option_symbols, frame)
+                        st.session_state.p2_stale_overlay.add_to_chart(fig, strikes, stale)
+                        return fig
+
+                    def build_expected_move_fig():
+                        fig = go.Figure(gamma_base)
+                        fig.update_layout(title="Expected Move with GEX")
+                        st.session_state.p2_expected_move_builder.create_reference_lines(fig, data, expected_move)
+                        return fig
 
                     # Create all 7 charts
-                    gamma_fig = st.session_state.p2_chart_builder.create_chart(data, strikes, st.session_state.p2_option_symbols)
-                    abs_gamma_fig = st.session_state.p2_abs_gamma_chart_builder.create_chart(data, strikes, st.session_state.p2_option_symbols)
-                    volume_fig = st.session_state.p2_volume_chart_builder.create_chart(data, strikes, st.session_state.p2_option_symbols)
-                    iv_fig = st.session_state.p2_iv_chart_builder.create_chart(data, strikes, st.session_state.p2_option_symbols)
-                    greeks_fig = st.session_state.p2_greeks_chart_builder.create_chart(data, strikes, st.session_state.p2_option_symbols)
-                    prob_fig = st.session_state.p2_prob_chart_builder.create_chart(data, strikes, st.session_state.p2_option_symbols)
-                    
-                    # Create a copy of gamma chart for expected move visualization
-                    expected_move_fig = st.session_state.p2_chart_builder.create_chart(data, strikes, st.session_state.p2_option_symbols)
-                    expected_move_fig.update_layout(title="Expected Move with GEX")
-                    st.session_state.p2_expected_move_builder.create_reference_lines(expected_move_fig, data)
+                    gamma_fig = cache.get_or_create(key + ('gamma_stale', tuple(stale)), build_gamma_fig)
+                    abs_gamma_fig = cache.get_or_create(key + ('absolute_gamma', tuple(stale)), build_abs_gamma_fig)
+                    volume_fig = cache.get_or_create(
+                        key + ('volume',),
+                        lambda: st.session_state.p2_volume_chart_builder.create_chart(data, strikes, option_symbols, frame)
+                    )
+                    iv_fig = cache.get_or_create(
+                        key + ('iv',),
+                        lambda: st.session_state.p2_iv_chart_builder.create_chart(data, strikes, option_symbols, frame)
+                    )
+                    greeks_fig = cache.get_or_create(
+                        key + ('greeks',),
+                        lambda: st.session_state.p2_greeks_chart_builder.create_chart(data, strikes, option_symbols, frame)
+                    )
+                    prob_fig = cache.get_or_create(
+                        key + ('probability',),
+                        lambda: st.session_state.p2_prob_chart_builder.create_chart(data, strikes, option_symbols, frame)
+                    )
+                    expected_move_fig = cache.get_or_create(key + ('expected_move_chart',), build_expected_move_fig)
 
                     # Update last refresh time
                     st.session_state.p2_last_refresh = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -388,13 +422,15 @@ if st.session_state.p2_initialized and st.session_state.p2_auto_refresh:
                         chart_col = create_download_button(expected_move_fig, "ExpectedMove")
                         chart_col.plotly_chart(expected_move_fig, use_container_width=True, key="p2_update_expected")
 
+                    # Removed blocking time.sleep(refresh_rate / 2)
                     if not st.session_state.p2_loading_complete:
                         st.session_state.p2_loading_complete = True
-                    else:
-                        # Removed blocking time.sleep(refresh_rate / 2)
 
                     if st.session_state.p2_initialized:
                         st.rerun()
+                elif st.session_state.p2_initialized:
+                    # Still waiting for the underlying price
+                    st.rerun()
         else:
             if st.session_state.p2_initialized:
                 # Removed blocking time.sleep(.5)
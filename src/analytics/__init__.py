@@ -0,0 +1,10 @@
+from .black_scholes import gamma, greeks, norm_cdf, norm_pdf
+from .chain_frame import CHAIN_FIELDS, ChainFrame, parse_option_symbol
+from .greeks_engine import LocalGreeksEngine, greeks_source
+from .zero_gamma import ZeroGammaSolver, expiry_close, find_zero_crossing, gamma_profile, time_to_expiry
+
+__all__ = [
+    'gamma', 'greeks', 'norm_cdf', 'norm_pdf', 'CHAIN_FIELDS', 'ChainFrame', 'parse_option_symbol',
+    'ZeroGammaSolver', 'expiry_close', 'find_zero_crossing', 'gamma_profile', 'time_to_expiry',
+    'LocalGreeksEngine', 'greeks_source',
+]
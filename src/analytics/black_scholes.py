@@ -0,0 +1,132 @@
+from typing import Dict, Union
+
+import numpy as np
+
+
+ArrayLike = Union[float, np.ndarray]
+
+# Abramowitz & Stegun 7.1.26 coefficients (|error| < 1.5e-7)
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+_SQRT_2 = np.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+# Smallest time to expiry used, so 0DTE contracts near the close stay finite
+MIN_TIME_TO_EXPIRY = 1.0 / (365.0 * 24.0 * 60.0)
+
+
+def norm_pdf(x: ArrayLike) -> np.ndarray:
+    """Standard normal density, vectorized."""
+    x = np.asarray(x, dtype=np.float64)
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def norm_cdf(x: ArrayLike) -> np.ndarray:
+    """Standard normal cumulative distribution, vectorized without scipy."""
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x) / _SQRT_2
+    t = 1.0 / (1.0 + _ERF_P * z)
+    a1, a2, a3, a4, a5 = _ERF_A
+    poly = ((((a5 * t + a4) * t + a3) * t + a2) * t + a1) * t
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def d1_d2(spot: ArrayLike, strike: ArrayLike, time: ArrayLike, rate: float, vol: ArrayLike):
+    """
+    Compute the Black-Scholes d1 and d2 terms.
+
+    Args:
+        spot: Underlying price
+        strike: Strike price
+        time: Time to expiry in years
+        rate: Continuously compounded risk-free rate
+        vol: Annualized volatility as a fraction (0.2 = 20%)
+
+    Returns:
+        tuple: (d1, d2, vol * sqrt(time)) arrays
+    """
+    time = np.maximum(np.asarray(time, dtype=np.float64), MIN_TIME_TO_EXPIRY)
+    vol_sqrt_t = np.maximum(np.asarray(vol, dtype=np.float64), 1e-6) * np.sqrt(time)
+    d1 = (np.log(np.asarray(spot, dtype=np.float64) / strike) + rate * time) / vol_sqrt_t + 0.5 * vol_sqrt_t
+    return d1, d1 - vol_sqrt_t, vol_sqrt_t
+
+
+def gamma(spot: ArrayLike, strike: ArrayLike, time: ArrayLike, rate: float, vol: ArrayLike) -> np.ndarray:
+    """
+    Black-Scholes gamma (same for calls and puts), vectorized.
+
+    Args:
+        spot: Underlying price
+        strike: Strike price
+        time: Time to expiry in years
+        rate: Continuously compounded risk-free rate
+        vol: Annualized volatility as a fraction
+
+    Returns:
+        np.ndarray: Gamma per contract share
+    """
+    d1, _, vol_sqrt_t = d1_d2(spot, strike, time, rate, vol)
+    return norm_pdf(d1) / (np.asarray(spot, dtype=np.float64) * vol_sqrt_t)
+
+
+def greeks(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    time: ArrayLike,
+    rate: float,
+    vol: ArrayLike,
+    is_call: ArrayLike
+) -> Dict[str, np.ndarray]:
+    """
+    Price, greeks and expiry probabilities for European options, vectorized.
+
+    Units follow ThinkorSwim: theta per calendar day, vega and rho per
+    1 point (1%) change, probabilities as fractions.
+
+    Args:
+        spot: Underlying price
+        strike: Strike price
+        time: Time to expiry in years
+        rate: Continuously compounded risk-free rate
+        vol: Annualized volatility as a fraction
+        is_call: True for calls, False for puts
+
+    Returns:
+        dict: 'price', 'delta', 'gamma', 'theta', 'vega', 'rho',
+              'prob_itm' and 'prob_touch' arrays
+    """
+    spot = np.asarray(spot, dtype=np.float64)
+    strike = np.asarray(strike, dtype=np.float64)
+    time = np.maximum(np.asarray(time, dtype=np.float64), MIN_TIME_TO_EXPIRY)
+    is_call = np.asarray(is_call, dtype=bool)
+
+    d1, d2, vol_sqrt_t = d1_d2(spot, strike, time, rate, vol)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(d1)
+    cdf_d2 = norm_cdf(d2)
+    discount = strike * np.exp(-rate * time)
+
+    call_price = spot * cdf_d1 - discount * cdf_d2
+    put_price = call_price - spot + discount  # put-call parity
+    decay = -spot * pdf_d1 * vol_sqrt_t / (2.0 * time)
+
+    prob_itm = np.where(is_call, cdf_d2, 1.0 - cdf_d2)
+    return {
+        'price': np.where(is_call, call_price, put_price),
+        'delta': np.where(is_call, cdf_d1, cdf_d1 - 1.0),
+        'gamma': pdf_d1 / (spot * vol_sqrt_t),
+        'theta': np.where(
+            is_call,
+            decay - rate * discount * cdf_d2,
+            decay + rate * discount * (1.0 - cdf_d2)
+        ) / 365.0,
+        'vega': spot * pdf_d1 * np.sqrt(time) / 100.0,
+        'rho': np.where(
+            is_call,
+            discount * time * cdf_d2,
+            -discount * time * (1.0 - cdf_d2)
+        ) / 100.0,
+        'prob_itm': prob_itm,
+        'prob_touch': np.minimum(2.0 * np.minimum(prob_itm, 1.0 - prob_itm), 1.0),
+    }
@@ -0,0 +1,241 @@
+from datetime import date, datetime
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+import re
+
+import numpy as np
+
+from src.utils.option_chain import OptionChain
+
+
+# Quote types gathered per contract
+CHAIN_FIELDS = (
+    'GAMMA', 'OPEN_INT', 'IMPL_VOL', 'DELTA', 'THETA', 'VEGA', 'RHO', 'VOLUME',
+    'PROB_OF_EXPIRING', 'PROB_OTM', 'PROB_OF_TOUCHING',
+)
+
+# .{root}{yymmdd}{C|P}{strike}, e.g. .SPXW250129C6000 or .SPY250129P602.5
+_OPTION_SYMBOL = re.compile(r'^\.(?P<root>.+?)(?P<expiry>\d{6})(?P<side>[CP])(?P<strike>\d+(?:\.\d+)?)$')
+
+# Weekly/PM-settled roots quoted against their index
+ROOT_UNDERLYINGS = {'SPXW': 'SPX', 'NDXP': 'NDX', 'RUTW': 'RUT'}
+
+# Shares per contract
+CONTRACT_MULTIPLIER = 100
+
+
+def parse_option_symbol(symbol: str) -> Optional[Tuple[str, str, str, float]]:
+    """
+    Split a ThinkorSwim option symbol into its parts.
+
+    Args:
+        symbol: Option symbol, e.g. ".SPY250129C601"
+
+    Returns:
+        tuple: (root, yymmdd, 'C' or 'P', strike), None if not an option symbol
+    """
+    match = _OPTION_SYMBOL.match(symbol)
+    if match is None:
+        return None
+    return match['root'], match['expiry'], match['side'], float(match['strike'])
+
+
+class ChainFrame:
+    """
+    Strike-aligned NumPy arrays of one option chain snapshot.
+
+    Built once per snapshot and shared by every chart builder. Row i of
+    each array belongs to strikes[i]; contracts are matched to strikes by
+    their parsed strike, so C60 never picks up C600. Missing values are
+    NaN, and strikes without a listed contract are flagged in has_call /
+    has_put.
+
+    Attributes:
+        symbol (str): Underlying symbol
+        price (float): Underlying last price, 0 if unknown
+        strikes (np.ndarray): Sorted strikes (float64)
+        call_symbols (list): Call symbol per strike, None if not listed
+        put_symbols (list): Put symbol per strike, None if not listed
+        has_call (np.ndarray): True where the strike has a call
+        has_put (np.ndarray): True where the strike has a put
+        expiry (date): Expiration date, None if unknown
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        price: float,
+        strikes: Iterable[float],
+        call_symbols: Sequence[Optional[str]],
+        put_symbols: Sequence[Optional[str]],
+        calls: Dict[str, np.ndarray],
+        puts: Dict[str, np.ndarray],
+        expiry: Optional[date] = None
+    ) -> None:
+        self.symbol = symbol
+        self.price = price
+        self.strikes = np.asarray(strikes, dtype=np.float64)
+        self.call_symbols = list(call_symbols)
+        self.put_symbols = list(put_symbols)
+        self.has_call = np.array([sym is not None for sym in self.call_symbols], dtype=bool)
+        self.has_put = np.array([sym is not None for sym in self.put_symbols], dtype=bool)
+        self._calls = calls
+        self._puts = puts
+        self.expiry = expiry
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        data: Mapping[str, float],
+        symbol: str,
+        strikes: Iterable[float],
+        option_symbols: Iterable[str],
+        fields: Sequence[str] = CHAIN_FIELDS
+    ) -> 'ChainFrame':
+        """
+        Gather a chain's values from snapshot data.
+
+        Args:
+            data: Snapshot data ({"symbol:QUOTE_TYPE": value})
+            symbol: Underlying symbol
+            strikes: Strikes to align on
+            option_symbols: Call and put symbols of the chain
+            fields: Quote types to gather
+
+        Returns:
+            ChainFrame: Frame for the snapshot
+        """
+        strikes = np.sort(np.asarray(list(strikes), dtype=np.float64))
+        by_contract = {}
+        expiry = None
+        for option_symbol in option_symbols:
+            parts = parse_option_symbol(option_symbol)
+            if parts is not None:
+                by_contract[(parts[2], parts[3])] = option_symbol
+                expiry = expiry or parts[1]
+        call_symbols = [by_contract.get(('C', strike)) for strike in strikes.tolist()]
+        put_symbols = [by_contract.get(('P', strike)) for strike in strikes.tolist()]
+
+        try:
+            price = float(data.get(f"{symbol}:LAST", 0) or 0)
+        except (ValueError, TypeError):
+            price = 0.0
+        return cls(
+            symbol, price, strikes, call_symbols, put_symbols,
+            {field: cls.gather(data, call_symbols, field) for field in fields},
+            {field: cls.gather(data, put_symbols, field) for field in fields},
+            datetime.strptime(expiry, '%y%m%d').date() if expiry else None,
+        )
+
+    @classmethod
+    def from_chain(
+        cls,
+        data: Mapping[str, float],
+        chain: OptionChain,
+        fields: Sequence[str] = CHAIN_FIELDS
+    ) -> 'ChainFrame':
+        """
+        Gather the values of an OptionChain from snapshot data.
+
+        Rows follow the chain, so no symbol parsing or matching is needed.
+
+        Args:
+            data: Snapshot data ({"symbol:QUOTE_TYPE": value})
+            chain: Option chain from OptionSymbolBuilder.build_chain()
+            fields: Quote types to gather
+
+        Returns:
+            ChainFrame: Frame for the snapshot
+        """
+        call_symbols = chain.call_symbols.tolist()
+        put_symbols = chain.put_symbols.tolist()
+        try:
+            price = float(data.get(f"{chain.underlying}:LAST", 0) or 0)
+        except (ValueError, TypeError):
+            price = 0.0
+        return cls(
+            chain.underlying, price, chain.strikes, call_symbols, put_symbols,
+            {field: cls.gather(data, call_symbols, field) for field in fields},
+            {field: cls.gather(data, put_symbols, field) for field in fields},
+            chain.expiry,
+        )
+
+    @staticmethod
+    def gather(data: Mapping[str, float], symbols: Sequence[Optional[str]], field: str) -> np.ndarray:
+        """Look up one quote type for every contract, NaN where missing."""
+        get = data.get
+        nan = np.nan
+        return np.fromiter(
+            (nan if sym is None else get(f"{sym}:{field}", nan) for sym in symbols),
+            dtype=np.float64,
+            count=len(symbols),
+        )
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    def call(self, field: str, fill: Optional[float] = None) -> np.ndarray:
+        """
+        Get a call quote type per strike.
+
+        Args:
+            field: Quote type, e.g. 'GAMMA'
+            fill: Value for listed calls without data; None keeps NaN.
+                  Strikes without a call stay NaN either way.
+
+        Returns:
+            np.ndarray: Values aligned with strikes
+        """
+        return self._side(self._calls, self.has_call, field, fill)
+
+    def put(self, field: str, fill: Optional[float] = None) -> np.ndarray:
+        """Get a put quote type per strike, see call()."""
+        return self._side(self._puts, self.has_put, field, fill)
+
+    @staticmethod
+    def _side(values: Dict[str, np.ndarray], listed: np.ndarray, field: str, fill: Optional[float]) -> np.ndarray:
+        result = values[field].copy()
+        if fill is not None:
+            result[listed & np.isnan(result)] = fill
+        return result
+
+    def combined(self, field: str) -> np.ndarray:
+        """
+        Sum a quote type over call and put per strike.
+
+        Missing values count as 0; strikes missing a call or a put are NaN.
+
+        Args:
+            field: Quote type, e.g. 'DELTA'
+
+        Returns:
+            np.ndarray: Call + put value per strike
+        """
+        return self.call(field, fill=0.0) + self.put(field, fill=0.0)
+
+    def gex_per_contract(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gamma exposure of calls and puts per 1% move of the underlying.
+
+        OI * gamma * 100 shares * price^2 * 1%, 0 where data is missing.
+
+        Returns:
+            tuple: (call GEX, put GEX) arrays
+        """
+        scale = CONTRACT_MULTIPLIER * self.price * self.price * 0.01
+        call_gex = np.nan_to_num(self.call('OPEN_INT', 0.0) * self.call('GAMMA', 0.0)) * scale
+        put_gex = np.nan_to_num(self.put('OPEN_INT', 0.0) * self.put('GAMMA', 0.0)) * scale
+        return call_gex, put_gex
+
+    def net_gex(self) -> np.ndarray:
+        """
+        Net dealer gamma exposure per strike (call GEX - put GEX) per 1% move.
+
+        Strikes missing a call or a put are 0.
+
+        Returns:
+            np.ndarray: Net GEX per strike
+        """
+        call_gex, put_gex = self.gex_per_contract()
+        net = call_gex - put_gex
+        net[~(self.has_call & self.has_put)] = 0.0
+        return net
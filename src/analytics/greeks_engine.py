@@ -0,0 +1,213 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import time
+
+import numpy as np
+
+from src.analytics.black_scholes import greeks
+from src.analytics.chain_frame import ROOT_UNDERLYINGS, parse_option_symbol
+from src.analytics.zero_gamma import SECONDS_PER_YEAR, expiry_close
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+
+
+logger = get_logger(__name__)
+
+# options.greeks_source values
+GREEKS_SOURCE_RTD = 'rtd'
+GREEKS_SOURCE_LOCAL = 'local'
+GREEKS_SOURCE_VALIDATE = 'validate'
+
+# Quote types computed locally; units follow ThinkorSwim (probabilities in percent)
+LOCAL_GREEK_FIELDS = (
+    'DELTA', 'GAMMA', 'THETA', 'VEGA', 'RHO',
+    'PROB_OF_EXPIRING', 'PROB_OTM', 'PROB_OF_TOUCHING',
+)
+
+
+def greeks_source() -> str:
+    """Get options.greeks_source from config: 'rtd', 'local' or 'validate'."""
+    source = SETTINGS.get('options', {}).get('greeks_source', GREEKS_SOURCE_RTD)
+    if source not in (GREEKS_SOURCE_RTD, GREEKS_SOURCE_LOCAL, GREEKS_SOURCE_VALIDATE):
+        logger.warning(f"Unknown options.greeks_source '{source}', using RTD greeks")
+        return GREEKS_SOURCE_RTD
+    return source
+
+
+class LocalGreeksEngine:
+    """
+    Computes option greeks from IMPL_VOL and the underlying's LAST.
+
+    Contract terms (underlying, strike, expiry, call/put) are parsed once
+    per subscription change by set_contracts(); update() then reads the
+    inputs of the whole chain from the QuoteStore and prices it in one
+    vectorized Black-Scholes pass.
+
+    Only contracts whose spot or IV changed are reported, plus every
+    contract each options.local_greeks_refresh seconds so theta decay and
+    time-dependent greeks keep moving on a quiet chain.
+
+    In validate mode the engine still computes, but publishes nothing;
+    it compares its values with the RTD greeks in the store and records
+    the differences in stats.
+
+    Attributes:
+        rate (float): Risk-free rate
+        validate (bool): Compare against RTD greeks instead of publishing
+        stats (dict): Counters, and per-field errors in validate mode
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        validate: bool = False,
+        refresh_interval: Optional[float] = None
+    ) -> None:
+        """
+        Args:
+            rate: Risk-free rate. Defaults to analytics.risk_free_rate.
+            validate: Compare against RTD greeks instead of publishing
+            refresh_interval: Seconds between full recomputes. Defaults to
+                              options.local_greeks_refresh.
+        """
+        self.rate = rate if rate is not None else SETTINGS.get('analytics', {}).get('risk_free_rate', 0.045)
+        self.validate = validate
+        self.refresh_interval = (
+            refresh_interval or SETTINGS.get('options', {}).get('local_greeks_refresh', 30.0)
+        )
+        self._symbols: List[str] = []
+        self._underlyings: List[str] = []
+        self._underlying_rows = np.zeros(0, dtype=np.int64)
+        self._strikes = np.zeros(0, dtype=np.float64)
+        self._expiries = np.zeros(0, dtype=np.float64)
+        self._is_call = np.zeros(0, dtype=bool)
+        self._last_inputs: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._last_full = 0.0
+        self._published: set = set()
+        self._removed: List[str] = []
+        self.stats: Dict[str, Any] = {
+            'contracts': 0,
+            'passes': 0,
+            'values_published': 0,
+            'last_pass_ms': None,
+        }
+        if validate:
+            self.stats['validation'] = {}
+
+    def set_contracts(self, symbols: Iterable[str]) -> None:
+        """
+        Set the option contracts to price.
+
+        Args:
+            symbols: Subscribed symbols; non-option symbols are ignored
+        """
+        contracts = []
+        for symbol in dict.fromkeys(symbols):
+            parts = parse_option_symbol(symbol)
+            if parts is None:
+                continue
+            root, expiry, side, strike = parts
+            close = expiry_close(datetime.strptime(expiry, '%y%m%d').date())
+            contracts.append((symbol, ROOT_UNDERLYINGS.get(root, root), strike, close, side == 'C'))
+
+        symbols = [c[0] for c in contracts]
+        underlyings = sorted({c[1] for c in contracts})
+        underlying_row = {u: i for i, u in enumerate(underlyings)}
+
+        # Greeks of dropped contracts must leave the snapshot too
+        dropped = self._published - set(symbols)
+        self._removed.extend(f"{sym}:{field}" for sym in dropped for field in LOCAL_GREEK_FIELDS)
+        self._published -= dropped
+
+        self._symbols = symbols
+        self._underlyings = underlyings
+        self._underlying_rows = np.array([underlying_row[c[1]] for c in contracts], dtype=np.int64)
+        self._strikes = np.array([c[2] for c in contracts], dtype=np.float64)
+        self._expiries = np.array([c[3] for c in contracts], dtype=np.float64)
+        self._is_call = np.array([c[4] for c in contracts], dtype=bool)
+        self._last_inputs = None
+        self.stats['contracts'] = len(symbols)
+
+    def update(self, store: Any, now: Optional[float] = None) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Price the contracts whose inputs changed.
+
+        Args:
+            store: The client's QuoteStore
+            now: Reference time, defaults to time.time()
+
+        Returns:
+            tuple: ({"symbol:FIELD": value} to publish, keys to remove);
+                   both empty in validate mode
+        """
+        removed, self._removed = self._removed, []
+        if not self._symbols:
+            return {}, removed
+        now = now or time.time()
+        start = time.perf_counter()
+
+        spot = store.take(self._underlyings, 'LAST')[self._underlying_rows]
+        vol = store.take(self._symbols, 'IMPL_VOL') / 100.0
+
+        if self._last_inputs is None or now - self._last_full >= self.refresh_interval:
+            rows = np.arange(len(self._symbols))
+            self._last_full = now
+        else:
+            last_spot, last_vol = self._last_inputs
+            rows = np.flatnonzero(~(_same(spot, last_spot) & _same(vol, last_vol)))
+        self._last_inputs = (spot, vol)
+        # Contracts without a spot or IV yet keep whatever was published
+        rows = rows[(spot[rows] > 0) & (vol[rows] > 0)]
+        if not len(rows):
+            return {}, removed
+
+        result = greeks(
+            spot[rows], self._strikes[rows], (self._expiries[rows] - now) / SECONDS_PER_YEAR,
+            self.rate, vol[rows], self._is_call[rows]
+        )
+        prob_itm = result['prob_itm'] * 100.0
+        values = {
+            'DELTA': result['delta'],
+            'GAMMA': result['gamma'],
+            'THETA': result['theta'],
+            'VEGA': result['vega'],
+            'RHO': result['rho'],
+            'PROB_OF_EXPIRING': prob_itm,
+            'PROB_OTM': 100.0 - prob_itm,
+            'PROB_OF_TOUCHING': result['prob_touch'] * 100.0,
+        }
+        self.stats['passes'] += 1
+        self.stats['last_pass_ms'] = (time.perf_counter() - start) * 1000
+
+        symbols = [self._symbols[row] for row in rows.tolist()]
+        if self.validate:
+            self._compare(store, symbols, values)
+            return {}, removed
+
+        changes = {}
+        for field, column in values.items():
+            changes.update(zip([f"{sym}:{field}" for sym in symbols], column.tolist()))
+        self._published.update(symbols)
+        self.stats['values_published'] += len(changes)
+        return changes, removed
+
+    def _compare(self, store: Any, symbols: List[str], values: Dict[str, np.ndarray]) -> None:
+        """Record how far the local greeks are from the RTD ones."""
+        validation = self.stats['validation']
+        for field, local in values.items():
+            rtd = store.take(symbols, field)
+            known = ~np.isnan(rtd)
+            if not known.any():
+                continue
+            error = np.abs(local[known] - rtd[known])
+            validation[field] = {
+                'compared': int(known.sum()),
+                'mean_abs_error': float(error.mean()),
+                'max_abs_error': float(error.max()),
+                'worst_symbol': symbols[int(np.flatnonzero(known)[error.argmax()])],
+            }
+
+
+def _same(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Elementwise equality treating NaN == NaN."""
+    return (a == b) | (np.isnan(a) & np.isnan(b))
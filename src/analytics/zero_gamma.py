@@ -0,0 +1,203 @@
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Hashable, Optional
+from zoneinfo import ZoneInfo
+import time
+
+import numpy as np
+
+from src.analytics.black_scholes import gamma
+from src.analytics.chain_frame import CONTRACT_MULTIPLIER, ChainFrame
+from src.core.settings import SETTINGS
+
+SECONDS_PER_YEAR = 365.0 * 24 * 3600
+# Options stop trading at 16:00 New York time on the expiry date
+EXPIRY_HOUR = 16
+EXPIRY_TIMEZONE = ZoneInfo('America/New_York')
+
+
+def expiry_close(expiry: date) -> float:
+    """
+    Close of trading on an expiry date, whatever the machine's timezone.
+
+    Args:
+        expiry: Expiration date
+
+    Returns:
+        float: 16:00 America/New_York on that date, in epoch seconds
+    """
+    return datetime(expiry.year, expiry.month, expiry.day, EXPIRY_HOUR, tzinfo=EXPIRY_TIMEZONE).timestamp()
+
+
+def time_to_expiry(expiry: date, now: Optional[float] = None) -> float:
+    """
+    Years from now until the close on the expiry date.
+
+    Args:
+        expiry: Expiration date
+        now: Reference time (epoch seconds), defaults to now
+
+    Returns:
+        float: Time to expiry in years, 0 once expired
+    """
+    return max(0.0, (expiry_close(expiry) - (now or time.time())) / SECONDS_PER_YEAR)
+
+
+def gamma_profile(
+    spots: np.ndarray,
+    strikes: np.ndarray,
+    call_vol: np.ndarray,
+    put_vol: np.ndarray,
+    call_oi: np.ndarray,
+    put_oi: np.ndarray,
+    years: float,
+    rate: float
+) -> np.ndarray:
+    """
+    Net dealer gamma exposure of a chain at hypothetical spot prices.
+
+    Gamma is repriced for every contract at every spot in one broadcast
+    (spots x strikes) Black-Scholes evaluation, then weighted by open
+    interest: sum(call_oi * call_gamma - put_oi * put_gamma) * 100 * spot^2 * 1%.
+
+    Args:
+        spots: Hypothetical underlying prices
+        strikes: Strike per contract row
+        call_vol: Call implied volatility per row, as a fraction
+        put_vol: Put implied volatility per row, as a fraction
+        call_oi: Call open interest per row, 0 where unknown
+        put_oi: Put open interest per row, 0 where unknown
+        years: Time to expiry in years
+        rate: Risk-free rate
+
+    Returns:
+        np.ndarray: Net GEX per 1% move at each spot
+    """
+    spot_grid = np.asarray(spots, dtype=np.float64)[:, None]
+    call_gamma = gamma(spot_grid, strikes, years, rate, call_vol)
+    put_gamma = gamma(spot_grid, strikes, years, rate, put_vol)
+    net = call_gamma @ call_oi - put_gamma @ put_oi
+    return net * CONTRACT_MULTIPLIER * spot_grid[:, 0] ** 2 * 0.01
+
+
+def find_zero_crossing(spots: np.ndarray, profile: np.ndarray, spot: float) -> Optional[float]:
+    """
+    Locate where a gamma profile changes sign.
+
+    Args:
+        spots: Ascending spot grid
+        profile: Net GEX at each spot
+        spot: Current price; the crossing nearest to it is returned
+
+    Returns:
+        float: Linearly interpolated zero-gamma price, None if the sign never changes
+    """
+    signs = np.sign(profile)
+    crossings = np.flatnonzero(signs[:-1] * signs[1:] < 0)
+    exact = np.flatnonzero(profile == 0)
+    if not len(crossings) and not len(exact):
+        return None
+
+    levels = [float(spots[i]) for i in exact]
+    for i in crossings:
+        x0, x1 = spots[i], spots[i + 1]
+        y0, y1 = profile[i], profile[i + 1]
+        levels.append(float(x0 - y0 * (x1 - x0) / (y1 - y0)))
+    return min(levels, key=lambda level: abs(level - spot))
+
+
+class ZeroGammaSolver:
+    """
+    Finds the gamma flip level of an option chain.
+
+    Reprices the chain's gamma over a grid of spots around the current
+    price (analytics.zero_gamma_span either side, analytics.zero_gamma_step
+    apart) and returns the price where net dealer gamma changes sign.
+    IMPL_VOL arrives in percent and is converted to a fraction; contracts
+    without IV contribute nothing.
+
+    Results are cached per snapshot version, so page reruns that see the
+    same snapshot don't solve again.
+
+    Attributes:
+        span (float): Grid half-width as a fraction of spot (0.05 = +/-5%)
+        step (float): Grid step as a fraction of spot
+        rate (float): Risk-free rate
+        last_profile (dict): 'spots' and 'gex' arrays of the latest solve
+    """
+
+    def __init__(
+        self,
+        span: Optional[float] = None,
+        step: Optional[float] = None,
+        rate: Optional[float] = None,
+        cache_size: int = 16
+    ) -> None:
+        """
+        Args:
+            span: Grid half-width. Defaults to analytics.zero_gamma_span.
+            step: Grid step. Defaults to analytics.zero_gamma_step.
+            rate: Risk-free rate. Defaults to analytics.risk_free_rate.
+            cache_size: Solved versions kept
+        """
+        analytics = SETTINGS.get('analytics', {})
+        self.span = span or analytics.get('zero_gamma_span', 0.05)
+        self.step = step or analytics.get('zero_gamma_step', 0.001)
+        self.rate = rate if rate is not None else analytics.get('risk_free_rate', 0.045)
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Hashable, Dict[str, Any]]' = OrderedDict()
+        self.last_profile: Optional[Dict[str, np.ndarray]] = None
+
+    def spot_grid(self, spot: float) -> np.ndarray:
+        """Hypothetical spots from spot * (1 - span) to spot * (1 + span)."""
+        points = int(round(2 * self.span / self.step)) + 1
+        return spot * np.linspace(1.0 - self.span, 1.0 + self.span, points)
+
+    def solve(self, frame: ChainFrame, version: Optional[int] = None, now: Optional[float] = None) -> Optional[float]:
+        """
+        Find the zero-gamma level of a chain frame.
+
+        Args:
+            frame: Chain frame with GAMMA inputs (IMPL_VOL, OPEN_INT)
+            version: Snapshot version the frame was built from; solves
+                     with the same version (and chain) are served from cache
+            now: Reference time for time to expiry, defaults to now
+
+        Returns:
+            float: Zero-gamma price, None if unknown or no sign change in the grid
+        """
+        if frame.price <= 0 or frame.expiry is None or not len(frame):
+            return None
+
+        key = None
+        if version is not None:
+            key = (version, frame.symbol, frame.expiry, len(frame), float(frame.strikes[0]), float(frame.strikes[-1]))
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.last_profile = cached['profile']
+                return cached['level']
+
+        call_vol = frame.call('IMPL_VOL') / 100.0
+        put_vol = frame.put('IMPL_VOL') / 100.0
+        call_oi = np.nan_to_num(frame.call('OPEN_INT'))
+        put_oi = np.nan_to_num(frame.put('OPEN_INT'))
+        # No IV, no gamma: drop the contract instead of pricing it at ~0 vol
+        call_oi[~(call_vol > 0)] = 0.0
+        put_oi[~(put_vol > 0)] = 0.0
+        call_vol = np.where(call_vol > 0, call_vol, 1.0)
+        put_vol = np.where(put_vol > 0, put_vol, 1.0)
+
+        spots = self.spot_grid(frame.price)
+        profile = gamma_profile(
+            spots, frame.strikes, call_vol, put_vol, call_oi, put_oi,
+            time_to_expiry(frame.expiry, now), self.rate
+        )
+        level = find_zero_crossing(spots, profile, frame.price)
+        self.last_profile = {'spots': spots, 'gex': profile}
+
+        if key is not None:
+            self._cache[key] = {'level': level, 'profile': self.last_profile}
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return level
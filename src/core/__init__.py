@@ -10,7 +10,8 @@ from .error_handler import (
     validate_connection_state,
     log_method_call
 )
-from .settings import SETTINGS
+from .settings import SETTINGS, resolve_path
+from .tracing import get_trace_stats, reset_traces, trace_method
 from .logger import get_logger
 
 __all__ = [
@@ -25,5 +26,9 @@ __all__ = [
     'validate_connection_state',
     'log_method_call',
     'SETTINGS',
+    'resolve_path',
+    'trace_method',
+    'get_trace_stats',
+    'reset_traces',
     'get_logger'
 ]
\ No newline at end of file
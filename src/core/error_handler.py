@@ -1,8 +1,14 @@
 from functools import wraps
+import logging
 from enum import Enum, auto
 from typing import Type, List
 
-import comtypes
+try:
+    from comtypes import COMError
+except ImportError:
+    # comtypes is Windows-only; off Windows no COMError can be raised
+    class COMError(Exception):
+        pass
 
 from src.core.logger import get_logger
 
@@ -57,7 +63,7 @@ def handle_com_error(error_class: Type[RTDError] = RTDError):
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
-            except comtypes.COMError as e:
+            except COMError as e:
                 hresult, text, details = e.args
                 error_msg = f"COM error in {func.__name__}: [0x{hresult:08x}] {text}"
                 logger.error(error_msg, exc_info=True)
@@ -104,10 +110,19 @@ def log_method_call(log_level: str = 'DEBUG'):
     Args:
         log_level: The logging level to use. Defaults to 'DEBUG'.
     """
+    level = logging.getLevelName(log_level.upper())
+
     def decorator(func):
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             method_logger = getattr(self, 'logger', logger)
+            if not method_logger.isEnabledFor(level):
+                # Skip formatting the arguments when the level is filtered out
+                try:
+                    return func(self, *args, **kwargs)
+                except Exception as e:
+                    method_logger.error(f"Error in {func.__name__}: {str(e)}")
+                    raise
             log_func = getattr(method_logger, log_level.lower())
             
             arg_str = ', '.join([f"{arg}" for arg in args] + [f"{k}={v}" for k, v in kwargs.items()])
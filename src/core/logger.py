@@ -1,8 +1,12 @@
+import atexit
+import copy
 import logging
 import os
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from queue import Empty, Full, Queue
 from threading import Lock
-from typing import Optional
+from typing import Dict, List, Optional
 
 from colorama import Fore, Style, init
 from concurrent_log_handler import ConcurrentRotatingFileHandler
@@ -37,6 +41,8 @@ CONSOLE_LOG_LEVEL = SETTINGS['logging']['console_level']
 FILE_LOG_LEVEL = SETTINGS['logging']['file_level']
 MAX_BYTES = SETTINGS['logging']['max_bytes']
 BACKUP_COUNT = SETTINGS['logging']['backup_count']
+QUEUE_SIZE = SETTINGS['logging'].get('queue_size', 10000)
+BATCH_SIZE = SETTINGS['logging'].get('batch_size', 256)
 
 # Custom log level for quotes in console display
 QUOTE = 15  #  DEBUG (10) < QUOTE (15) < INFO (20) < WARNING (30)
@@ -71,11 +77,154 @@ class ColoredQuoteFormatter(logging.Formatter):
                     return formatted_msg
         return super().format(record)
 
+class BatchingFileHandler(ConcurrentRotatingFileHandler):
+    """
+    ConcurrentRotatingFileHandler that can write many records at once.
+
+    emit_batch() takes the inter-process file lock, checks rollover and
+    writes once for a whole batch instead of once per record.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        preformatted = getattr(record, 'preformatted', None)
+        if preformatted is not None:
+            return preformatted
+        return super().format(record)
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Write records (already level-filtered) as a single block."""
+        lines = []
+        for record in records:
+            try:
+                lines.append(super().format(record))
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        text = '\n'.join(lines)
+        self.emit(logging.makeLogRecord({
+            'msg': text,
+            'preformatted': text,
+            'levelno': max(record.levelno for record in records),
+        }))
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the logging thread.
+
+    Records are queued for one target handler and written by
+    BatchingQueueListener on a background thread. When the bounded queue
+    is full the record is dropped and counted instead of waiting.
+
+    Attributes:
+        target (logging.Handler): Handler the listener writes records to
+    """
+
+    dropped = 0
+
+    def __init__(self, queue: Queue, target: logging.Handler) -> None:
+        super().__init__(queue)
+        self.target = target
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is left to the listener thread; only the routing is added.
+        # A record can reach several queue handlers (named logger and root),
+        # so each tags its own shallow copy.
+        record = copy.copy(record)
+        record.target_handler = self.target
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            DroppingQueueHandler.dropped += 1
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener writing records in batches on its background thread.
+
+    Each wake-up drains up to batch_size queued records, groups them by
+    target handler and writes every group with a single emit_batch() call
+    where the handler supports it.
+    """
+
+    def __init__(self, queue: Queue, batch_size: int = 256) -> None:
+        super().__init__(queue)
+        self.batch_size = batch_size
+        self.batches = 0
+        self.records = 0
+
+    def _monitor(self) -> None:
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except Empty:
+                    break
+            if self._write(batch):
+                return
+
+    def _write(self, batch: List[logging.LogRecord]) -> bool:
+        """Write a batch; True if it contained the stop sentinel."""
+        stop = False
+        groups: Dict[logging.Handler, List[logging.LogRecord]] = {}
+        for record in batch:
+            if record is self._sentinel:
+                stop = True
+                continue
+            groups.setdefault(record.target_handler, []).append(record)
+
+        for handler, records in groups.items():
+            records = [record for record in records if record.levelno >= handler.level]
+            if isinstance(handler, BatchingFileHandler):
+                handler.emit_batch(records)
+            else:
+                for record in records:
+                    handler.handle(record)
+            self.records += len(records)
+        self.batches += 1
+        return stop
+
+
 class PyRTDLogger:
-    """Main logger class for pyrtdc."""
+    """
+    Main logger class for pyrtdc.
+
+    Loggers only enqueue records; file and console I/O happens on one
+    BatchingQueueListener thread, so logging never blocks the RTD worker
+    (see logging.queue_size and logging.batch_size in config).
+    """
     def __init__(self):
         self.loggers = {}
+        self.queue = Queue(maxsize=QUEUE_SIZE)
+        self.listener = BatchingQueueListener(self.queue, BATCH_SIZE)
         self.setup_logging()
+        self.listener.start()
+        atexit.register(self.shutdown)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get logging pipeline statistics.
+
+        Returns:
+            dict: Records queued now, written, write batches and dropped (queue full)
+        """
+        return {
+            'queued': self.queue.qsize(),
+            'written': self.listener.records,
+            'batches': self.listener.batches,
+            'dropped': DroppingQueueHandler.dropped,
+        }
+
+    def shutdown(self) -> None:
+        """Write the queued records and stop the listener thread."""
+        if self.listener._thread is not None:
+            self.listener.stop()
 
     def get_log_level(self, level_name: str) -> int:
         """Convert string log level to logging constant."""
@@ -97,7 +246,11 @@ class PyRTDLogger:
         # Simple formatter for console
         console_formatter = ColoredQuoteFormatter('%(message)s')
         console_handler.setFormatter(console_formatter)
-        root_logger.addHandler(console_handler)
+
+        queue_handler = DroppingQueueHandler(self.queue, console_handler)
+        queue_handler.setLevel(QUOTE)
+        queue_handler.addFilter(lambda record: record.levelno == QUOTE)
+        root_logger.addHandler(queue_handler)
 
     def get_logger(self, name: Optional[str] = None) -> logging.Logger:
         """Get or create a logger instance."""
@@ -107,11 +260,11 @@ class PyRTDLogger:
         logger = logging.getLogger(name)
         
         # Only add file handler if not already present
-        if not any(isinstance(h, ConcurrentRotatingFileHandler) for h in logger.handlers):
+        if not any(isinstance(h, DroppingQueueHandler) for h in logger.handlers):
             log_file = LOGS_DIR / f"{name or 'pyrtdc'}.log"
             
             try:
-                file_handler = ConcurrentRotatingFileHandler(
+                file_handler = BatchingFileHandler(
                     filename=str(log_file),
                     maxBytes=MAX_BYTES,
                     backupCount=BACKUP_COUNT
@@ -121,8 +274,14 @@ class PyRTDLogger:
                     '%(asctime)s - %(name)s - %(levelname)s - %(pathname)s:%(lineno)d - %(message)s'
                 )
                 file_handler.setFormatter(file_formatter)
-                file_handler.setLevel(self.get_log_level(FILE_LOG_LEVEL))
-                logger.addHandler(file_handler)
+                file_level = self.get_log_level(FILE_LOG_LEVEL)
+                file_handler.setLevel(file_level)
+
+                queue_handler = DroppingQueueHandler(self.queue, file_handler)
+                queue_handler.setLevel(file_level)
+                logger.addHandler(queue_handler)
+                # Calls below every handler's level return before a record is built
+                logger.setLevel(min(file_level, QUOTE))
                 
             except Exception as e:
                 print(f"Error setting up log file handler: {e}")
@@ -135,4 +294,8 @@ _logger_instance = PyRTDLogger()
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Get a logger instance."""
-    return _logger_instance.get_logger(name)
\ No newline at end of file
+    return _logger_instance.get_logger(name)
+
+def get_logging_stats() -> Dict[str, int]:
+    """Get queue, batch and drop counters of the logging pipeline."""
+    return _logger_instance.stats()
\ No newline at end of file
@@ -1,5 +1,8 @@
+import os
+import string
 import yaml
 from pathlib import Path
+from typing import Union
 
 def load_settings():
     """
@@ -45,5 +48,25 @@ def load_settings():
         print(f"Critical Error: {str(e)}")  # Fallback since logger might not be available
         raise
 
+def resolve_path(path: Union[str, Path]) -> Path:
+    """
+    Resolve a path from config.
+
+    Expands ${VAR} references from the environment; RTD_ROOT and
+    TOSRTD_ROOT default to the working directory. Relative paths are
+    taken relative to RTD_ROOT.
+
+    Args:
+        path: Configured path
+
+    Returns:
+        Path: Absolute path
+    """
+    root = os.getenv('RTD_ROOT') or os.getcwd()
+    variables = {'RTD_ROOT': root, 'TOSRTD_ROOT': os.getenv('TOSRTD_ROOT') or root}
+    variables.update({k: v for k, v in os.environ.items() if v})
+    resolved = Path(string.Template(str(path)).safe_substitute(variables)).expanduser()
+    return resolved if resolved.is_absolute() else Path(root) / resolved
+
 # Global settings object
 SETTINGS = load_settings()
\ No newline at end of file
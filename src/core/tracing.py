@@ -0,0 +1,177 @@
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+import time
+
+from src.core.settings import SETTINGS
+
+# Latency histogram: bucket i counts calls taking [2**(i-1), 2**i) microseconds
+# (bucket 0: under 1 us); the last bucket also holds everything slower.
+HISTOGRAM_BUCKETS = 24
+
+
+class MethodTrace:
+    """
+    In-memory call statistics of one traced method.
+
+    Every call is counted; 1 in sample_every calls (none if 0) is timed
+    into a power-of-two microsecond histogram. Counters are updated without a
+    lock, so concurrent callers may occasionally lose an increment; the
+    traced RTD methods all run on the worker thread.
+
+    Attributes:
+        name (str): Qualified method name
+        calls (int): Calls made
+        errors (int): Calls that raised
+        samples (int): Calls timed
+        total_ns (int): Summed duration of the timed calls
+        max_ns (int): Slowest timed call
+        histogram (list): Timed calls per latency bucket
+    """
+
+    def __init__(self, name: str, sample_every: int = 1) -> None:
+        self.name = name
+        self.sample_every = max(0, sample_every)
+        self.calls = 0
+        self.errors = 0
+        self.samples = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram: List[int] = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, elapsed_ns: int) -> None:
+        """Add one timed call."""
+        self.samples += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[min((elapsed_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile_us(self, q: float) -> Optional[float]:
+        """
+        Estimate a latency percentile from the histogram.
+
+        Args:
+            q: Percentile, 0-100
+
+        Returns:
+            float: Upper bound of the bucket holding the percentile (microseconds),
+                   None before the first sample
+        """
+        if not self.samples:
+            return None
+        target = self.samples * q / 100
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= target:
+                return float(2 ** bucket)
+        return float(2 ** (HISTOGRAM_BUCKETS - 1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the statistics."""
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'samples': self.samples,
+            'mean_us': self.total_ns / self.samples / 1000 if self.samples else None,
+            'p50_us': self.percentile_us(50),
+            'p99_us': self.percentile_us(99),
+            'max_us': self.max_ns / 1000,
+            'histogram_us': {
+                f"<{2 ** bucket}": count for bucket, count in enumerate(self.histogram) if count
+            },
+        }
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        self.calls = self.errors = self.samples = self.total_ns = self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+
+_traces: Dict[str, MethodTrace] = {}
+_traces_lock = Lock()
+
+
+def tracing_enabled() -> bool:
+    """Whether tracing.enabled is set in config."""
+    return bool(SETTINGS.get('tracing', {}).get('enabled', False))
+
+
+def trace_method(name: Optional[str] = None) -> Callable:
+    """
+    Decorator counting and timing calls when tracing is enabled.
+
+    The config is read once, when the decorated function is defined: with
+    tracing.enabled false the original function is returned unchanged, so
+    disabled tracing costs nothing per call. When enabled, every call is
+    counted and 1 in round(1 / tracing.sample_rate) calls is timed.
+
+    Args:
+        name: Name to record under. Defaults to the function's qualified name.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not tracing_enabled():
+            return func
+
+        sample_rate = SETTINGS['tracing'].get('sample_rate', 1.0)
+        sample_every = max(1, round(1 / sample_rate)) if sample_rate > 0 else 0
+        trace = get_trace(name or func.__qualname__, sample_every)
+        sample_every = trace.sample_every
+        perf_counter_ns = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            trace.calls += 1
+            if not sample_every or trace.calls % sample_every:
+                try:
+                    return func(*args, **kwargs)
+                except Exception:
+                    trace.errors += 1
+                    raise
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                trace.errors += 1
+                raise
+            finally:
+                trace.record(perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
+def get_trace(name: str, sample_every: int = 1) -> MethodTrace:
+    """
+    Get (or create) the statistics of a traced method.
+
+    Args:
+        name: Traced method name
+        sample_every: Timing interval for a new trace; 0 counts calls only
+
+    Returns:
+        MethodTrace: Statistics shared by every function traced under name
+    """
+    with _traces_lock:
+        trace = _traces.get(name)
+        if trace is None:
+            trace = _traces[name] = MethodTrace(name, sample_every)
+        return trace
+
+
+def get_trace_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize all traced methods.
+
+    Returns:
+        dict: {method name: MethodTrace.to_dict()}; empty when tracing is disabled
+    """
+    with _traces_lock:
+        return {name: trace.to_dict() for name, trace in _traces.items()}
+
+
+def reset_traces() -> None:
+    """Clear the statistics of all traced methods."""
+    with _traces_lock:
+        for trace in _traces.values():
+            trace.reset()
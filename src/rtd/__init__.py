@@ -1,4 +1,19 @@
 from .client import RTDClient
-from .interfaces import IRTDUpdateEvent, IRtdServer
+from .simulator import SimulatedRTDServer
+from .transport import COMTransport, SimulatedTransport, get_transport
 
-__all__ = ['RTDClient', 'IRTDUpdateEvent', 'IRtdServer']
\ No newline at end of file
+try:
+    from .interfaces import IRTDUpdateEvent, IRtdServer
+except ImportError:
+    # COM interfaces need comtypes (Windows only)
+    IRTDUpdateEvent = IRtdServer = None
+
+__all__ = [
+    'RTDClient',
+    'SimulatedRTDServer',
+    'COMTransport',
+    'SimulatedTransport',
+    'get_transport',
+    'IRTDUpdateEvent',
+    'IRtdServer'
+]
\ No newline at end of file
@@ -0,0 +1,263 @@
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import time
+
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+from src.core.tracing import get_trace_stats
+from src.rtd.rtd_worker import RTDWorker
+from src.rtd.snapshot import SnapshotBuffer
+from src.utils import topic
+
+
+logger = get_logger(__name__)
+
+class RTDBroker:
+    """
+    Process-wide RTD subscription broker shared by all sessions and pages.
+
+    Owns a single RTDWorker (and with it a single RTDClient / COM server
+    connection) and one SnapshotBuffer. Sessions lease the symbols they
+    display; the broker reference-counts every (symbol, quote_type) topic
+    across leases and keeps the worker subscribed to the union only, so N
+    viewers of the same chain cost one subscription set. Every session
+    reads the same shared snapshot.
+
+    Streamlit gives no reliable signal when a browser tab goes away, so
+    leases must be renewed with touch() (subscribe() renews as well) and
+    are dropped after broker.session_timeout seconds without renewal. The
+    worker is stopped once the last lease is gone.
+
+    Attributes:
+        snapshots (SnapshotBuffer): Shared snapshot all sessions read from,
+            or the publisher given to the constructor
+        session_timeout (float): Seconds before an unrenewed lease expires
+    """
+
+    def __init__(self, session_timeout: Optional[float] = None, snapshots: Any = None) -> None:
+        """
+        Initialize an idle broker. The worker starts with the first lease.
+
+        Args:
+            session_timeout: Lease lifetime in seconds. Defaults to config.
+            snapshots: Publisher the worker writes to, e.g. a
+                       SharedSnapshotWriter. Defaults to a new SnapshotBuffer.
+        """
+        self.snapshots = snapshots if snapshots is not None else SnapshotBuffer()
+        self.session_timeout = (
+            session_timeout if session_timeout is not None
+            else SETTINGS.get('broker', {}).get('session_timeout', 60.0)
+        )
+        self.stop_timeout = SETTINGS.get('broker', {}).get('worker_stop_timeout', 5.0)
+
+        self._lock = Lock()
+        self._leases: Dict[str, Tuple[str, ...]] = {}
+        self._lease_topics: Dict[str, Set[Tuple[str, str]]] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._refcounts: Dict[Tuple[str, str], int] = {}
+
+        self._worker: Optional[RTDWorker] = None
+        self._thread: Optional[Thread] = None
+        self._stop_event: Optional[Event] = None
+        self._reaper: Optional[Thread] = None
+        # Worker told to stop that may still be disconnecting, and the
+        # thread waiting for it to exit before starting the next worker
+        self._stopping_thread: Optional[Thread] = None
+        self._waiter: Optional[Thread] = None
+
+    def subscribe(self, session_id: str, symbols: Iterable[str]) -> Any:
+        """
+        Set the symbols a session displays, replacing its previous set.
+
+        Args:
+            session_id: Unique ID of the session (and page) holding the lease
+            symbols: Underlying and option symbols, as passed to RTDWorker
+
+        Returns:
+            SnapshotBuffer: Shared snapshot buffer to read quotes from
+                            (the constructor's publisher if one was given)
+        """
+        symbols = tuple(symbols)
+        with self._lock:
+            self._last_seen[session_id] = time.time()
+            if self._leases.get(session_id) == symbols and self._is_running():
+                return self.snapshots
+
+            topics = {
+                (topic.validate_quote_type(quote_type), symbol)
+                for quote_type, symbol in RTDWorker._topics_for(symbols)
+            }
+            old_topics = self._lease_topics.get(session_id, set())
+            self._leases[session_id] = symbols
+            self._lease_topics[session_id] = topics
+            self._retain(topics - old_topics)
+            self._release(old_topics - topics)
+            self._sync()
+        return self.snapshots
+
+    def touch(self, session_id: str) -> bool:
+        """
+        Renew a session's lease.
+
+        Args:
+            session_id: Session ID passed to subscribe()
+
+        Returns:
+            bool: False if the lease has expired or never existed and the
+                  session must subscribe() again
+        """
+        with self._lock:
+            if session_id not in self._leases:
+                return False
+            self._last_seen[session_id] = time.time()
+            return True
+
+    def release(self, session_id: str) -> None:
+        """
+        Drop a session's lease and unsubscribe topics nobody else uses.
+
+        Args:
+            session_id: Session ID passed to subscribe()
+        """
+        with self._lock:
+            if self._drop_lease(session_id):
+                self._sync()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get broker statistics.
+
+        Returns:
+            dict: Number of sessions, leased topics (sum over sessions),
+                  distinct topics actually subscribed, the worker's
+                  connection supervisor counters (reconnects, gaps), local
+                  greeks engine counters (None with RTD greeks) and
+                  traced RTD method statistics (if tracing is enabled)
+        """
+        with self._lock:
+            return {
+                'sessions': len(self._leases),
+                'leased_topics': sum(len(t) for t in self._lease_topics.values()),
+                'subscribed_topics': len(self._refcounts),
+                'connection': dict(self._worker.supervisor.stats) if self._worker else None,
+                'greeks': (
+                    dict(self._worker.greeks_engine.stats)
+                    if self._worker and self._worker.greeks_engine else None
+                ),
+                'tracing': get_trace_stats(),
+            }
+
+    def shutdown(self) -> None:
+        """Drop all leases and stop the worker."""
+        with self._lock:
+            for session_id in list(self._leases):
+                self._drop_lease(session_id)
+            self._stop_worker()
+
+    def _retain(self, topics: Iterable[Tuple[str, str]]) -> None:
+        for key in topics:
+            self._refcounts[key] = self._refcounts.get(key, 0) + 1
+
+    def _release(self, topics: Iterable[Tuple[str, str]]) -> None:
+        for key in topics:
+            count = self._refcounts.get(key, 0) - 1
+            if count > 0:
+                self._refcounts[key] = count
+            else:
+                self._refcounts.pop(key, None)
+
+    def _drop_lease(self, session_id: str) -> bool:
+        """Forget a lease and release its topics; caller holds the lock."""
+        if session_id not in self._leases:
+            return False
+        del self._leases[session_id]
+        self._last_seen.pop(session_id, None)
+        self._release(self._lease_topics.pop(session_id, set()))
+        return True
+
+    def _is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _sync(self) -> None:
+        """Point the worker at the current topic union; caller holds the lock."""
+        subscriptions = list(self._refcounts)
+        if not subscriptions:
+            self._stop_worker()
+            return
+
+        if self._is_running():
+            self._worker.update_topics(subscriptions)
+            return
+
+        # Never two connections or snapshot writers: while a stopped worker
+        # is still disconnecting (e.g. Stop then Start on a page), wait for
+        # it off the lock and start once it has exited
+        self._stop_worker()
+        stopping = self._stopping_thread
+        if stopping is not None and stopping.is_alive():
+            if self._waiter is None:
+                self._waiter = Thread(target=self._start_when_stopped, args=(stopping,), daemon=True)
+                self._waiter.start()
+            return
+        self._stopping_thread = None
+
+        # First lease, or the previous worker died: start from an empty snapshot
+        self.snapshots.publish({}, full=True)
+        self._stop_event = Event()
+        self._worker = RTDWorker(self.snapshots, self._stop_event)
+        self._thread = Thread(
+            target=self._worker.start,
+            args=([],),
+            kwargs={'topics': subscriptions},
+            daemon=True
+        )
+        self._thread.start()
+        self._reaper = Thread(target=self._expire_leases, args=(self._stop_event,), daemon=True)
+        self._reaper.start()
+        logger.info(f"RTD broker started worker with {len(subscriptions)} topics")
+
+    def _stop_worker(self) -> None:
+        """Signal the worker to disconnect; caller holds the lock."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stopping_thread = self._thread
+            logger.info("RTD broker stopped worker")
+        self._worker = None
+        self._thread = None
+        self._stop_event = None
+        self._reaper = None
+
+    def _start_when_stopped(self, thread: Thread) -> None:
+        """
+        Wait, without the lock, for a stopped worker to exit, then start its successor.
+
+        Args:
+            thread: Thread of the worker told to stop
+        """
+        thread.join(self.stop_timeout)
+        with self._lock:
+            self._waiter = None
+            if thread.is_alive():
+                logger.warning(
+                    f"Previous RTD worker still running after {self.stop_timeout}s; "
+                    "retrying on the next subscribe"
+                )
+                return
+            if not self._is_running():
+                self._sync()
+
+    def _expire_leases(self, stop_event: Event) -> None:
+        """Drop leases not renewed within session_timeout while the worker runs."""
+        interval = max(self.session_timeout / 2, 1.0)
+        while not stop_event.wait(interval):
+            cutoff = time.time() - self.session_timeout
+            with self._lock:
+                expired: List[str] = [
+                    session_id for session_id, seen in self._last_seen.items()
+                    if seen < cutoff
+                ]
+                for session_id in expired:
+                    self._drop_lease(session_id)
+                if expired:
+                    logger.info(f"RTD broker expired {len(expired)} idle session(s)")
+                    self._sync()
@@ -0,0 +1,98 @@
+from typing import Any, Dict, Iterable
+
+
+def make_change_set(
+    seq: int,
+    changes: Dict[str, float],
+    removed: Iterable[str] = (),
+    full: bool = False
+) -> Dict[str, Any]:
+    """
+    Build a change set message as published through SnapshotBuffer.
+
+    Args:
+        seq: Monotonically increasing sequence number of the message
+        changes: {"symbol:QUOTE_TYPE": value} of changed topics
+        removed: Keys of topics that are no longer subscribed
+        full: True if changes is a complete snapshot replacing all prior state
+
+    Returns:
+        dict: Change set message
+    """
+    return {
+        "seq": seq,
+        "full": full,
+        "changes": changes,
+        "removed": list(removed)
+    }
+
+
+class LocalSnapshot:
+    """
+    Consumer-side copy of the quote snapshot maintained from change sets.
+
+    Change sets are applied strictly in sequence. When a gap is detected
+    (a change set was missed) further deltas are refused until a full
+    snapshot is applied; sync() takes care of that automatically.
+
+    Attributes:
+        seq (int): Sequence number of the last applied change set
+        data (dict): Current {"symbol:QUOTE_TYPE": value} snapshot
+    """
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.data: Dict[str, float] = {}
+        self._synced = False
+
+    def apply(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply one change set.
+
+        Args:
+            message: Change set built by make_change_set()
+
+        Returns:
+            bool: True if applied, False if it was out of sequence
+        """
+        if message["full"]:
+            self.data = dict(message["changes"])
+            self.seq = message["seq"]
+            self._synced = True
+            return True
+
+        if not self._synced or message["seq"] != self.seq + 1:
+            self._synced = False
+            return False
+
+        for key in message["removed"]:
+            self.data.pop(key, None)
+        self.data.update(message["changes"])
+        self.seq = message["seq"]
+        return True
+
+    def sync(self, buffer: Any) -> bool:
+        """
+        Catch up with a SnapshotBuffer.
+
+        Applies the change sets published since the last sync, or takes a
+        full copy of the latest snapshot when the buffer's history no
+        longer reaches back far enough.
+
+        Args:
+            buffer: SnapshotBuffer to follow
+
+        Returns:
+            bool: True if anything new was applied
+        """
+        change_sets = buffer.changes_since(self.seq) if self._synced else None
+        if change_sets is None:
+            snapshot = buffer.latest()
+            self.data = dict(snapshot.data)
+            self.seq = snapshot.version
+            self._synced = True
+            return True
+
+        for change_set in change_sets:
+            self.apply(change_set)
+        return bool(change_sets)
@@ -1,12 +1,16 @@
 from datetime import datetime
-from threading import Lock
+from threading import Event, Lock
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
-import pythoncom
 import time
 
-from comtypes import COMObject, GUID
-from comtypes.automation import VARIANT, VARIANT_BOOL
-from comtypes.client import CreateObject
+try:
+    from comtypes import COMObject
+    from src.rtd.interfaces import IRTDUpdateEvent
+except ImportError:
+    # Off Windows the client is only driven by a simulated transport,
+    # which calls UpdateNotify directly
+    COMObject = object
+    IRTDUpdateEvent = None
 
 from config.quote_types import QuoteType
 from src.core.error_handler import (
@@ -21,10 +25,21 @@ from src.core.error_handler import (
     validate_connection_state
 )
 from src.core.logger import get_logger
+from src.core.tracing import trace_method
 from src.core.settings import SETTINGS
-from src.rtd.interfaces import IRTDUpdateEvent, IRtdServer
+from src.rtd.recording import BatchRecorder
+from src.rtd.subscription import SubscriptionPipeline
+from src.storage.realtime_quotes import RealtimeQuoteDB
+from src.storage.tick_history import TickHistoryDB
+from src.rtd.transport import get_transport
 from src.utils import cleanup, state, topic
 from src.utils.quote import Quote
+from src.utils.quote_store import QuoteStore
+from src.utils.value_parser import converter_for
+
+# Default of the quote_db / tick_db arguments: open the store from config
+# (None disables the store)
+FROM_CONFIG: Any = object()
 
 class RTDClient(COMObject):
     """
@@ -35,16 +50,22 @@ class RTDClient(COMObject):
     
     Attributes:
         _state (RTDConnectionState): Current connection state
-        server (IRtdServer): COM server instance
-        topics (Dict[int, Tuple[str, str]]): Active topic subscriptions
+        server (IRtdServer): COM server instance (or simulated server)
+        transport: COM or simulated transport the server is created through
+        topics (TopicRegistry): Active topic subscriptions by topic ID
+        store (QuoteStore): Columnar latest values of subscribed topics
         heartbeat_interval (int): Server heartbeat interval in milliseconds
     """
-    _com_interfaces_ = [IRTDUpdateEvent]
+    _com_interfaces_ = [IRTDUpdateEvent] if IRTDUpdateEvent is not None else []
 
     def __init__(
         self, 
         heartbeat_ms: Optional[int] = None,
-        logger: Optional[Any] = None
+        logger: Optional[Any] = None,
+        transport: Optional[Any] = None,
+        recorder: Optional[Any] = None,
+        quote_db: Optional[Any] = FROM_CONFIG,
+        tick_db: Optional[Any] = FROM_CONFIG
     ) -> None:
         """
         Initialize the RTD Client.
@@ -53,6 +74,16 @@ class RTDClient(COMObject):
             heartbeat_ms: Optional heartbeat interval in milliseconds.
                          Defaults to value from config.
             logger: Optional logger instance. If None, creates a new logger.
+            transport: Optional transport (see src/rtd/transport.py).
+                       Defaults to rtd.transport from config.
+            recorder: Optional BatchRecorder logging raw RefreshData batches.
+                      Defaults to one under recording.path if recording.enabled.
+            quote_db: Optional RealtimeQuoteDB receiving every batch's changed
+                      values, None for none. Defaults to config
+                      (storage.realtime_quotes_enabled), in a store of the
+                      transport's own.
+            tick_db: Optional TickHistoryDB receiving every value change, None
+                     for none. Defaults to config (storage.tick_history_enabled).
 
         Raises:
             RTDClientError: If initialization fails
@@ -63,15 +94,15 @@ class RTDClient(COMObject):
         self.logger = logger or get_logger("RTDClient")
         
         # COM server and state
-        self.server: Optional[IRtdServer] = None
+        self.transport = transport or get_transport()
+        self.server: Optional[Any] = None
         self._state = RTDConnectionState.DISCONNECTED
         self._lock = Lock()
         
         # Topic management
-        self.topics: Dict[int, Tuple[str, str]] = {}
+        self.topics = topic.TopicRegistry()
         self._topic_lock = Lock()
-        self._latest_values: Dict[Tuple[str, str], Quote] = {} 
-        self._value_lock = Lock() 
+        self.store = QuoteStore()
         
         # Heartbeat configuration
         self._heartbeat_interval = (
@@ -82,6 +113,14 @@ class RTDClient(COMObject):
         # Update tracking
         self._update_notify_count = 0
         self._last_refresh_time = None
+        self._updates_ready = Event()
+
+        # Raw batch recording (see src/rtd/recording.py)
+        self.recorder = recorder or BatchRecorder.from_config()
+        # Persistent latest values (see src/storage/realtime_quotes.py)
+        transport_name = self.transport.name
+        self.quote_db = RealtimeQuoteDB.from_config(transport_name) if quote_db is FROM_CONFIG else quote_db
+        self.tick_db = TickHistoryDB.from_config(transport_name) if tick_db is FROM_CONFIG else tick_db
         
         self.logger.info("RTD Client instance created")
 
@@ -123,13 +162,10 @@ class RTDClient(COMObject):
         
         try:
             # Initialize COM for the current thread
-            pythoncom.CoInitialize()
+            self.transport.initialize_thread()
             
             # Create COM server instance
-            self.server = CreateObject(
-                GUID(SETTINGS['rtd']['progid']), 
-                interface=IRtdServer
-            )
+            self.server = self.transport.create_server()
             self.logger.debug("COM server instance created")
             
             # Start the server
@@ -152,11 +188,11 @@ class RTDClient(COMObject):
         except Exception as e:
             self._state = RTDConnectionState.DISCONNECTED
             self.logger.error(f"Server initialization failed: {str(e)}")
-            cleanup.cleanup_com() 
+            self.transport.uninitialize_thread()
             raise
 
     @handle_com_error(RTDClientError)
-    @log_method_call()
+    @trace_method()
     @validate_connection_state([RTDConnectionState.CONNECTED])
     def subscribe(self, quote_type: Union[str, QuoteType], symbol: str) -> Optional[int]:
         """
@@ -176,19 +212,19 @@ class RTDClient(COMObject):
         with self._topic_lock:
 
             quote_type_str = topic.validate_quote_type(quote_type)
-            topic_id = topic.generate_topic_id(quote_type_str, symbol)
+            topic_id = self.topics.find(symbol, quote_type_str)
             
-            if topic_id in self.topics:
+            if topic_id is not None:
                 self.logger.info(
                     f"Already subscribed to {symbol} {quote_type_str}"
                 )
                 return topic_id
+
+            topic_id = self.topics.allocate()
                 
             # subscription params per current specs
-            strings = (VARIANT * 2)()
-            strings[0].value = quote_type_str
-            strings[1].value = symbol
-            get_new_values = VARIANT_BOOL(True)
+            strings = self.transport.topic_strings(quote_type_str, symbol)
+            get_new_values = self.transport.new_values_flag()
             
             try:
                 result = self.server.ConnectData(
@@ -198,18 +234,23 @@ class RTDClient(COMObject):
                 
                 if isinstance(result, list) and len(result) >= 1 and result[0]:
                     self.topics[topic_id] = (symbol, quote_type_str)
+                    self.store.add_topic(topic_id, symbol, quote_type_str)
+                    if self.recorder is not None:
+                        self.recorder.record_topic(topic_id, quote_type_str, symbol)
                     self.logger.debug(
                         f"Subscribed to {symbol} {quote_type_str} "
                         f"with ID {topic_id}"
                     )
                     return topic_id
                 else:
+                    self.topics.release(topic_id)
                     self.logger.warning(
                         f"Subscription failed for {symbol} {quote_type_str}"
                     )
                     return None
                     
             except Exception as e:
+                self.topics.release(topic_id)
                 self.logger.error(
                     f"Error subscribing to {symbol} {quote_type_str}: {e}"
                 )
@@ -218,7 +259,7 @@ class RTDClient(COMObject):
                 ) from e
 
     @handle_com_error(RTDClientError)
-    @log_method_call()
+    @trace_method()
     @validate_connection_state([RTDConnectionState.CONNECTED, RTDConnectionState.DISCONNECTING])
     def unsubscribe(self, quote_type: Union[str, QuoteType], symbol: str) -> bool:
         """
@@ -251,6 +292,9 @@ class RTDClient(COMObject):
                 
                 if result == 0:  # Success
                     del self.topics[topic_id]
+                    self.store.remove_topic(topic_id)
+                    if self.recorder is not None:
+                        self.recorder.record_unsubscribe(topic_id)
                     self.logger.debug(
                         f"Unsubscribed from {symbol} {quote_type_str}"
                     )
@@ -269,7 +313,7 @@ class RTDClient(COMObject):
 
 
     @handle_com_error(RTDUpdateError)
-    @log_method_call()
+    @trace_method()
     @validate_connection_state([RTDConnectionState.CONNECTED])
     def UpdateNotify(self) -> bool:
         """
@@ -285,7 +329,7 @@ class RTDClient(COMObject):
         return self.refresh_topics()
 
     @handle_com_error(RTDClientError)
-    @log_method_call()
+    @trace_method()
     @validate_connection_state([RTDConnectionState.CONNECTED])
     def refresh_topics(self) -> bool:
         """
@@ -316,11 +360,15 @@ class RTDClient(COMObject):
             
             if isinstance(data, tuple) and len(data) == 2:
                 topic_ids, raw_values = data
-                for id, raw_value in zip(topic_ids, raw_values):
-                    if id in self.topics:
-                        symbol, quote_type = self.topics[id]
-                        quote_obj = Quote(quote_type, symbol, raw_value)
-                        self._handle_quote_update(id, symbol, quote_type, quote_obj)
+                timestamp = self._last_refresh_time
+                if self.recorder is not None:
+                    self.recorder.record_batch(timestamp, topic_ids, raw_values)
+                # One pass over the batch with the per-topic parsers
+                changed_ids = self.store.update_batch(topic_ids, raw_values, timestamp)
+                if len(changed_ids):
+                    self._updates_ready.set()
+                    if self.quote_db is not None or self.tick_db is not None:
+                        self._persist_changes(changed_ids.tolist())
                 return True
             else:
                 self.logger.warning(f"Unexpected data format in RefreshData result: {data}")
@@ -331,37 +379,89 @@ class RTDClient(COMObject):
             return False
 
 
-    def _handle_quote_update(self, id: int, symbol: str, quote_type: str, quote: Quote) -> None:
+    def _persist_changes(self, topic_ids: List[int]) -> None:
+        """
+        Write the values a refresh batch changed to the LMDB stores.
+
+        Args:
+            topic_ids: Topics whose value changed in the batch
+        """
+        entries = self.store.entries(topic_ids)
+        if self.quote_db is not None:
+            self.quote_db.write_batch(*entries)
+        if self.tick_db is not None:
+            self.tick_db.append(*entries)
+
+    def _handle_quote_update(self, id: int, symbol: str, quote_type: str, raw_value: Any, timestamp: float) -> bool:
         """
         Process a single quote update.
+
+        refresh_topics parses whole batches through QuoteStore.update_batch;
+        this is the per-value path for updates arriving one at a time.
         
         Args:
             id: Topic ID
             symbol: Trading symbol
             quote_type: Type of quote
-            quote: Quote object
+            raw_value: Value as received from RefreshData
+            timestamp: Time the refresh batch was received
+
+        Returns:
+            bool: True if the stored value changed
         """
         try:
-            if quote.value is None:
+            value = converter_for(quote_type)(raw_value)
+            if value is None:
                 self.logger.debug(f"Null value received for {symbol} {quote_type}")
-                return
+                return False
 
             # Update latest value
-            with self._value_lock:
-                key = (symbol, quote_type)
-                old_value = None
-                if key in self._latest_values:
-                    old_value = self._latest_values[key].value
-                self._latest_values[key] = quote
-                value_changed = old_value != quote.value
+            value_changed = self.store.update(id, value, timestamp)
 
             # Commenting this out for now. 
             """ if value_changed:
                 timestamp = datetime.now().strftime("%H:%M:%S")
-                self.logger.quote(f"[{timestamp}] LIVE {symbol} {quote_type}: {str(quote)}") """
+                self.logger.quote(f"[{timestamp}] LIVE {symbol} {quote_type}: {Quote(quote_type, symbol, value)}") """
+
+            return bool(value_changed)
             
         except Exception as e:
             self.logger.error(f"Error handling quote update: {e}")
+            return False
+
+    def wait_for_update(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until refresh_topics has stored new values.
+
+        Only useful when updates are delivered on another thread; COM
+        callbacks arrive while the owning thread pumps messages.
+
+        Args:
+            timeout: Maximum seconds to wait, None waits forever
+
+        Returns:
+            bool: True if new values are available
+        """
+        return self._updates_ready.wait(timeout)
+
+    @property
+    def last_refresh_time(self) -> Optional[float]:
+        """Time of the last RefreshData call (epoch seconds), None before the first."""
+        return self._last_refresh_time
+
+    def consume_updates(self) -> bool:
+        """
+        Check for and acknowledge new values since the last call.
+
+        Returns:
+            bool: True if values changed since the last call
+        """
+        if not self._updates_ready.is_set():
+            return False
+        # Clear before the caller reads the store so a refresh racing
+        # with the read is flagged again instead of lost.
+        self._updates_ready.clear()
+        return True
 
     @handle_com_error(RTDHeartbeatError)
     @log_method_call()
@@ -426,10 +526,14 @@ class RTDClient(COMObject):
     @handle_com_error(RTDServerError)
     @log_method_call()
     @validate_connection_state([RTDConnectionState.CONNECTED, RTDConnectionState.CONNECTING])
-    def Disconnect(self) -> None:
+    def Disconnect(self, unsubscribe: bool = True) -> None:
         """
         Disconnect from the RTD server and cleanup resources.
         Note: Method name capitalized to match COM interface.
+
+        Args:
+            unsubscribe: Unsubscribe topics first. Pass False when the
+                         server is gone (e.g. before reconnecting).
         
         Performs orderly shutdown:
         1. Unsubscribes from all topics
@@ -456,7 +560,7 @@ class RTDClient(COMObject):
                 # Unsubscribe but can be optional as Excel doesn't seem to do it or not
                 # very effectively for large number of topics
                 subscriptions = [(qt, sym) for sym, qt in self.topics.values()]
-                if subscriptions:
+                if subscriptions and unsubscribe:
                     unsubscribe_results = self.batch_unsubscribe(subscriptions)
                     
                 # Clear any remaining topics from memory
@@ -470,8 +574,15 @@ class RTDClient(COMObject):
                         self.logger.error(f"Error terminating server: {e}")
                     finally:
                         self.server = None
+
+                if self.recorder is not None:
+                    self.recorder.close()
+                if self.quote_db is not None:
+                    self.quote_db.sync()
+                if self.tick_db is not None:
+                    self.tick_db.sync()
                 
-                cleanup.cleanup_com()
+                self.transport.uninitialize_thread()
                 self._state = RTDConnectionState.DISCONNECTED
                 self.logger.info("Disconnect completed")
                 
@@ -517,6 +628,9 @@ class RTDClient(COMObject):
     ) -> Dict[Tuple[str, str], bool]:
         """
         Subscribe to multiple quote types and symbols at once.
+
+        Topics are submitted in paced chunks and failures are retried
+        individually, see SubscriptionPipeline.
         
         Args:
             subscriptions: List of (quote_type, symbol) tuples
@@ -524,23 +638,7 @@ class RTDClient(COMObject):
         Returns:
             dict: Mapping of (quote_type, symbol) to subscription success status
         """
-        results = {}
-        for quote_type, symbol in subscriptions:
-            try:
-                topic_id = self.subscribe(quote_type, symbol)
-                results[(str(quote_type), symbol)] = topic_id is not None
-            except Exception as e:
-                self.logger.error(
-                    f"Error in batch subscribe for {symbol} {quote_type}: {e}"
-                )
-                results[(str(quote_type), symbol)] = False
-                
-        successful = sum(1 for result in results.values() if result)
-        self.logger.info(
-            f"Batch subscribe completed: {successful}/{len(subscriptions)} "
-            "successful"
-        )
-        return results
+        return SubscriptionPipeline(self).subscribe(subscriptions)
 
     def batch_unsubscribe(
         self,
@@ -555,24 +653,46 @@ class RTDClient(COMObject):
         Returns:
             dict: Mapping of (quote_type, symbol) to unsubscription success status
         """
-        results = {}
-        for quote_type, symbol in subscriptions:
-            try:
-                success = self.unsubscribe(quote_type, symbol)
-                results[(str(quote_type), symbol)] = success
-            except Exception as e:
-                self.logger.error(
-                    f"Error in batch unsubscribe for {symbol} {quote_type}: {e}"
-                )
-                results[(str(quote_type), symbol)] = False
-                
-        successful = sum(1 for result in results.values() if result)
+        return SubscriptionPipeline(self).unsubscribe(subscriptions)
+
+
+    def sync_topics(
+        self,
+        desired: List[Tuple[Union[str, QuoteType], str]]
+    ) -> Dict[str, Dict[Tuple[str, str], bool]]:
+        """
+        Bring the live subscription set in line with a desired topic set.
+
+        Only the difference against the current topics is sent to the
+        server, so widening a strike range costs just the new strikes
+        instead of a full reconnect.
+        
+        Args:
+            desired: List of (quote_type, symbol) tuples that should be subscribed
+            
+        Returns:
+            dict: 'added' and 'removed' mappings of (quote_type, symbol) to success status
+        """
+        desired_keys = {
+            (topic.validate_quote_type(quote_type), symbol)
+            for quote_type, symbol in desired
+        }
+        with self._topic_lock:
+            current_keys = {
+                (quote_type, symbol) for symbol, quote_type in self.topics.values()
+            }
+
+        to_remove = sorted(current_keys - desired_keys, key=lambda t: (t[1], t[0]))
+        to_add = sorted(desired_keys - current_keys, key=lambda t: (t[1], t[0]))
         self.logger.info(
-            f"Batch unsubscribe completed: {successful}/{len(subscriptions)} "
-            "successful"
+            f"Topic sync: {len(to_add)} to add, {len(to_remove)} to remove, "
+            f"{len(current_keys & desired_keys)} unchanged"
         )
-        return results
 
+        pipeline = SubscriptionPipeline(self)
+        removed = pipeline.unsubscribe(to_remove) if to_remove else {}
+        added = pipeline.subscribe(to_add) if to_add else {}
+        return {'added': added, 'removed': removed}
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,212 @@
+"""
+Out-of-process RTD gateway.
+
+Run the gateway next to the dashboard with:
+
+    python -m src.rtd.gateway
+
+and set gateway.enabled in config.yaml. Both sides authenticate with the
+secret in the environment variable named by gateway.authkey_env
+(TOSRTD_GATEWAY_KEY); requests are pickled, so the key must stay private
+and there is no default. The gateway process owns the COM
+connection (through an RTDBroker) and publishes quotes into shared memory;
+Streamlit processes only send lease requests over a local socket and map
+the snapshot read-only, so tick handling no longer competes with chart
+rendering for the same GIL.
+"""
+from multiprocessing.connection import Client, Listener
+import os
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.core.error_handler import RTDConfigError
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+from src.rtd.broker import RTDBroker
+from src.rtd.shared_snapshot import SharedSnapshotReader, SharedSnapshotWriter
+
+
+logger = get_logger(__name__)
+
+def _gateway_address() -> Tuple[str, int]:
+    gateway = SETTINGS.get('gateway', {})
+    return gateway.get('host', '127.0.0.1'), int(gateway.get('port', 6001))
+
+
+def _gateway_authkey() -> bytes:
+    """
+    Read the gateway secret from the environment.
+
+    Raises:
+        RTDConfigError: If the variable named by gateway.authkey_env is unset or empty
+    """
+    variable = SETTINGS.get('gateway', {}).get('authkey_env', 'TOSRTD_GATEWAY_KEY')
+    authkey = os.environ.get(variable, '')
+    if not authkey:
+        raise RTDConfigError(
+            f"RTD gateway needs a shared secret: set {variable} to the same random value "
+            "for the gateway and the dashboard (e.g. python -c \"import secrets; print(secrets.token_hex(32))\")"
+        )
+    return authkey.encode('utf-8')
+
+
+class RTDGateway:
+    """
+    Gateway process serving broker leases to local consumers.
+
+    Requests are (command, args) tuples answered with (ok, result):
+    'subscribe' (session_id, symbols), 'touch' (session_id,),
+    'release' (session_id,) and 'stats' ().
+    """
+
+    COMMANDS = ('subscribe', 'touch', 'release', 'stats')
+
+    def __init__(self, address: Optional[Tuple[str, int]] = None, authkey: Optional[bytes] = None) -> None:
+        self.address = address or _gateway_address()
+        self.authkey = authkey or _gateway_authkey()
+        self.writer = SharedSnapshotWriter()
+        self.broker = RTDBroker(snapshots=self.writer)
+        self._stop_event = Event()
+        self._listener = None
+
+    def serve_forever(self) -> None:
+        """Accept consumer connections until stop() is called."""
+        self._listener = Listener(self.address, authkey=self.authkey)
+        logger.info(
+            f"RTD gateway listening on {self.address[0]}:{self.address[1]}, "
+            f"snapshot segment '{self.writer.name}'"
+        )
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    conn = self._listener.accept()
+                except OSError:
+                    break
+                except Exception as e:
+                    logger.warning(f"Rejected gateway connection: {e}")
+                    continue
+                Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop serving, drop all leases and remove the shared segment."""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        if self._listener is not None:
+            self._listener.close()
+        self.broker.shutdown()
+        self.writer.close()
+        logger.info("RTD gateway stopped")
+
+    def _handle(self, conn: Any) -> None:
+        """Answer one consumer's requests until it disconnects."""
+        with conn:
+            while not self._stop_event.is_set():
+                try:
+                    command, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if command not in self.COMMANDS:
+                        raise ValueError(f"Unknown gateway command: {command}")
+                    result = getattr(self.broker, command)(*args)
+                    if command == 'subscribe':
+                        # The writer is not picklable; consumers attach by name
+                        result = self.writer.name
+                    conn.send((True, result))
+                except Exception as e:
+                    logger.error(f"Gateway {command} failed: {e}")
+                    conn.send((False, str(e)))
+
+
+class GatewayClient:
+    """
+    Consumer-side stand-in for RTDBroker when the gateway is enabled.
+
+    Offers the same subscribe()/touch()/release()/stats() calls, forwarding
+    them to the gateway process, and returns a SharedSnapshotReader over the
+    gateway's shared memory segment instead of a SnapshotBuffer. Safe to
+    share between sessions (one connection guarded by a lock).
+    """
+
+    def __init__(self, address: Optional[Tuple[str, int]] = None, authkey: Optional[bytes] = None) -> None:
+        self.address = address or _gateway_address()
+        self.authkey = authkey or _gateway_authkey()
+        self._lock = Lock()
+        self._conn = None
+        self._reader: Optional[SharedSnapshotReader] = None
+        self._leases: Dict[str, Tuple[str, ...]] = {}
+
+    def subscribe(self, session_id: str, symbols: Iterable[str]) -> SharedSnapshotReader:
+        """
+        Set the symbols a session displays, replacing its previous set.
+
+        Unchanged symbol sets only renew the lease, so pages can call this
+        on every rerun.
+
+        Args:
+            session_id: Unique ID of the session (and page) holding the lease
+            symbols: Underlying and option symbols
+
+        Returns:
+            SharedSnapshotReader: Reader over the gateway's snapshot
+
+        Raises:
+            ConnectionError: If the gateway cannot be reached
+        """
+        symbols = tuple(symbols)
+        if self._leases.get(session_id) != symbols or not self.touch(session_id):
+            name = self._request('subscribe', session_id, list(symbols))
+            self._leases[session_id] = symbols
+            if self._reader is None or self._reader.name != name:
+                self._reader = SharedSnapshotReader(name)
+        return self._reader
+
+    def touch(self, session_id: str) -> bool:
+        """Renew a session's lease; False if it expired on the gateway."""
+        return self._request('touch', session_id)
+
+    def release(self, session_id: str) -> None:
+        """Drop a session's lease."""
+        self._leases.pop(session_id, None)
+        self._request('release', session_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the gateway broker's statistics."""
+        return self._request('stats')
+
+    def _request(self, command: str, *args: Any) -> Any:
+        """Send one request, reconnecting once if the connection dropped."""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = Client(self.address, authkey=self.authkey)
+                    self._conn.send((command, args))
+                    ok, result = self._conn.recv()
+                    break
+                except (EOFError, OSError) as e:
+                    self._conn = None
+                    if attempt:
+                        raise ConnectionError(
+                            f"RTD gateway unreachable at {self.address[0]}:{self.address[1]}: {e}"
+                        )
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+
+def main() -> None:
+    gateway = RTDGateway()
+    try:
+        gateway.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gateway.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+from datetime import datetime
+from pathlib import Path
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import array
+import struct
+import time
+
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS, resolve_path
+
+
+logger = get_logger(__name__)
+
+# Log layout (little-endian):
+#   file header  MAGIC
+#   record       kind u8 | timestamp_ns i64 | payload length u32 | payload
+#     TOPIC        topic_id u32 | quote_type (u16 len + utf-8) | symbol (u16 len + utf-8)
+#     UNSUBSCRIBE  topic_id u32
+#     BATCH        count u32 | topic_ids u32[count] | values (tag u8 + data)[count]
+# A record cut short by a crash is ignored when reading.
+MAGIC = b'TOSRTDR\x01'
+RECORD_TOPIC = 1
+RECORD_UNSUBSCRIBE = 2
+RECORD_BATCH = 3
+# Seconds a replay waits for the client to subscribe the recorded topics
+START_TIMEOUT = 5.0
+
+_RECORD_HEADER = struct.Struct('<BqI')
+_U32 = struct.Struct('<I')
+_U16 = struct.Struct('<H')
+_F64 = struct.Struct('<d')
+_I64 = struct.Struct('<q')
+
+_TAG_NONE = 0
+_TAG_FLOAT = 1
+_TAG_INT = 2
+_TAG_STR = 3
+
+
+def _encode_str(value: str) -> bytes:
+    data = value.encode('utf-8')[:0xFFFF]
+    return _U16.pack(len(data)) + data
+
+
+def _encode_value(value: Any) -> bytes:
+    if value is None:
+        return b'\x00'
+    if isinstance(value, float):
+        return b'\x01' + _F64.pack(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return b'\x02' + _I64.pack(value)
+    return b'\x03' + _encode_str(str(value))
+
+
+class BatchRecorder:
+    """
+    Append-only binary log of raw RefreshData batches.
+
+    RTDClient records every topic it subscribes and every RefreshData
+    batch exactly as received (before parsing), with the time it arrived,
+    so a session can be replayed through ReplayRTDServer. Topics are
+    logged as (quote_type, symbol) so replays can map them onto the topic
+    IDs of a new client.
+
+    Writes go to the file buffer on the RTD thread; the buffer is flushed
+    every flush_batches records or flush_interval seconds, whichever comes
+    first, and on close(). A crash loses at most that much of the tail.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        flush_batches: int = 100,
+        flush_interval: float = 1.0
+    ) -> None:
+        """
+        Open (or create) a log for appending.
+
+        Args:
+            path: Log file, or a directory to create a timestamped log in
+            flush_batches: Records written between flushes
+            flush_interval: Maximum seconds between flushes
+        """
+        path = Path(path)
+        if path.is_dir() or not path.suffix:
+            path.mkdir(parents=True, exist_ok=True)
+            path = path / f"rtd-{datetime.now():%Y%m%d-%H%M%S}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.flush_batches = flush_batches
+        self.flush_interval = flush_interval
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._lock = Lock()
+        self._file: Optional[BinaryIO] = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+        self.batches = 0
+        logger.info(f"Recording RefreshData batches to {path}")
+
+    @classmethod
+    def from_config(cls) -> Optional['BatchRecorder']:
+        """Create a recorder if recording.enabled is set in config."""
+        recording = SETTINGS.get('recording', {})
+        if not recording.get('enabled', False):
+            return None
+        return cls(
+            resolve_path(recording.get('path', 'recordings')),
+            flush_batches=recording.get('flush_batches', 100),
+            flush_interval=recording.get('flush_interval', 1.0)
+        )
+
+    def record_topic(self, topic_id: int, quote_type: str, symbol: str) -> None:
+        """Log a new subscription."""
+        self._write(
+            RECORD_TOPIC, time.time_ns(),
+            _U32.pack(topic_id) + _encode_str(quote_type) + _encode_str(symbol)
+        )
+
+    def record_unsubscribe(self, topic_id: int) -> None:
+        """Log a removed subscription."""
+        self._write(RECORD_UNSUBSCRIBE, time.time_ns(), _U32.pack(topic_id))
+
+    def record_batch(self, timestamp: float, topic_ids: Sequence[int], raw_values: Sequence[Any]) -> None:
+        """
+        Log one RefreshData batch.
+
+        Args:
+            timestamp: Arrival time (epoch seconds)
+            topic_ids: Topic IDs as received
+            raw_values: Raw values as received
+        """
+        payload = b''.join((
+            _U32.pack(len(topic_ids)),
+            array.array('I', topic_ids).tobytes(),
+            b''.join(map(_encode_value, raw_values)),
+        ))
+        self._write(RECORD_BATCH, int(timestamp * 1e9), payload)
+        self.batches += 1
+
+    def close(self) -> None:
+        """Flush and close the log."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def _write(self, kind: int, timestamp_ns: int, payload: bytes) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD_HEADER.pack(kind, timestamp_ns, len(payload)) + payload)
+            self._unflushed += 1
+            if (self._unflushed >= self.flush_batches
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+
+
+def _decode_str(data: memoryview, offset: int) -> Tuple[str, int]:
+    (length,) = _U16.unpack_from(data, offset)
+    offset += 2
+    return bytes(data[offset:offset + length]).decode('utf-8'), offset + length
+
+
+def _decode_batch(data: memoryview) -> Tuple[Tuple[int, ...], Tuple[Any, ...]]:
+    (count,) = _U32.unpack_from(data, 0)
+    ids = array.array('I')
+    ids.frombytes(data[4:4 + 4 * count])
+    offset = 4 + 4 * count
+    values = []
+    append = values.append
+    for _ in range(count):
+        tag = data[offset]
+        offset += 1
+        if tag == _TAG_FLOAT:
+            append(_F64.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag == _TAG_INT:
+            append(_I64.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag == _TAG_STR:
+            value, offset = _decode_str(data, offset)
+            append(value)
+        else:
+            append(None)
+    return tuple(ids), tuple(values)
+
+
+def read_log(path: Union[str, Path]) -> Iterator[Tuple]:
+    """
+    Read a recorded log.
+
+    Args:
+        path: Log file written by BatchRecorder
+
+    Yields:
+        ('topic', timestamp, topic_id, quote_type, symbol),
+        ('unsubscribe', timestamp, topic_id) or
+        ('batch', timestamp, topic_ids, raw_values); timestamps in epoch seconds
+
+    Raises:
+        ValueError: If the file is not a RefreshData log
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a RefreshData log")
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            kind, timestamp_ns, length = _RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                logger.warning(f"Ignoring truncated record at end of {path}")
+                return
+            data = memoryview(payload)
+            timestamp = timestamp_ns / 1e9
+            if kind == RECORD_BATCH:
+                ids, values = _decode_batch(data)
+                yield ('batch', timestamp, ids, values)
+            elif kind == RECORD_TOPIC:
+                (topic_id,) = _U32.unpack_from(data, 0)
+                quote_type, offset = _decode_str(data, 4)
+                symbol, _ = _decode_str(data, offset)
+                yield ('topic', timestamp, topic_id, quote_type, symbol)
+            elif kind == RECORD_UNSUBSCRIBE:
+                yield ('unsubscribe', timestamp, _U32.unpack_from(data, 0)[0])
+
+
+def recorded_subscriptions(path: Union[str, Path]) -> List[Tuple[str, str]]:
+    """
+    List the (quote_type, symbol) topics subscribed in a log.
+
+    Args:
+        path: Log file written by BatchRecorder
+
+    Returns:
+        list: Topics in subscription order, to subscribe before replaying
+    """
+    topics: Dict[Tuple[str, str], None] = {}
+    for record in read_log(path):
+        if record[0] == 'topic':
+            topics[(record[3], record[4])] = None
+    return list(topics)
+
+
+class ReplayRTDServer:
+    """
+    IRtdServer that plays back a recorded RefreshData log.
+
+    Playback starts once the client has subscribed every topic recorded
+    before the first batch (or after START_TIMEOUT seconds). Batches are
+    then released at their recorded pace divided by speed (speed 0 replays
+    as fast as the client consumes them) and each RefreshData call returns
+    exactly one recorded batch, so the client sees the same batch
+    boundaries as the original session. Recorded topic IDs are translated through
+    (quote_type, symbol) to the IDs the replaying client subscribed with;
+    topics it has not subscribed are dropped. Use with
+    SimulatedTransport(server_factory=...).
+
+    Attributes:
+        finished (Event): Set once the whole log has been played
+        stats (dict): Counters of batches and topics replayed
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        speed: Optional[float] = None,
+        buffer: Optional[int] = None
+    ) -> None:
+        """
+        Initialize the replay.
+
+        Args:
+            path: Log file. Defaults to replay.path from config.
+            speed: Playback speed, 1 = real time, 0 = as fast as possible.
+                   Defaults to replay.speed from config.
+            buffer: Batches released ahead of RefreshData. Defaults to config.
+        """
+        config = SETTINGS.get('replay', {})
+        path = path or config.get('path')
+        if not path:
+            raise ValueError("No replay log given (replay.path)")
+        self.path = resolve_path(path)
+        self.speed = speed if speed is not None else config.get('speed', 1.0)
+
+        self.notify_event: Optional[Event] = None
+        self.finished = Event()
+        self._callback = None
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+        self._ready: Queue = Queue(maxsize=buffer or config.get('buffer', 4))
+        self._notify_pending = False
+        self._awaiting_refresh = False
+        self._connected = Event()
+
+        self._client_ids: Dict[Tuple[str, str], int] = {}
+        self.stats = {'batches': 0, 'topics': 0, 'dropped_topics': 0}
+
+    def ServerStart(self, callback: Any) -> int:
+        self._callback = callback
+        self._thread = Thread(target=self._play, daemon=True)
+        self._thread.start()
+        return 1
+
+    def ConnectData(self, topic_id: int, strings: Sequence[str], get_new_values: Any) -> List[Any]:
+        with self._lock:
+            self._client_ids[(str(strings[0]).upper(), str(strings[1]))] = topic_id
+        self._connected.set()
+        return [True, 'N/A']
+
+    def RefreshData(self) -> List[Any]:
+        try:
+            recorded, ids, values = self._ready.get_nowait()
+        except Empty:
+            recorded, ids, values = {}, (), ()
+        with self._lock:
+            client_ids = self._client_ids
+            pairs = [
+                (client_ids[key], value)
+                for key, value in ((recorded.get(i), v) for i, v in zip(ids, values))
+                if key in client_ids
+            ]
+            self._awaiting_refresh = False
+            if not self._ready.empty():
+                self._queue_notification()
+        self.stats['topics'] += len(pairs)
+        self.stats['dropped_topics'] += len(ids) - len(pairs)
+        if not pairs:
+            return [0, ((), ())]
+        return [len(pairs), (tuple(p[0] for p in pairs), tuple(p[1] for p in pairs))]
+
+    def DisconnectData(self, topic_id: int) -> int:
+        with self._lock:
+            for key, client_id in list(self._client_ids.items()):
+                if client_id == topic_id:
+                    del self._client_ids[key]
+        return 0
+
+    def Heartbeat(self) -> int:
+        return 1
+
+    def ServerTerminate(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._callback = None
+
+    def deliver_notifications(self) -> None:
+        """Call UpdateNotify if a batch is waiting. Client thread only."""
+        if not self._notify_pending or self._callback is None:
+            return
+        self._notify_pending = False
+        self._callback.UpdateNotify()
+
+    def _queue_notification(self) -> None:
+        """Raise one UpdateNotify until the next RefreshData; caller holds the lock."""
+        if self._awaiting_refresh:
+            return
+        self._awaiting_refresh = True
+        self._notify_pending = True
+        if self.notify_event is not None:
+            self.notify_event.set()
+
+    def _play(self) -> None:
+        recorded: Dict[int, Tuple[str, str]] = {}
+        # Batches share one mapping until the next topic record changes it
+        mapping: Dict[int, Tuple[str, str]] = {}
+        topics_changed = False
+        start_wall = 0.0
+        start_recorded = None
+        try:
+            for record in read_log(self.path):
+                if self._stop_event.is_set():
+                    return
+                kind = record[0]
+                if kind == 'topic':
+                    recorded[record[2]] = (record[3].upper(), record[4])
+                    topics_changed = True
+                    continue
+                if kind == 'unsubscribe':
+                    recorded.pop(record[2], None)
+                    topics_changed = True
+                    continue
+                if topics_changed:
+                    mapping = dict(recorded)
+                    topics_changed = False
+
+                _, timestamp, ids, values = record
+                if start_recorded is None:
+                    if not self._wait_for_subscriptions(mapping.values()):
+                        return
+                    logger.info(f"Replaying {self.path} at {self.speed or 'max'}x")
+                    start_wall = time.perf_counter()
+                    start_recorded = timestamp
+                if self.speed:
+                    due = start_wall + (timestamp - start_recorded) / self.speed
+                    delay = due - time.perf_counter()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        return
+                self._release(mapping, ids, values)
+        except Exception as e:
+            logger.error(f"Replay of {self.path} failed: {e}")
+        finally:
+            self.finished.set()
+            logger.info(
+                f"Replay finished: {self.stats['batches']} batches, "
+                f"{self.stats['topics']} topic updates"
+            )
+
+    def _wait_for_subscriptions(self, topics: Iterable[Tuple[str, str]]) -> bool:
+        """Wait until the client subscribed topics; False if stopped meanwhile."""
+        deadline = time.monotonic() + START_TIMEOUT
+        missing = set(topics)
+        while not self._stop_event.is_set():
+            with self._lock:
+                missing.difference_update(self._client_ids)
+            if not missing:
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning(f"Replay starting with {len(missing)} recorded topics not subscribed")
+                return True
+            self._connected.wait(0.05)
+            self._connected.clear()
+        return False
+
+    def _release(self, recorded: Dict[int, Tuple[str, str]], ids: Sequence[int], values: Sequence[Any]) -> None:
+        """Queue one recorded batch; RefreshData maps it to client topic IDs."""
+        batch = (recorded, ids, values)
+        while not self._stop_event.is_set():
+            try:
+                self._ready.put(batch, timeout=0.1)
+                break
+            except Full:
+                continue
+        else:
+            return
+        self.stats['batches'] += 1
+        with self._lock:
+            self._queue_notification()
@@ -1,130 +1,336 @@
 # src/rtd/rtd_worker.py
-import pythoncom
 import time
 import threading
-from queue import Queue
+from src.analytics.greeks_engine import (
+    GREEKS_SOURCE_LOCAL, GREEKS_SOURCE_RTD, GREEKS_SOURCE_VALIDATE, LocalGreeksEngine, greeks_source
+)
 from src.rtd.client import RTDClient
+from src.rtd.snapshot import SnapshotBuffer
+from src.rtd.subscription import SubscriptionPipeline
+from src.rtd.supervisor import HeartbeatSupervisor
+from src.rtd.transport import get_transport
 from src.core.settings import SETTINGS
+from src.utils.quote_store import LAST_CHANGED_FIELD
 from config.quote_types import QuoteType
 
+# Quote types subscribed for every option contract
+OPTION_QUOTE_TYPES = [
+    QuoteType.GAMMA,
+    QuoteType.OPEN_INT,
+    QuoteType.IMPL_VOL,
+    QuoteType.DELTA,
+    QuoteType.THETA,
+    QuoteType.VEGA,
+    QuoteType.RHO,
+    QuoteType.PROB_OF_EXPIRING,
+    QuoteType.PROB_OTM,
+    QuoteType.PROB_OF_TOUCHING
+]
+
+# Quote types subscribed for every option contract when greeks are
+# computed locally (options.greeks_source: local); LocalGreeksEngine only
+# needs IMPL_VOL and the underlying's LAST
+LOCAL_GREEKS_QUOTE_TYPES = [
+    QuoteType.IMPL_VOL,
+    QuoteType.OPEN_INT
+]
+
+# Quote types subscribed for the underlying
+UNDERLYING_QUOTE_TYPES = [
+    QuoteType.LAST,
+    QuoteType.MRKT_MKR_MOVE,
+    QuoteType.FRONT_EX_MOVE,
+    QuoteType.BACK_EX_MOVE
+]
+
+def option_quote_types(source: str = None) -> list:
+    """Quote types to subscribe per option for a greeks source, see options.greeks_source"""
+    source = source or greeks_source()
+    if source == GREEKS_SOURCE_LOCAL:
+        return LOCAL_GREEKS_QUOTE_TYPES
+    # validate compares against the RTD greeks, so it needs all of them
+    return OPTION_QUOTE_TYPES
+
 class RTDWorker:
-    def __init__(self, data_queue: Queue, stop_event: threading.Event):
-        self.data_queue = data_queue
+    def __init__(self, snapshots: SnapshotBuffer, stop_event: threading.Event, transport=None):
+        self.snapshots = snapshots
         self.stop_event = stop_event
         self.client = None
         self.initialized = False
+        self._pending_topics = None
+        self._pending_lock = threading.Lock()
+        # COM (or simulated) transport; the wake event lets update_symbols
+        # interrupt a worker blocked waiting for messages
+        self.transport = transport or get_transport()
+        self._wake_handle = self.transport.create_wake_event()
+        self.publish_interval = SETTINGS['timing'].get('publish_interval', 0.05)
+        self.idle_timeout = SETTINGS['timing'].get('worker_idle_timeout', 0.25)
+        # Topics to restore after a reconnect
+        self._topics = []
+        self.supervisor = HeartbeatSupervisor()
+        # Greeks priced in-process instead of (or checked against) RTD
+        source = greeks_source()
+        self.greeks_engine = (
+            None if source == GREEKS_SOURCE_RTD
+            else LocalGreeksEngine(validate=source == GREEKS_SOURCE_VALIDATE)
+        )
+
+    @staticmethod
+    def _topics_for(all_symbols: list) -> list:
+        """Build the (quote_type, symbol) topic list for underlying and option symbols"""
+        subscriptions = []
+        option_types = option_quote_types()
+        for symbol in all_symbols:
+            if symbol.startswith('.'):
+                # Subscribe to options data
+                quote_types = option_types
+            else:
+                # Subscribe to underlying stock data
+                quote_types = UNDERLYING_QUOTE_TYPES
+            subscriptions.extend((quote_type, symbol) for quote_type in quote_types)
+        return subscriptions
+
+    def update_symbols(self, all_symbols: list):
+        """
+        Change the subscribed symbols without reconnecting.
+
+        Safe to call from any thread; the worker thread applies the change
+        on its next loop iteration (COM calls must stay on the thread that
+        created the client) and only subscribes/unsubscribes the difference.
+        """
+        self.update_topics(self._topics_for(all_symbols))
+
+    def update_topics(self, subscriptions: list):
+        """
+        Change the subscribed topics without reconnecting.
+
+        Like update_symbols() but takes the (quote_type, symbol) topic list
+        directly, for callers such as RTDBroker that merge several
+        subscribers' topics.
+        """
+        with self._pending_lock:
+            self._pending_topics = list(subscriptions)
+        self.transport.set_wake_event(self._wake_handle)
+
+    def _publish(self):
+        """
+        Publish values changed since the last call as a new snapshot version.
+
+        Only the changed topics are handed to the snapshot buffer, which
+        applies them to its back buffer and swaps it in for readers. Each
+        changed symbol also gets a "symbol:LAST_CHANGED" entry so readers
+        can tell stale strikes without tracking updates themselves.
+        """
+        changes, removed = self.client.store.drain_changes(LAST_CHANGED_FIELD)
+        if self.greeks_engine is not None:
+            local_changes, local_removed = self.greeks_engine.update(self.client.store)
+            changes.update(local_changes)
+            removed.extend(local_removed)
+        if changes or removed:
+            self.snapshots.publish(changes, removed)
+
+    def _publish_stored_values(self):
+        """
+        Publish the last values persisted for the subscribed option topics.
+
+        Readers get the previous session's chain immediately instead of
+        waiting for the server; live values replace them as they arrive.
+        Each symbol's "symbol:LAST_CHANGED" is set to the newest stored
+        arrival time, so the stale strike overlay greys the stored values
+        out until live data replaces them. Underlying quotes are left out:
+        pages center the option chain on the underlying's LAST, which must
+        be a live price.
+        """
+        if self.client.quote_db is None:
+            return
+        keys = [
+            f"{symbol}:{quote_type}" for symbol, quote_type in self.client.topics.values()
+            if symbol.startswith('.')
+        ]
+        stored = self.client.quote_db.read_records(keys)
+        if not stored:
+            return
+        changes = {}
+        changed_at = {}
+        for key, (value, timestamp) in stored.items():
+            changes[key] = value
+            symbol = key.rsplit(':', 1)[0]
+            changed_at[symbol] = max(timestamp, changed_at.get(symbol, 0.0))
+        changes.update((f"{symbol}:{LAST_CHANGED_FIELD}", timestamp) for symbol, timestamp in changed_at.items())
+        self.snapshots.publish(changes)
+
+    def _set_greeks_contracts(self):
+        """Point the local greeks engine at the subscribed option contracts"""
+        if self.greeks_engine is not None:
+            self.greeks_engine.set_contracts(symbol for _, symbol in self._topics)
+
+    def _wait_for_messages(self, timeout: float):
+        """
+        Sleep until a window/COM message arrives, the worker is woken, or timeout.
+
+        UpdateNotify is delivered as a message to this thread, so this wakes
+        as soon as the RTD server has new data while using no CPU when quiet.
+        """
+        self.transport.wait_for_messages(self._wake_handle, timeout)
+
+    def _apply_pending_topics(self):
+        with self._pending_lock:
+            subscriptions, self._pending_topics = self._pending_topics, None
+        if subscriptions is None:
+            return False
+
+        self._topics = list(subscriptions)
+        self._set_greeks_contracts()
+        results = self.client.sync_topics(subscriptions)
+        added = sum(1 for ok in results['added'].values() if ok)
+        removed = sum(1 for ok in results['removed'].values() if ok)
+        print(f"Updated subscriptions: +{added} / -{removed} topics")
+        return True
         
-    def start(self, all_symbols: list):
-        """Start RTD worker with all symbols at once"""
+    def start(self, all_symbols: list, topics: list = None):
+        """
+        Start RTD worker with all symbols at once.
+
+        topics, a list of (quote_type, symbol) tuples, replaces the topics
+        derived from all_symbols when given.
+        """
         try:
             if self.initialized:
                 print("Cleaning up previous instance...")
                 self.cleanup()
                 #time.sleep(.2)  # 1 Wait for proper cleanup
-                
-            pythoncom.CoInitialize()
+
+            # Held for the worker thread's lifetime; released by cleanup()
+            self.transport.initialize_thread()
             time.sleep(0.1)  # Increased delay for COM initialization
-            
-            self.client = RTDClient(heartbeat_ms=SETTINGS['timing']['initial_heartbeat'])
-            self.client.initialize()
-            self.initialized = True
-            
-            if not all_symbols:
+
+            subscriptions = topics if topics is not None else self._topics_for(all_symbols)
+            if not subscriptions:
                 print("No symbols provided!")
                 return
-                
-            success_count = 0
-            subscription_errors = []
-            
-            # Subscribe to all symbols at once with retry
-            for symbol in all_symbols:
-                retry_count = 0
-                while retry_count < 3:  # Try up to 3 times
-                    try:
-                        if symbol.startswith('.'):
-                            # Subscribe to options data
-                            quote_types = [
-                                QuoteType.GAMMA,
-                                QuoteType.OPEN_INT,
-                                QuoteType.IMPL_VOL,
-                                QuoteType.DELTA,
-                                QuoteType.THETA,
-                                QuoteType.VEGA,
-                                QuoteType.RHO,
-                                QuoteType.PROB_OF_EXPIRING,
-                                QuoteType.PROB_OTM,
-                                QuoteType.PROB_OF_TOUCHING
-                            ]
-                            for quote_type in quote_types:
-                                if self.client.subscribe(quote_type, symbol):
-                                    success_count += 1
-                        else:
-                            # Subscribe to underlying stock data
-                            print(f"Subscribing to data for {symbol}")
-                            quote_types = [
-                                QuoteType.LAST,
-                                QuoteType.MRKT_MKR_MOVE,
-                                QuoteType.FRONT_EX_MOVE,
-                                QuoteType.BACK_EX_MOVE
-                            ]
-                            for quote_type in quote_types:
-                                if self.client.subscribe(quote_type, symbol):
-                                    success_count += 1
-                        break  # Success, exit retry loop
-                    except Exception as sub_error:
-                        retry_count += 1
-                        if retry_count == 3:
-                            error_msg = f"Failed to subscribe to {symbol} after 3 attempts: {str(sub_error)}"
-                            subscription_errors.append(error_msg)
-                            print(error_msg)
-                        time.sleep(0.1)  # Short delay between retries
-            
+            self._topics = list(subscriptions)
+            self._set_greeks_contracts()
+
+            subscription_errors = self._connect()
             if subscription_errors:
-                self.data_queue.put({"error": "\n".join(subscription_errors)})
+                print("\n".join(subscription_errors))
+                self.snapshots.publish_error("\n".join(subscription_errors))
                 return
 
-            print(f"Successfully subscribed to {success_count} topics")
+            self.supervisor.started()
+            self._publish_stored_values()
             time.sleep(0.3)  # Wait for subscriptions to settle
             
-            message_count = 0
-            last_data = {}
+            last_publish = 0.0
+            updates_pending = True
             
             while not self.stop_event.is_set():
-                pythoncom.PumpWaitingMessages()
+                # Block until new data arrives; once it has, wait out the
+                # remainder of the publish interval to coalesce bursts.
+                if updates_pending:
+                    timeout = max(0.0, last_publish + self.publish_interval - time.time())
+                else:
+                    timeout = self.idle_timeout
+                if timeout > 0:
+                    self._wait_for_messages(timeout)
+                self.transport.pump_messages()
                 
                 try:
-                    with self.client._value_lock:
-                        if self.client._latest_values:
-                            current_data = {}
-                            for topic_str, quote in self.client._latest_values.items():
-                                symbol, quote_type = topic_str
-                                key = f"{symbol}:{quote_type}"
-                                current_data[key] = quote.value
-                            
-                            if current_data != last_data:
-                                message_count += 1
-                                while not self.data_queue.empty():
-                                    try:
-                                        self.data_queue.get_nowait()
-                                    except:
-                                        break
-                                
-                                self.data_queue.put(current_data)
-                                last_data = current_data.copy()
-                                
+                    # Removed topics must disappear from the next publish
+                    updates_pending |= self._apply_pending_topics()
+                except Exception as e:
+                    print(f"Subscription update error: {str(e)}")
+
+                if not self.supervisor.check(self.client):
+                    self._reconnect()
+                    if self.client is None:
+                        continue  # stopped while reconnecting
+                    updates_pending = True
+
+                try:
+                    self.supervisor.resubscribe_stale(self.client)
+                except Exception as e:
+                    print(f"Stale topic re-subscribe error: {str(e)}")
+
+                updates_pending = updates_pending or self.client.consume_updates()
+                if not updates_pending or time.time() - last_publish < self.publish_interval:
+                    continue
+
+                try:
+                    updates_pending = False
+                    last_publish = time.time()
+                    self._publish()
                 except Exception as e:
                     print(f"Data processing error: {str(e)}")
-                
-                time.sleep(1)
 
         except Exception as e:
             error_msg = f"RTD Error: {str(e)}"
             print(error_msg)
-            self.data_queue.put({"error": error_msg})
+            self.snapshots.publish_error(error_msg)
         finally:
             self.cleanup()
             print("RTDWorker cleanup complete")
 
+    def _connect(self):
+        """
+        Create and initialize a client and subscribe the remembered topics.
+
+        The client initializes COM itself and releases it on Disconnect(),
+        so reconnects leave the thread's COM reference count unchanged.
+
+        Returns:
+            list: Error messages for topics that failed to subscribe
+        """
+        self.client = RTDClient(
+            heartbeat_ms=SETTINGS['timing']['initial_heartbeat'],
+            transport=self.transport
+        )
+        self.client.initialize()
+        self.initialized = True
+
+        # Chunked and paced; only failed topics are retried
+        pipeline = SubscriptionPipeline(self.client)
+        results = pipeline.subscribe(self._topics)
+        success_count = sum(1 for ok in results.values() if ok)
+        print(
+            f"Successfully subscribed to {success_count} topics "
+            f"({pipeline.progress['acknowledged_per_sec']:.0f} topics/s)"
+        )
+        return [
+            f"Failed to subscribe to {symbol} {quote_type} after {pipeline.max_retries} attempts"
+            for (quote_type, symbol), ok in results.items() if not ok
+        ]
+
+    def _reconnect(self):
+        """
+        Replace a dead connection and restore the remembered topics.
+
+        Retries every consumer.reconnect_interval seconds until connected
+        or stopped. Snapshot readers keep the last values meanwhile.
+        """
+        self.supervisor.connection_lost(self.client)
+        print("RTD connection lost, reconnecting...")
+        while not self.stop_event.is_set():
+            if self.client is not None:
+                try:
+                    # The server is gone; unsubscribing would only fail topic by topic
+                    self.client.Disconnect(unsubscribe=False)
+                except Exception as e:
+                    print(f"Error dropping lost connection: {str(e)}")
+                self.client = None
+            try:
+                errors = self._connect()
+                if errors:
+                    print("\n".join(errors))
+                self.supervisor.reconnected()
+                print(f"Reconnected and restored {len(self.client.topics)} topics")
+                return
+            except Exception as e:
+                self.supervisor.reconnect_failed()
+                print(f"Reconnect failed: {str(e)}")
+                self.client = None  # initialize() already released what it set up
+            self.stop_event.wait(self.supervisor.reconnect_interval)
+
     def cleanup(self):
         if self.client:
             try:
@@ -134,7 +340,7 @@ class RTDWorker:
             except Exception as e:
                 print(f"Error during disconnect: {str(e)}")
         try:
-            pythoncom.CoUninitialize()
+            self.transport.uninitialize_thread()
         except Exception as e:
             print(f"Error during CoUninitialize: {str(e)}")
         self.initialized = False
\ No newline at end of file
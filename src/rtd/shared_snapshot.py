@@ -0,0 +1,412 @@
+from collections.abc import Mapping
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import os
+import time
+
+import numpy as np
+
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+
+
+logger = get_logger(__name__)
+
+# Segment layout:
+#   header  8 x uint64 (see _H_* indexes)
+#   values  float64[capacity], one slot per topic
+#   layout  JSON list of "symbol:QUOTE_TYPE" keys by slot (None for free slots)
+#   error   UTF-8 error message of the publisher
+_MAGIC = 0x5044535452534F54  # "TOSRTSDP"
+_HEADER_FIELDS = 8
+_HEADER_SIZE = _HEADER_FIELDS * 8
+_LAYOUT_BYTES_PER_SLOT = 48
+_ERROR_SIZE = 4096
+
+_H_MAGIC = 0
+_H_SEQ = 1
+_H_LAYOUT_VERSION = 2
+_H_CAPACITY = 3
+_H_LAYOUT_LEN = 4
+_H_ERROR_LEN = 5
+_H_PUBLISH_TIME = 6
+
+
+def _segment_size(capacity: int) -> int:
+    return _HEADER_SIZE + capacity * (8 + _LAYOUT_BYTES_PER_SLOT) + _ERROR_SIZE
+
+
+def _regions(buf: memoryview, capacity: int) -> Tuple[np.ndarray, np.ndarray, memoryview, memoryview]:
+    """Split a segment buffer into header, values, layout and error regions."""
+    header = np.ndarray((_HEADER_FIELDS,), dtype=np.uint64, buffer=buf)
+    values_end = _HEADER_SIZE + capacity * 8
+    values = np.ndarray((capacity,), dtype=np.float64, buffer=buf, offset=_HEADER_SIZE)
+    layout_end = values_end + capacity * _LAYOUT_BYTES_PER_SLOT
+    return header, values, buf[values_end:layout_end], buf[layout_end:layout_end + _ERROR_SIZE]
+
+
+class SharedSnapshotWriter:
+    """
+    Publishes the quote snapshot into a shared memory segment.
+
+    Drop-in publisher for RTDWorker (same publish()/publish_error() calls
+    as SnapshotBuffer), used by the out-of-process gateway. Every topic
+    owns a float64 slot; the slot -> key layout is stored next to the
+    values and only rewritten when topics are added or removed.
+
+    Writes are guarded by a seqlock: the sequence counter in the header is
+    odd while a publish is in progress and even once it is complete, so
+    readers in other processes can detect and retry torn reads without any
+    cross-process lock.
+
+    Attributes:
+        name (str): Shared memory segment name readers attach to
+        capacity (int): Number of topic slots
+        version (int): Number of completed publishes
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: Optional[int] = None) -> None:
+        """
+        Create the shared memory segment.
+
+        Args:
+            name: Segment name. Defaults to gateway.shm_name from config.
+            capacity: Topic slots. Defaults to gateway.capacity from config.
+        """
+        gateway = SETTINGS.get('gateway', {})
+        self.name = name or gateway.get('shm_name', 'tos_rtd_snapshot')
+        self.capacity = capacity or gateway.get('capacity', 16384)
+
+        self._shm = shared_memory.SharedMemory(
+            name=self.name, create=True, size=_segment_size(self.capacity)
+        )
+        self._header, self._values, self._layout_buf, self._error_buf = _regions(
+            self._shm.buf, self.capacity
+        )
+        self._values.fill(np.nan)
+        self._header[:] = 0
+        self._header[_H_CAPACITY] = self.capacity
+
+        self._slots: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._free: List[int] = []
+        self.version = 0
+
+        self._write_layout()
+        self._header[_H_MAGIC] = _MAGIC
+        logger.info(f"Shared snapshot '{self.name}' created with {self.capacity} slots")
+
+    def publish(
+        self,
+        changes: Dict[str, float],
+        removed: Iterable[str] = (),
+        full: bool = False
+    ) -> int:
+        """
+        Publish a change set. Writer thread only.
+
+        Args:
+            changes: {"symbol:QUOTE_TYPE": value} of changed topics
+            removed: Keys of topics that are no longer subscribed
+            full: True if changes replaces all prior values
+
+        Returns:
+            int: New version number
+
+        Raises:
+            RuntimeError: If the segment has no free slot for a new topic
+        """
+        self._begin_write()
+        try:
+            layout_changed = False
+            if full:
+                removed = [key for key in self._slots if key not in changes]
+            for key in removed:
+                slot = self._slots.pop(key, None)
+                if slot is not None:
+                    self._values[slot] = np.nan
+                    self._keys[slot] = None
+                    self._free.append(slot)
+                    layout_changed = True
+
+            values = self._values
+            slots = self._slots
+            for key, value in changes.items():
+                slot = slots.get(key)
+                if slot is None:
+                    slot = self._allocate(key)
+                    layout_changed = True
+                values[slot] = value
+
+            if layout_changed:
+                self._write_layout()
+            self._header[_H_ERROR_LEN] = 0
+        finally:
+            self._end_write()
+        return self.version
+
+    def publish_error(self, message: str) -> int:
+        """
+        Publish an error without changing values.
+
+        Args:
+            message: Error description shown to readers
+
+        Returns:
+            int: New version number
+        """
+        data = message.encode('utf-8')[:_ERROR_SIZE]
+        self._begin_write()
+        try:
+            self._error_buf[:len(data)] = data
+            self._header[_H_ERROR_LEN] = len(data)
+        finally:
+            self._end_write()
+        return self.version
+
+    def close(self) -> None:
+        """Release and remove the shared memory segment."""
+        self._header = self._values = None
+        self._layout_buf.release()
+        self._error_buf.release()
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _allocate(self, key: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+        else:
+            slot = len(self._keys)
+            if slot >= self.capacity:
+                raise RuntimeError(
+                    f"Shared snapshot '{self.name}' is full ({self.capacity} slots)"
+                )
+            self._keys.append(key)
+        self._slots[key] = slot
+        return slot
+
+    def _write_layout(self) -> None:
+        data = json.dumps(self._keys, separators=(',', ':')).encode('utf-8')
+        if len(data) > len(self._layout_buf):
+            raise RuntimeError(f"Shared snapshot '{self.name}' layout region is full")
+        self._layout_buf[:len(data)] = data
+        self._header[_H_LAYOUT_LEN] = len(data)
+        self._header[_H_LAYOUT_VERSION] += 1
+
+    def _begin_write(self) -> None:
+        self._header[_H_SEQ] += 1  # odd: write in progress
+
+    def _end_write(self) -> None:
+        self._header[_H_PUBLISH_TIME] = time.time_ns()
+        self._header[_H_SEQ] += 1  # even: consistent
+        self.version = int(self._header[_H_SEQ]) // 2
+
+
+class SharedQuoteMapping(Mapping):
+    """
+    Read-only {"symbol:QUOTE_TYPE": value} mapping over a slot array.
+
+    Topics without a value (NaN slots) are treated as missing, matching
+    the snapshots published by SnapshotBuffer.
+    """
+    __slots__ = ('_slots', '_values')
+
+    def __init__(self, slots: Dict[str, int], values: np.ndarray) -> None:
+        self._slots = slots
+        self._values = values
+
+    def __getitem__(self, key: str) -> float:
+        value = self._values[self._slots[key]]
+        if value != value:
+            raise KeyError(key)
+        return float(value)
+
+    def __iter__(self) -> Iterator[str]:
+        values = self._values
+        return (key for key, slot in self._slots.items() if values[slot] == values[slot])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class SharedSnapshot:
+    """
+    Consistent snapshot read from a shared memory segment.
+
+    Mirrors the attributes of snapshot.Snapshot so pages can consume
+    either source.
+
+    Attributes:
+        version (int): Version number, increases with every publish
+        data (Mapping[str, float]): Read-only quote mapping
+        error (str): Error reported by the publisher, None if healthy
+        timestamp (float): Time the snapshot was published
+    """
+    __slots__ = ('version', 'data', 'error', 'timestamp')
+
+    def __init__(self, version: int, data: Mapping, error: Optional[str], timestamp: float) -> None:
+        self.version = version
+        self.data = data
+        self.error = error
+        self.timestamp = timestamp
+
+
+class SharedSnapshotReader:
+    """
+    Attaches to a SharedSnapshotWriter segment from another process.
+
+    values is a read-only NumPy view straight onto the shared segment.
+    For zero-copy access, bracket reads with begin_read()/validate() and
+    retry when validate() fails. latest() and wait_for_version() offer the
+    SnapshotBuffer interface; their snapshots hold one contiguous copy of
+    the value slots (a single memcpy) so they stay consistent while a page
+    renders, and the decoded layout is shared until topics change.
+
+    Attributes:
+        values (np.ndarray): Read-only view of the value slots
+    """
+
+    def __init__(self, name: Optional[str] = None, poll_interval: Optional[float] = None) -> None:
+        """
+        Attach to an existing segment.
+
+        Args:
+            name: Segment name. Defaults to gateway.shm_name from config.
+            poll_interval: Seconds between version checks in wait_for_version().
+                           Defaults to gateway.poll_interval from config.
+
+        Raises:
+            FileNotFoundError: If the gateway has not created the segment
+            ValueError: If the segment is not a shared quote snapshot
+        """
+        gateway = SETTINGS.get('gateway', {})
+        self.name = name or gateway.get('shm_name', 'tos_rtd_snapshot')
+        self.poll_interval = poll_interval or gateway.get('poll_interval', 0.02)
+
+        try:
+            # Python 3.13+: do not let this process's resource tracker
+            # unlink a segment owned by the gateway
+            self._shm = shared_memory.SharedMemory(name=self.name, track=False)
+        except TypeError:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+            if os.name == 'posix':
+                resource_tracker.unregister(self._shm._name, 'shared_memory')
+
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.uint64, buffer=self._shm.buf)
+        if int(header[_H_MAGIC]) != _MAGIC:
+            self._shm.close()
+            raise ValueError(f"'{self.name}' is not a shared quote snapshot")
+        capacity = int(header[_H_CAPACITY])
+
+        self._header, self.values, self._layout_buf, self._error_buf = _regions(
+            self._shm.buf, capacity
+        )
+        self._header.flags.writeable = False
+        self.values.flags.writeable = False
+
+        self._layout_version = -1
+        self._slots: Dict[str, int] = {}
+
+    @property
+    def version(self) -> int:
+        """Version of the last completed publish."""
+        return int(self._header[_H_SEQ]) // 2
+
+    def begin_read(self) -> int:
+        """
+        Start a zero-copy read.
+
+        Returns:
+            int: Sequence number to pass to validate()
+        """
+        while True:
+            seq = int(self._header[_H_SEQ])
+            if not seq & 1:
+                return seq
+            time.sleep(0)
+
+    def validate(self, seq: int) -> bool:
+        """
+        Check that nothing was written since begin_read().
+
+        Args:
+            seq: Value returned by begin_read()
+
+        Returns:
+            bool: True if everything read in between is consistent
+        """
+        return int(self._header[_H_SEQ]) == seq
+
+    def slots(self) -> Dict[str, int]:
+        """
+        Get the current key -> slot index. Re-decoded only when topics change.
+
+        Returns:
+            dict: {"symbol:QUOTE_TYPE": slot}
+        """
+        while True:
+            seq = self.begin_read()
+            layout_version = int(self._header[_H_LAYOUT_VERSION])
+            if layout_version == self._layout_version:
+                slots = self._slots
+            else:
+                length = int(self._header[_H_LAYOUT_LEN])
+                raw = bytes(self._layout_buf[:length])
+                if not self.validate(seq):
+                    continue
+                keys = json.loads(raw)
+                slots = {key: slot for slot, key in enumerate(keys) if key is not None}
+            if self.validate(seq):
+                self._slots = slots
+                self._layout_version = layout_version
+                return slots
+
+    def latest(self) -> SharedSnapshot:
+        """
+        Read a consistent snapshot of the current values.
+
+        Returns:
+            SharedSnapshot: Latest published snapshot
+        """
+        while True:
+            slots = self.slots()
+            seq = self.begin_read()
+            if int(self._header[_H_LAYOUT_VERSION]) != self._layout_version:
+                continue
+            values = self.values.copy()
+            error_len = int(self._header[_H_ERROR_LEN])
+            error = bytes(self._error_buf[:error_len]).decode('utf-8', 'replace') if error_len else None
+            timestamp = int(self._header[_H_PUBLISH_TIME]) / 1e9
+            if self.validate(seq):
+                values.flags.writeable = False
+                return SharedSnapshot(seq // 2, SharedQuoteMapping(slots, values), error, timestamp)
+
+    def wait_for_version(self, version: int, timeout: Optional[float] = None) -> Optional[SharedSnapshot]:
+        """
+        Wait until a snapshot newer than version is published.
+
+        Args:
+            version: Last version the caller has seen
+            timeout: Maximum seconds to wait, None waits forever
+
+        Returns:
+            SharedSnapshot: Latest snapshot if newer than version, None on timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while self.version <= version:
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+        return self.latest()
+
+    def close(self) -> None:
+        """Detach from the segment; the gateway keeps it alive."""
+        self._header = self.values = None
+        self._layout_buf.release()
+        self._error_buf.release()
+        self._shm.close()
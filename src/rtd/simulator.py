@@ -0,0 +1,436 @@
+from datetime import date, datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import math
+import re
+import time
+
+import numpy as np
+
+from src.analytics.black_scholes import greeks
+from src.analytics.chain_frame import ROOT_UNDERLYINGS
+from src.analytics.zero_gamma import expiry_close
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+
+
+logger = get_logger(__name__)
+
+# .SPXW250129C6010 / .SPY250129P601.5
+OPTION_SYMBOL_PATTERN = re.compile(
+    r'^\.(?P<root>[A-Z/]+?)(?P<expiry>\d{6})(?P<right>[CP])(?P<strike>\d+(?:\.\d+)?)$'
+)
+
+# Quote types reported as percent strings, as ThinkorSwim does
+PERCENT_QUOTE_TYPES = {'IMPL_VOL', 'PROB_OF_EXPIRING', 'PROB_OTM', 'PROB_OF_TOUCHING'}
+
+OPTION_FIELDS = (
+    'LAST', 'BID', 'ASK', 'MARK', 'VOLUME', 'OPEN_INT', 'IMPL_VOL',
+    'DELTA', 'GAMMA', 'THETA', 'VEGA', 'RHO',
+    'PROB_OF_EXPIRING', 'PROB_OTM', 'PROB_OF_TOUCHING'
+)
+_OPTION_FIELD_CODES = {name: code for code, name in enumerate(OPTION_FIELDS)}
+
+
+class SimulatedRTDServer:
+    """
+    Pure-Python stand-in for the ThinkorSwim Tos.RTD server.
+
+    Implements the IRtdServer contract from src/rtd/interfaces.py with the
+    return shapes RTDClient sees through comtypes: ServerStart returns 1,
+    ConnectData [GetNewValues, value], RefreshData [count, (ids, values)],
+    DisconnectData 0 and Heartbeat 1.
+
+    A background thread ticks tick_rate times per second. Each tick moves
+    every underlying along a geometric random walk and re-prices a random
+    change_ratio fraction of the subscribed topics; option values come from
+    Black-Scholes with a volatility smile. Like the real server it raises
+    one UpdateNotify and then waits for RefreshData before notifying again.
+    Notifications are queued and delivered by deliver_notifications(),
+    called from the client thread's message pump (see SimulatedTransport).
+
+    Attributes:
+        notify_event (Event): Set when a notification is queued, assigned by the transport
+        stats (dict): Counters of ticks, refreshes and topics delivered
+    """
+
+    def __init__(
+        self,
+        tick_rate: Optional[float] = None,
+        change_ratio: Optional[float] = None,
+        underlying_price: Optional[float] = None,
+        volatility: Optional[float] = None,
+        skew: Optional[float] = None,
+        open_interest_mean: Optional[float] = None,
+        na_ratio: Optional[float] = None,
+        risk_free_rate: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Initialize the simulated server. Defaults come from the simulator
+        section of config.
+
+        Args:
+            tick_rate: Ticks per second, 0 disables automatic ticks (call tick())
+            change_ratio: Fraction of subscribed topics updated per tick
+            underlying_price: Starting price of every underlying
+            volatility: Annualized volatility of the price walk and ATM implied vol
+            skew: Smile curvature of implied vol against log-moneyness
+            open_interest_mean: Open interest of at-the-money strikes
+            na_ratio: Fraction of updates reported as 'N/A'
+            risk_free_rate: Rate used for option pricing
+            seed: Random seed for reproducible runs
+        """
+        config = SETTINGS.get('simulator', {})
+
+        def option(value, key, default):
+            return value if value is not None else config.get(key, default)
+
+        self.tick_rate = option(tick_rate, 'tick_rate', 10.0)
+        self.change_ratio = option(change_ratio, 'change_ratio', 0.2)
+        self.underlying_price = option(underlying_price, 'underlying_price', 5000.0)
+        self.volatility = option(volatility, 'volatility', 0.18)
+        self.skew = option(skew, 'skew', 0.8)
+        self.open_interest_mean = option(open_interest_mean, 'open_interest_mean', 2000)
+        self.na_ratio = option(na_ratio, 'na_ratio', 0.0)
+        self.risk_free_rate = option(risk_free_rate, 'risk_free_rate', 0.045)
+        self._rng = np.random.default_rng(option(seed, 'seed', None))
+
+        self.notify_event: Optional[Event] = None
+        self._callback = None
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+        self._notify_pending = False
+        self._awaiting_refresh = False
+
+        self._prices: Dict[str, float] = {}
+        self._topics: Dict[int, Tuple[str, str]] = {}
+        self._underlying_topics: Dict[int, Tuple[str, str]] = {}
+        self._values: Dict[int, Any] = {}
+        self._changed: Dict[int, None] = {}
+        self._volume: Dict[int, float] = {}
+        # Connected but not yet priced; priced together on the next tick
+        self._unpriced: Dict[int, None] = {}
+
+        # Option topics as parallel arrays so a tick re-prices them vectorized
+        self._option_rows: Dict[int, int] = {}
+        self._option_static: List[Tuple[str, float, float, bool, int, float]] = []
+        self._option_arrays: Optional[Dict[str, np.ndarray]] = None
+
+        self.stats = {'ticks': 0, 'notifications': 0, 'refreshes': 0, 'topics_delivered': 0}
+
+    # IRtdServer --------------------------------------------------------
+
+    def ServerStart(self, callback: Any) -> int:
+        """Store the IRTDUpdateEvent callback and start ticking."""
+        self._callback = callback
+        self._stop_event.clear()
+        if self.tick_rate and self.tick_rate > 0:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+        logger.info(
+            f"Simulated RTD server started ({self.tick_rate} ticks/s, "
+            f"{self.change_ratio:.0%} of topics per tick)"
+        )
+        return 1
+
+    def ConnectData(self, topic_id: int, strings: Sequence[str], get_new_values: Any) -> List[Any]:
+        """Subscribe a topic; strings is (quote_type, symbol)."""
+        quote_type, symbol = str(strings[0]).upper(), str(strings[1])
+        with self._lock:
+            self._topics[topic_id] = (symbol, quote_type)
+            match = OPTION_SYMBOL_PATTERN.match(symbol)
+            if match and quote_type in _OPTION_FIELD_CODES:
+                self._add_option_topic(topic_id, quote_type, match)
+            else:
+                underlying = symbol if not match else self._underlying_of(match.group('root'))
+                self._prices.setdefault(underlying, float(self.underlying_price))
+                self._underlying_topics[topic_id] = (underlying, quote_type)
+            self._unpriced[topic_id] = None
+        return [True, 'N/A']
+
+    def RefreshData(self) -> List[Any]:
+        """Return [count, (topic_ids, values)] of topics changed since the last call."""
+        with self._lock:
+            changed, self._changed = self._changed, {}
+            self._awaiting_refresh = False
+            ids = tuple(changed)
+            values = self._values
+            topics = self._topics
+            data = tuple(self._format(topics[i][1], values[i]) for i in ids)
+        self.stats['refreshes'] += 1
+        self.stats['topics_delivered'] += len(ids)
+        return [len(ids), (ids, data)]
+
+    def DisconnectData(self, topic_id: int) -> int:
+        """Unsubscribe a topic."""
+        with self._lock:
+            if self._topics.pop(topic_id, None) is None:
+                return 1
+            self._underlying_topics.pop(topic_id, None)
+            self._values.pop(topic_id, None)
+            self._changed.pop(topic_id, None)
+            self._volume.pop(topic_id, None)
+            self._unpriced.pop(topic_id, None)
+            row = self._option_rows.pop(topic_id, None)
+            if row is not None:
+                self._option_static[row] = None
+                self._option_arrays = None
+        return 0
+
+    def Heartbeat(self) -> int:
+        """Report the server as healthy while it is running."""
+        return 0 if self._stop_event.is_set() else 1
+
+    def ServerTerminate(self) -> None:
+        """Stop ticking and drop all topics."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        with self._lock:
+            self._topics.clear()
+            self._underlying_topics.clear()
+            self._values.clear()
+            self._changed.clear()
+            self._unpriced.clear()
+            self._option_rows.clear()
+            self._option_static.clear()
+            self._option_arrays = None
+        self._callback = None
+        logger.info("Simulated RTD server terminated")
+
+    # Simulation ---------------------------------------------------------
+
+    def deliver_notifications(self) -> None:
+        """Call UpdateNotify if one is queued. Client thread only."""
+        if not self._notify_pending or self._callback is None:
+            return
+        self._notify_pending = False
+        self.stats['notifications'] += 1
+        self._callback.UpdateNotify()
+
+    def tick(self) -> int:
+        """
+        Advance the market one step and queue a notification if anything changed.
+
+        Returns:
+            int: Number of topics re-priced
+        """
+        with self._lock:
+            dt = 1.0 / (self.tick_rate or 1.0) / (365.0 * 24 * 3600)
+            shock = self.volatility * math.sqrt(dt)
+            for underlying in self._prices:
+                self._prices[underlying] *= math.exp(shock * self._rng.standard_normal())
+
+            topic_ids = list(self._topics)
+            if not topic_ids:
+                return 0
+            picked = self._rng.random(len(topic_ids)) < self.change_ratio
+            selected = dict.fromkeys(topic_id for topic_id, hit in zip(topic_ids, picked) if hit)
+            selected.update(self._unpriced)
+            self._unpriced = {}
+            self._price_topics(list(selected))
+            self.stats['ticks'] += 1
+            notify = bool(self._changed) and not self._awaiting_refresh
+            if notify:
+                self._awaiting_refresh = True
+                self._notify_pending = True
+
+        if notify and self.notify_event is not None:
+            self.notify_event.set()
+        return len(selected)
+
+    def _run(self) -> None:
+        interval = 1.0 / self.tick_rate
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Simulated tick failed: {e}")
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                next_tick = time.perf_counter()  # falling behind; don't burst
+            elif self._stop_event.wait(delay):
+                break
+
+    @staticmethod
+    def _underlying_of(root: str) -> str:
+        return ROOT_UNDERLYINGS.get(root, root)
+
+    def _add_option_topic(self, topic_id: int, quote_type: str, match: Any) -> None:
+        """Register an option topic's static contract terms; caller holds the lock."""
+        underlying = self._underlying_of(match.group('root'))
+        spot = self._prices.setdefault(underlying, float(self.underlying_price))
+        strike = float(match.group('strike'))
+        close = expiry_close(datetime.strptime(match.group('expiry'), '%y%m%d').date())
+        moneyness = math.log(strike / spot)
+        open_interest = float(
+            self._rng.poisson(self.open_interest_mean * math.exp(-(moneyness / 0.03) ** 2) + 1)
+        )
+        self._option_rows[topic_id] = len(self._option_static)
+        self._option_static.append((
+            underlying, strike, close, match.group('right') == 'C',
+            _OPTION_FIELD_CODES[quote_type], open_interest
+        ))
+        self._option_arrays = None
+
+    def _option_table(self) -> Dict[str, np.ndarray]:
+        """Build (once per subscription change) the arrays of option contract terms."""
+        if self._option_arrays is None:
+            live = [
+                (topic_id, self._option_static[row])
+                for topic_id, row in self._option_rows.items()
+            ]
+            # Compact rows so removed topics don't accumulate
+            self._option_static = [terms for _, terms in live]
+            self._option_rows = {topic_id: row for row, (topic_id, _) in enumerate(live)}
+            columns = list(zip(*(terms for _, terms in live))) or [()] * 6
+            self._option_arrays = {
+                'underlying': np.array(columns[0], dtype=object),
+                'strike': np.array(columns[1], dtype=np.float64),
+                'expiry': np.array(columns[2], dtype=np.float64),
+                'is_call': np.array(columns[3], dtype=bool),
+                'field': np.array(columns[4], dtype=np.int64),
+                'open_interest': np.array(columns[5], dtype=np.float64),
+            }
+        return self._option_arrays
+
+    def _price_topics(self, topic_ids: List[int]) -> None:
+        """Recompute values of topic_ids and mark them changed; caller holds the lock."""
+        options = []
+        for topic_id in topic_ids:
+            if topic_id in self._option_rows:
+                options.append(topic_id)
+            elif topic_id in self._underlying_topics:
+                underlying, quote_type = self._underlying_topics[topic_id]
+                self._set(topic_id, self._underlying_value(topic_id, underlying, quote_type))
+        if options:
+            self._price_options(options)
+
+    def _underlying_value(self, topic_id: int, underlying: str, quote_type: str) -> float:
+        spot = self._prices[underlying]
+        daily_move = spot * self.volatility / math.sqrt(365.0)
+        if quote_type in ('LAST', 'MARK', 'CLOSE', 'OPEN', 'HIGH', 'LOW'):
+            return round(spot, 2)
+        if quote_type == 'BID':
+            return round(spot - 0.05, 2)
+        if quote_type == 'ASK':
+            return round(spot + 0.05, 2)
+        if quote_type == 'MRKT_MKR_MOVE':
+            return round(daily_move, 2)
+        if quote_type == 'FRONT_EX_MOVE':
+            return round(daily_move * math.sqrt(7.0), 2)
+        if quote_type == 'BACK_EX_MOVE':
+            return round(daily_move * math.sqrt(30.0), 2)
+        if quote_type == 'VOLUME':
+            volume = self._volume.get(topic_id, 0.0) + float(self._rng.poisson(500))
+            self._volume[topic_id] = volume
+            return volume
+        return float('nan')
+
+    def _price_options(self, topic_ids: List[int]) -> None:
+        """Vectorized Black-Scholes re-pricing of option topics."""
+        table = self._option_table()
+        rows = np.fromiter((self._option_rows[t] for t in topic_ids), dtype=np.int64, count=len(topic_ids))
+        strike = table['strike'][rows]
+        field = table['field'][rows]
+        spot = np.array([self._prices[u] for u in table['underlying'][rows]], dtype=np.float64)
+        years = (table['expiry'][rows] - time.time()) / (365.0 * 24 * 3600)
+
+        moneyness = np.log(strike / spot)
+        vol = self.volatility * (1.0 + self.skew * moneyness ** 2 * 100.0)
+        vol *= 1.0 + 0.01 * self._rng.standard_normal(len(rows))
+        result = greeks(spot, strike, years, self.risk_free_rate, vol, table['is_call'][rows])
+
+        price = np.maximum(result['price'], 0.01)
+        half_spread = np.maximum(0.05, price * 0.02)
+        prob_itm = result['prob_itm'] * 100.0
+        columns = {
+            'LAST': price,
+            'BID': np.maximum(price - half_spread, 0.0),
+            'ASK': price + half_spread,
+            'MARK': price,
+            'VOLUME': None,
+            'OPEN_INT': table['open_interest'][rows],
+            'IMPL_VOL': vol * 100.0,
+            'DELTA': result['delta'],
+            'GAMMA': result['gamma'],
+            'THETA': result['theta'],
+            'VEGA': result['vega'],
+            'RHO': result['rho'],
+            'PROB_OF_EXPIRING': prob_itm,
+            'PROB_OTM': 100.0 - prob_itm,
+            'PROB_OF_TOUCHING': result['prob_touch'] * 100.0,
+        }
+
+        values = np.full(len(rows), np.nan)
+        for name, code in _OPTION_FIELD_CODES.items():
+            mask = field == code
+            if not mask.any():
+                continue
+            if name == 'VOLUME':
+                volume_ids = [t for t, hit in zip(topic_ids, mask) if hit]
+                volumes = [self._volume.get(t, 0.0) + self._rng.poisson(5) for t in volume_ids]
+                self._volume.update(zip(volume_ids, volumes))
+                values[mask] = volumes
+            else:
+                values[mask] = columns[name][mask]
+
+        if self.na_ratio:
+            values[self._rng.random(len(rows)) < self.na_ratio] = np.nan
+        for topic_id, value in zip(topic_ids, np.round(values, 6).tolist()):
+            self._set(topic_id, value)
+
+    def _set(self, topic_id: int, value: float) -> None:
+        if self._values.get(topic_id) != value:
+            self._values[topic_id] = value
+            self._changed[topic_id] = None
+
+    @staticmethod
+    def _format(quote_type: str, value: float) -> Any:
+        """Render a value the way ThinkorSwim sends it."""
+        if value != value:
+            return 'N/A'
+        if quote_type in PERCENT_QUOTE_TYPES:
+            return f"{value:.2f}%"
+        return value
+
+
+def synthetic_subscriptions(
+    topic_count: int,
+    symbol: str = 'SPX',
+    price: Optional[float] = None,
+    expiry: Optional[date] = None,
+    strike_spacing: float = 5.0
+) -> List[Tuple[Any, str]]:
+    """
+    Build an option chain subscription list of roughly topic_count topics.
+
+    Uses the same quote types per symbol as RTDWorker, centred on price.
+
+    Args:
+        topic_count: Number of (quote_type, symbol) topics wanted
+        symbol: Underlying symbol
+        price: Center strike, defaults to simulator.underlying_price
+        expiry: Expiry date, defaults to one week out
+        strike_spacing: Distance between strikes
+
+    Returns:
+        list: Up to topic_count (quote_type, symbol) tuples
+    """
+    from src.rtd.rtd_worker import OPTION_QUOTE_TYPES, UNDERLYING_QUOTE_TYPES, RTDWorker
+    from src.utils.option_symbol_builder import OptionSymbolBuilder
+
+    price = price or SETTINGS.get('simulator', {}).get('underlying_price', 5000.0)
+    expiry = expiry or date.today() + timedelta(days=7)
+    option_topics = max(topic_count - len(UNDERLYING_QUOTE_TYPES), 0)
+    contracts = math.ceil(option_topics / len(OPTION_QUOTE_TYPES))
+    strikes = max(math.ceil(contracts / 2), 1)
+    strike_range = strike_spacing * (strikes // 2 + 1)
+
+    option_symbols = OptionSymbolBuilder.build_symbols(symbol, expiry, price, strike_range, strike_spacing)
+    return RTDWorker._topics_for([symbol] + option_symbols)[:topic_count]
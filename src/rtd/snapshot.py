@@ -0,0 +1,194 @@
+from collections import deque
+from threading import Condition, RLock
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional
+import time
+
+from src.core.settings import SETTINGS
+from src.rtd.changes import make_change_set
+
+
+class _Buffer:
+    """One side of the double buffer and the number of snapshots reading it."""
+    __slots__ = ('data', 'readers')
+
+    def __init__(self, data: Dict[str, float]) -> None:
+        self.data = data
+        self.readers = 0
+
+
+class Snapshot:
+    """
+    Immutable view of published quote values.
+
+    Holding a Snapshot keeps its buffer from being recycled by the writer,
+    so data stays consistent for as long as the snapshot is referenced.
+    Keep the Snapshot itself (not only .data) alive while reading.
+
+    Attributes:
+        version (int): Version number, increases with every publish
+        data (Mapping[str, float]): Read-only {"symbol:QUOTE_TYPE": value} mapping
+        error (str): Error reported by the publisher, None if healthy
+        timestamp (float): Time the snapshot was published
+    """
+    __slots__ = ('version', 'data', 'error', 'timestamp', '_buffer', '_lock')
+
+    def __init__(self, version: int, buffer: _Buffer, lock: RLock, error: Optional[str] = None) -> None:
+        with lock:
+            buffer.readers += 1
+        self.version = version
+        self.data = MappingProxyType(buffer.data)
+        self.error = error
+        self.timestamp = time.time()
+        self._buffer = buffer
+        self._lock = lock
+
+    def __del__(self) -> None:
+        with self._lock:
+            self._buffer.readers -= 1
+
+
+class SnapshotBuffer:
+    """
+    Single-writer / multi-reader holder of the latest quote snapshot.
+
+    The writer applies change sets to the back buffer and swaps it to the
+    front, bumping a version counter. Readers get the latest snapshot
+    without copying and can block until a newer version is published. The
+    writer only falls back to copying when a reader still holds the buffer
+    it is about to reuse.
+
+    A short history of change sets is kept so consumers maintaining their
+    own copy (see LocalSnapshot) can catch up with changes_since().
+
+    Attributes:
+        version (int): Version of the latest snapshot, 0 before the first publish
+    """
+
+    def __init__(self, history: Optional[int] = None) -> None:
+        """
+        Initialize an empty buffer.
+
+        Args:
+            history: Number of change sets kept for changes_since().
+                     Defaults to performance.snapshot_history from config.
+        """
+        self._lock = RLock()
+        self._cond = Condition(self._lock)
+        self._front = _Buffer({})
+        self._back = _Buffer({})
+        # Change set the back buffer is missing relative to the front
+        self._pending: Optional[Dict[str, Any]] = None
+        self.version = 0
+        self._latest = Snapshot(0, self._front, self._lock)
+
+        if history is None:
+            history = SETTINGS.get('performance', {}).get('snapshot_history', 64)
+        self._history = deque(maxlen=history)
+
+    def publish(
+        self,
+        changes: Dict[str, float],
+        removed: Iterable[str] = (),
+        full: bool = False
+    ) -> int:
+        """
+        Publish a change set as a new snapshot version. Writer thread only.
+
+        Args:
+            changes: {"symbol:QUOTE_TYPE": value} of changed topics
+            removed: Keys of topics that are no longer subscribed
+            full: True if changes replaces all prior values
+
+        Returns:
+            int: New version number
+        """
+        change_set = make_change_set(self.version + 1, changes, removed, full)
+        with self._cond:
+            back = self._back
+            if back.readers:
+                # Still referenced by an older snapshot; start from a copy
+                back = _Buffer(dict(self._front.data))
+            elif self._pending is not None:
+                self._apply(back.data, self._pending)
+
+            self._apply(back.data, change_set)
+            self._pending = change_set
+            self._back, self._front = self._front, back
+
+            self.version = change_set["seq"]
+            self._latest = Snapshot(self.version, back, self._lock)
+            self._history.append(change_set)
+            self._cond.notify_all()
+            return self.version
+
+    def publish_error(self, message: str) -> int:
+        """
+        Publish an error without changing values.
+
+        Args:
+            message: Error description shown to readers
+
+        Returns:
+            int: New version number
+        """
+        with self._cond:
+            self.version += 1
+            self._latest = Snapshot(self.version, self._front, self._lock, error=message)
+            # Keep history contiguous for changes_since()
+            self._history.append(make_change_set(self.version, {}))
+            self._cond.notify_all()
+            return self.version
+
+    def latest(self) -> Snapshot:
+        """
+        Get the latest snapshot without copying.
+
+        Returns:
+            Snapshot: Latest published snapshot
+        """
+        with self._lock:
+            return self._latest
+
+    def wait_for_version(self, version: int, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """
+        Block until a snapshot newer than version is published.
+
+        Args:
+            version: Last version the caller has seen
+            timeout: Maximum seconds to wait, None waits forever
+
+        Returns:
+            Snapshot: Latest snapshot if newer than version, None on timeout
+        """
+        with self._cond:
+            if self._cond.wait_for(lambda: self.version > version, timeout):
+                return self._latest
+            return None
+
+    def changes_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the change sets published after version.
+
+        Args:
+            version: Last version the caller has applied
+
+        Returns:
+            list: Change sets in order, None if history no longer reaches
+                  back that far (read latest() instead)
+        """
+        with self._lock:
+            if version >= self.version:
+                return []
+            if not self._history or self._history[0]["seq"] > version + 1:
+                return None
+            return [c for c in self._history if c["seq"] > version]
+
+    @staticmethod
+    def _apply(data: Dict[str, float], change_set: Dict[str, Any]) -> None:
+        if change_set["full"]:
+            data.clear()
+        else:
+            for key in change_set["removed"]:
+                data.pop(key, None)
+        data.update(change_set["changes"])
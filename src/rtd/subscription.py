@@ -0,0 +1,187 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import time
+
+from config.quote_types import QuoteType
+from src.core.settings import SETTINGS
+from src.utils import topic
+
+
+class SubscriptionPipeline:
+    """
+    Chunked, paced bulk subscription engine for an RTDClient.
+
+    Topics are submitted in chunks of performance.subscription_chunk_size
+    (performance.unsubscription_chunk_size when unsubscribing). Between
+    chunks COM messages are pumped and the pipeline waits timing.chunk_delay
+    so the TOS RTD server is not flooded. Only the topics that failed are
+    retried, and progress is tracked in topics requested/acknowledged per
+    second.
+
+    Attributes:
+        progress (dict): Counters of the last run, see _report_progress()
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        chunk_size: Optional[int] = None,
+        unsubscribe_chunk_size: Optional[int] = None,
+        chunk_delay: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        pump: Optional[Callable[[], Any]] = None,
+        on_progress: Optional[Callable[[Dict[str, float]], None]] = None
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            client: Connected RTDClient to (un)subscribe through
+            chunk_size: Topics per subscribe chunk. Defaults to config.
+            unsubscribe_chunk_size: Topics per unsubscribe chunk. Defaults to config.
+            chunk_delay: Seconds to wait between chunks. Defaults to config.
+            max_retries: Subscribe attempts per topic. Defaults to config.
+            pump: Callable pumping COM messages between chunks.
+                  Defaults to the client's transport.
+            on_progress: Optional callback receiving the progress dict after each chunk
+        """
+        performance = SETTINGS.get('performance', {})
+        self.client = client
+        self.logger = client.logger
+        self.chunk_size = chunk_size or performance.get('subscription_chunk_size', 50)
+        self.unsubscribe_chunk_size = (
+            unsubscribe_chunk_size or performance.get('unsubscription_chunk_size', 100)
+        )
+        self.chunk_delay = (
+            chunk_delay if chunk_delay is not None
+            else SETTINGS['timing'].get('chunk_delay', 0)
+        )
+        self.max_retries = max_retries or performance.get('subscription_retries', 3)
+        self.pump = pump or client.transport.pump_messages
+        self.on_progress = on_progress
+        self.progress: Dict[str, float] = {}
+
+    def subscribe(
+        self,
+        subscriptions: List[Tuple[Union[str, QuoteType], str]]
+    ) -> Dict[Tuple[str, str], bool]:
+        """
+        Subscribe to many topics in paced chunks, retrying failed topics only.
+
+        Args:
+            subscriptions: List of (quote_type, symbol) tuples
+
+        Returns:
+            dict: Mapping of (quote_type, symbol) to subscription success status
+        """
+        return self._run(
+            lambda quote_type, symbol: self.client.subscribe(quote_type, symbol) is not None,
+            subscriptions,
+            self.chunk_size,
+            self.max_retries,
+            "subscribe"
+        )
+
+    def unsubscribe(
+        self,
+        subscriptions: List[Tuple[Union[str, QuoteType], str]]
+    ) -> Dict[Tuple[str, str], bool]:
+        """
+        Unsubscribe from many topics in paced chunks.
+
+        Unsubscribe failures are not retried: a False result means the
+        topic is not subscribed, which another attempt will not change.
+
+        Args:
+            subscriptions: List of (quote_type, symbol) tuples
+
+        Returns:
+            dict: Mapping of (quote_type, symbol) to unsubscription success status
+        """
+        return self._run(
+            lambda quote_type, symbol: bool(self.client.unsubscribe(quote_type, symbol)),
+            subscriptions,
+            self.unsubscribe_chunk_size,
+            1,
+            "unsubscribe"
+        )
+
+    def _run(
+        self,
+        operation: Callable[[str, str], bool],
+        subscriptions: List[Tuple[Union[str, QuoteType], str]],
+        chunk_size: int,
+        max_attempts: int,
+        label: str
+    ) -> Dict[Tuple[str, str], bool]:
+        """Submit subscriptions chunk by chunk, then retry the failures."""
+        pending = []
+        for quote_type, symbol in subscriptions:
+            try:
+                pending.append((topic.validate_quote_type(quote_type), symbol))
+            except ValueError as e:
+                self.logger.error(f"Skipping {symbol}: {e}")
+
+        results = {key: False for key in pending}
+        self.progress = {
+            'requested': 0,
+            'acknowledged': 0,
+            'failed': 0,
+            'elapsed': 0.0,
+            'requested_per_sec': 0.0,
+            'acknowledged_per_sec': 0.0
+        }
+        start_time = time.time()
+
+        for attempt in range(1, max_attempts + 1):
+            failed = []
+            for start in range(0, len(pending), chunk_size):
+                chunk = pending[start:start + chunk_size]
+                for quote_type, symbol in chunk:
+                    try:
+                        success = operation(quote_type, symbol)
+                    except Exception as e:
+                        self.logger.debug(f"{label} error for {symbol} {quote_type}: {e}")
+                        success = False
+                    results[(quote_type, symbol)] = success
+                    if not success:
+                        failed.append((quote_type, symbol))
+
+                self.progress['requested'] += len(chunk)
+                self.progress['acknowledged'] = sum(1 for ok in results.values() if ok)
+                self._report_progress(start_time)
+
+                self.pump()
+                if self.chunk_delay and start + chunk_size < len(pending):
+                    time.sleep(self.chunk_delay)
+
+            if failed and attempt < max_attempts:
+                self.logger.warning(
+                    f"Bulk {label}: retrying {len(failed)} failed topics "
+                    f"(attempt {attempt + 1}/{max_attempts})"
+                )
+                time.sleep(self.chunk_delay)
+            pending = failed
+            if not pending:
+                break
+
+        self.progress['failed'] = len(pending)
+        self._report_progress(start_time)
+        self.logger.info(
+            f"Bulk {label} completed: {self.progress['acknowledged']}/{len(results)} "
+            f"successful in {self.progress['elapsed']:.2f}s "
+            f"({self.progress['acknowledged_per_sec']:.0f} topics/s)"
+        )
+        return results
+
+    def _report_progress(self, start_time: float) -> None:
+        """Refresh rate counters and notify the progress callback."""
+        elapsed = max(time.time() - start_time, 1e-9)
+        self.progress['elapsed'] = elapsed
+        self.progress['requested_per_sec'] = self.progress['requested'] / elapsed
+        self.progress['acknowledged_per_sec'] = self.progress['acknowledged'] / elapsed
+        self.logger.debug(
+            f"Subscription progress: {self.progress['acknowledged']}/"
+            f"{self.progress['requested']} acknowledged"
+        )
+        if self.on_progress:
+            self.on_progress(dict(self.progress))
@@ -0,0 +1,250 @@
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+import time
+
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+
+
+logger = get_logger(__name__)
+
+# Recent reconnects kept in HeartbeatSupervisor.history
+HISTORY_SIZE = 32
+
+
+class HeartbeatSupervisor:
+    """
+    Connection health checks and reconnect bookkeeping for RTDWorker.
+
+    The worker calls check() on every loop iteration; every
+    timing.heartbeat_check_interval seconds it calls the server's Heartbeat
+    and looks at the time of the last RefreshData. A failed heartbeat, or
+    no refresh for timing.refresh_stale_after seconds, marks the
+    connection lost. The worker then reconnects, retrying every
+    consumer.reconnect_interval seconds, and reports the outcome here.
+
+    With staleness.resubscribe set, resubscribe_stale() also re-subscribes
+    symbols whose values have not changed for staleness.resubscribe_after
+    seconds while the connection as a whole is healthy.
+
+    All methods run on the worker thread; COM calls must stay there.
+
+    Attributes:
+        stats (dict): Counters and timings, see __init__
+        history (deque): Recent reconnects as dicts of lost_at, reconnect_sec
+                         and gap_sec (None until data arrives again)
+    """
+
+    def __init__(
+        self,
+        check_interval: Optional[float] = None,
+        reconnect_interval: Optional[float] = None,
+        stale_after: Optional[float] = None
+    ) -> None:
+        """
+        Initialize the supervisor.
+
+        Args:
+            check_interval: Seconds between heartbeat checks. Defaults to config.
+            reconnect_interval: Seconds between reconnect attempts. Defaults to config.
+            stale_after: Seconds without RefreshData before the connection is
+                         considered lost, 0 disables. Defaults to config.
+        """
+        timing = SETTINGS['timing']
+        self.check_interval = check_interval or timing.get('heartbeat_check_interval', 30.0)
+        self.reconnect_interval = (
+            reconnect_interval or SETTINGS['consumer'].get('reconnect_interval', 5)
+        )
+        self.stale_after = (
+            stale_after if stale_after is not None else timing.get('refresh_stale_after', 0)
+        )
+        staleness = SETTINGS.get('staleness', {})
+        self.resubscribe = staleness.get('resubscribe', False)
+        self.resubscribe_after = staleness.get('resubscribe_after', 120)
+        self.stale_check_interval = staleness.get('check_interval', 30)
+        self.max_resubscribe = staleness.get('max_resubscribe', 200)
+        # Fields that legitimately never change intraday; never a sign of a dead topic
+        self.static_quote_types: Set[str] = set(staleness.get('static_quote_types', ['OPEN_INT']))
+
+        self._last_check = time.time()
+        self._last_stale_check = time.time()
+        self._connected_at = time.time()
+        self._lost_at: Optional[float] = None
+        self._last_data_at: Optional[float] = None
+        self._pending_gap: Optional[Dict[str, Any]] = None
+
+        self.history: deque = deque(maxlen=HISTORY_SIZE)
+        self.stats = {
+            'heartbeat_checks': 0,
+            'heartbeat_failures': 0,
+            'stale_refreshes': 0,
+            'reconnects': 0,
+            'reconnect_failures': 0,
+            'last_reconnect_sec': None,
+            'max_reconnect_sec': 0.0,
+            'last_gap_sec': None,
+            'max_gap_sec': 0.0,
+            'stale_checks': 0,
+            'stale_resubscribes': 0,
+        }
+
+    def check(self, client: Any, now: Optional[float] = None) -> bool:
+        """
+        Check the connection if a check is due.
+
+        Args:
+            client: Connected RTDClient
+            now: Current time, defaults to time.time()
+
+        Returns:
+            bool: False if the connection is lost and must be re-established
+        """
+        now = now or time.time()
+        self._observe_refresh(client)
+        if now - self._last_check < self.check_interval:
+            return True
+        self._last_check = now
+        self.stats['heartbeat_checks'] += 1
+
+        try:
+            healthy = client.check_heartbeat()
+        except Exception as e:
+            logger.warning(f"Heartbeat check failed: {e}")
+            healthy = False
+        if not healthy:
+            self.stats['heartbeat_failures'] += 1
+            return False
+
+        last_refresh = client.last_refresh_time or self._connected_at
+        if self.stale_after and now - last_refresh > self.stale_after:
+            self.stats['stale_refreshes'] += 1
+            logger.warning(f"No RefreshData for {now - last_refresh:.0f}s")
+            return False
+        return True
+
+    def resubscribe_stale(self, client: Any, now: Optional[float] = None) -> int:
+        """
+        Re-subscribe symbols that stopped changing, if a check is due.
+
+        RTD only pushes changes, so a single quiet field says little. A
+        symbol is re-subscribed only when none of its ticking topics (all
+        but static_quote_types, such as OPEN_INT) changed in
+        resubscribe_after seconds; then its ticking topics are
+        re-subscribed, up to max_resubscribe per check. Their last values
+        stay published until new ones arrive.
+
+        Args:
+            client: Connected RTDClient
+            now: Current time, defaults to time.time()
+
+        Returns:
+            int: Number of topics re-subscribed
+        """
+        now = now or time.time()
+        if not self.resubscribe or now - self._last_stale_check < self.stale_check_interval:
+            return 0
+        self._last_stale_check = now
+        self.stats['stale_checks'] += 1
+
+        stale_ids = client.store.stale_topics(self.resubscribe_after, now)
+        if not len(stale_ids):
+            return 0
+        topics = self._stale_symbol_topics(client, set(stale_ids.tolist()))[:self.max_resubscribe]
+        if not topics:
+            return 0
+
+        client.batch_unsubscribe(topics)
+        results = client.batch_subscribe(topics)
+        restored = sum(1 for ok in results.values() if ok)
+        self.stats['stale_resubscribes'] += restored
+        logger.info(
+            f"Re-subscribed {restored}/{len(topics)} topics unchanged for "
+            f"{self.resubscribe_after:.0f}s ({len(stale_ids)} stale)"
+        )
+        return restored
+
+    def _stale_symbol_topics(self, client: Any, stale_ids: Set[int]) -> List[Tuple[str, str]]:
+        """
+        Get the ticking (quote_type, symbol) topics of symbols whose ticking topics are all stale.
+
+        Args:
+            client: Connected RTDClient
+            stale_ids: IDs of topics without a recent change
+
+        Returns:
+            list: Topics to re-subscribe, grouped by symbol
+        """
+        by_symbol: Dict[str, List[Tuple[str, str]]] = {}
+        live_symbols: Set[str] = set()
+        for topic_id, (symbol, quote_type) in list(client.topics.items()):
+            if quote_type in self.static_quote_types:
+                continue
+            if topic_id in stale_ids:
+                by_symbol.setdefault(symbol, []).append((quote_type, symbol))
+            else:
+                live_symbols.add(symbol)
+        return [
+            topic for symbol, symbol_topics in by_symbol.items()
+            if symbol not in live_symbols
+            for topic in symbol_topics
+        ]
+
+    def started(self, now: Optional[float] = None) -> None:
+        """
+        Record that a connection was established; checks restart from here.
+
+        Args:
+            now: Current time, defaults to time.time()
+        """
+        self._connected_at = self._last_check = self._last_stale_check = now or time.time()
+
+    def connection_lost(self, client: Any, now: Optional[float] = None) -> None:
+        """
+        Record that the connection was lost.
+
+        Args:
+            client: The client that lost its connection
+            now: Current time, defaults to time.time()
+        """
+        self._lost_at = now or time.time()
+        # The data gap starts with the last refresh that did arrive
+        self._last_data_at = client.last_refresh_time or self._lost_at
+        logger.warning("RTD connection lost, reconnecting")
+
+    def reconnect_failed(self) -> None:
+        """Record a failed reconnect attempt."""
+        self.stats['reconnect_failures'] += 1
+
+    def reconnected(self, now: Optional[float] = None) -> None:
+        """
+        Record a successful reconnect.
+
+        Args:
+            now: Current time, defaults to time.time()
+        """
+        now = now or time.time()
+        lost_at = self._lost_at if self._lost_at is not None else now
+        duration = now - lost_at
+        self.stats['reconnects'] += 1
+        self.stats['last_reconnect_sec'] = duration
+        self.stats['max_reconnect_sec'] = max(self.stats['max_reconnect_sec'], duration)
+
+        self._pending_gap = {'lost_at': lost_at, 'reconnect_sec': duration, 'gap_sec': None}
+        self.history.append(self._pending_gap)
+        self._lost_at = None
+        self.started(now)
+        logger.info(f"RTD reconnected in {duration:.1f}s")
+
+    def _observe_refresh(self, client: Any) -> None:
+        """Close the pending data gap once the new client receives data."""
+        if self._pending_gap is None:
+            return
+        last_refresh = client.last_refresh_time
+        if last_refresh is None:
+            return
+        gap = last_refresh - self._last_data_at
+        self._pending_gap['gap_sec'] = gap
+        self._pending_gap = None
+        self.stats['last_gap_sec'] = gap
+        self.stats['max_gap_sec'] = max(self.stats['max_gap_sec'], gap)
+        logger.info(f"RTD data resumed after a {gap:.1f}s gap")
@@ -0,0 +1,179 @@
+from threading import Event
+from typing import Any, Optional, Sequence
+
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+
+try:
+    import pythoncom
+    import win32event
+    from comtypes import GUID
+    from comtypes.automation import VARIANT, VARIANT_BOOL
+    from comtypes.client import CreateObject
+    from src.rtd.interfaces import IRtdServer
+    HAS_COM = True
+except ImportError:
+    # Not on Windows (or pywin32/comtypes missing): only simulated transports
+    HAS_COM = False
+
+
+logger = get_logger(__name__)
+
+class COMTransport:
+    """
+    Transport to the ThinkorSwim RTD server over COM.
+
+    Bundles everything RTDClient and RTDWorker need from the platform:
+    per-thread COM setup, creating the IRtdServer, marshalling topic
+    strings, pumping messages and waiting for UpdateNotify.
+    """
+
+    name = 'com'
+
+    def __init__(self, progid: Optional[str] = None) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            progid: COM ProgID of the RTD server. Defaults to rtd.progid from config.
+
+        Raises:
+            RuntimeError: If pywin32/comtypes are not available
+        """
+        if not HAS_COM:
+            raise RuntimeError(
+                "COM transport requires Windows with pywin32 and comtypes; "
+                "set rtd.transport to 'simulated' to run without ThinkorSwim"
+            )
+        self.progid = progid or SETTINGS['rtd']['progid']
+
+    def initialize_thread(self) -> None:
+        """Initialize COM for the calling thread."""
+        pythoncom.CoInitialize()
+
+    def uninitialize_thread(self) -> None:
+        """Release COM for the calling thread."""
+        from src.utils.cleanup import cleanup_com
+        cleanup_com()
+
+    def create_server(self) -> Any:
+        """Create the IRtdServer instance."""
+        return CreateObject(GUID(self.progid), interface=IRtdServer)
+
+    def topic_strings(self, quote_type: str, symbol: str) -> Any:
+        """Build the Strings argument of ConnectData."""
+        strings = (VARIANT * 2)()
+        strings[0].value = quote_type
+        strings[1].value = symbol
+        return strings
+
+    def new_values_flag(self) -> Any:
+        """Build the GetNewValues argument of ConnectData."""
+        return VARIANT_BOOL(True)
+
+    def pump_messages(self) -> None:
+        """Dispatch pending window/COM messages (delivers UpdateNotify)."""
+        pythoncom.PumpWaitingMessages()
+
+    def create_wake_event(self) -> Any:
+        """Create an event that interrupts wait_for_messages() from any thread."""
+        return win32event.CreateEvent(None, 0, 0, None)
+
+    def set_wake_event(self, handle: Any) -> None:
+        """Signal an event created by create_wake_event()."""
+        win32event.SetEvent(handle)
+
+    def wait_for_messages(self, handle: Any, timeout: float) -> None:
+        """Block until a message arrives, handle is signalled or timeout seconds pass."""
+        win32event.MsgWaitForMultipleObjects(
+            [handle], False, int(timeout * 1000), win32event.QS_ALLINPUT
+        )
+
+
+class SimulatedTransport:
+    """
+    Transport to an in-process SimulatedRTDServer.
+
+    Reproduces the COM threading contract without COM: the server only
+    queues a notification when it has new data, and UpdateNotify is
+    delivered on the thread calling pump_messages(), just as an STA
+    delivers it while the owning thread pumps messages.
+    """
+
+    name = 'simulated'
+
+    def __init__(self, server_factory: Optional[Any] = None, **server_options: Any) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            server_factory: Callable returning a server, e.g. a replay server.
+                            Defaults to SimulatedRTDServer.
+            server_options: Keyword arguments for SimulatedRTDServer
+        """
+        self._signal = Event()
+        self.server_factory = server_factory
+        self.server_options = server_options
+        self.server = None
+
+    def initialize_thread(self) -> None:
+        pass
+
+    def uninitialize_thread(self) -> None:
+        pass
+
+    def create_server(self) -> Any:
+        if self.server_factory is not None:
+            self.server = self.server_factory()
+        else:
+            from src.rtd.simulator import SimulatedRTDServer
+            self.server = SimulatedRTDServer(**self.server_options)
+        self.server.notify_event = self._signal
+        return self.server
+
+    def topic_strings(self, quote_type: str, symbol: str) -> Sequence[str]:
+        return (quote_type, symbol)
+
+    def new_values_flag(self) -> bool:
+        return True
+
+    def pump_messages(self) -> None:
+        if self.server is not None:
+            self.server.deliver_notifications()
+
+    def create_wake_event(self) -> Event:
+        # Wake-ups and server notifications share one event: either just
+        # means "look again", and the worker re-checks everything anyway.
+        return self._signal
+
+    def set_wake_event(self, handle: Event) -> None:
+        handle.set()
+
+    def wait_for_messages(self, handle: Event, timeout: float) -> None:
+        if handle.wait(timeout):
+            handle.clear()
+
+
+def get_transport(name: Optional[str] = None) -> Any:
+    """
+    Create the transport selected in config.
+
+    Args:
+        name: 'com', 'simulated' or 'replay'. Defaults to rtd.transport from config,
+              falling back to 'simulated' when COM is not available.
+
+    Returns:
+        Transport instance
+
+    Raises:
+        ValueError: If the transport name is unknown
+    """
+    name = name or SETTINGS['rtd'].get('transport') or ('com' if HAS_COM else 'simulated')
+    if name == 'com':
+        return COMTransport()
+    if name == 'simulated':
+        return SimulatedTransport(**SETTINGS.get('simulator', {}))
+    if name == 'replay':
+        from src.rtd.recording import ReplayRTDServer
+        return SimulatedTransport(server_factory=ReplayRTDServer)
+    raise ValueError(f"Unknown RTD transport: {name}")
@@ -0,0 +1,4 @@
+from .realtime_quotes import RealtimeQuoteDB
+from .tick_history import TickHistoryDB
+
+__all__ = ['RealtimeQuoteDB', 'TickHistoryDB']
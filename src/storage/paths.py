@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from src.core.settings import SETTINGS, resolve_path
+
+# Transport whose data is real; every other transport gets its own stores
+LIVE_TRANSPORT = 'com'
+
+
+def store_path(db_setting: str, transport: str = LIVE_TRANSPORT) -> Path:
+    """
+    Get the LMDB environment directory of a store for a transport.
+
+    Simulated and replayed sessions write to stores of their own
+    ("realtime_quotes.simulated.lmdb" next to "realtime_quotes.lmdb"), so
+    synthetic values never show up in the live store.
+
+    Args:
+        db_setting: storage key holding the database name, e.g. 'realtime_quotes_db'
+        transport: Name of the transport the data comes from (transport.name)
+
+    Returns:
+        Path: Environment directory under storage.lmdb_path
+    """
+    storage = SETTINGS['storage']
+    name = Path(storage[db_setting])
+    if transport != LIVE_TRANSPORT:
+        name = name.with_name(f"{name.stem}.{transport}{name.suffix}")
+    return resolve_path(storage['lmdb_path']) / name
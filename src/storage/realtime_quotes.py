@@ -0,0 +1,251 @@
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+import struct
+
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+from src.storage.paths import LIVE_TRANSPORT, store_path
+
+try:
+    import lmdb
+except ImportError:
+    lmdb = None
+
+
+logger = get_logger(__name__)
+
+# Value record: latest value (float64) | arrival time in epoch seconds (float64)
+_RECORD = struct.Struct('<dd')
+
+
+class RealtimeQuoteDB:
+    """
+    LMDB-backed latest value per topic.
+
+    Keys are the QuoteStore topic keys ("symbol:QUOTE_TYPE", utf-8) and
+    values a fixed 16 byte record, written in one transaction per
+    RefreshData batch. Values outlive the RTD connection, so other
+    processes and restarts can read the last known chain state straight
+    from the memory map without subscribing.
+
+    Writes skip fsync (LMDB sync=False): after a crash the newest batches
+    may be lost but the database stays consistent, which is enough for a
+    cache of values the server sends again on reconnect.
+
+    LMDB allows one environment handle per process, so clients share the
+    instance returned by from_config(). Simulated and replayed sessions
+    get a separate store (see store_path()).
+    """
+
+    _shared: Dict[Path, 'RealtimeQuoteDB'] = {}
+    _shared_lock = Lock()
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        map_size: Optional[int] = None,
+        readonly: bool = False
+    ) -> None:
+        """
+        Open (or create) the database.
+
+        Args:
+            path: Environment directory. Defaults to storage.lmdb_path /
+                  storage.realtime_quotes_db from config.
+            map_size: Maximum database size in bytes. Defaults to
+                      storage.realtime_quotes_map_size from config.
+            readonly: Open for reading only (other processes)
+
+        Raises:
+            RuntimeError: If the lmdb package is not installed
+        """
+        if lmdb is None:
+            raise RuntimeError("RealtimeQuoteDB requires the lmdb package (pip install lmdb)")
+        storage = SETTINGS['storage']
+        if path is None:
+            path = store_path('realtime_quotes_db')
+        self.path = Path(path)
+        if not readonly:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+        self.env = lmdb.open(
+            str(self.path),
+            map_size=map_size or storage.get('realtime_quotes_map_size', 104857600),
+            readonly=readonly,
+            lock=True,
+            sync=False,
+            metasync=False,
+            max_readers=126,
+        )
+        self.stats = {'batches': 0, 'writes': 0, 'errors': 0}
+
+    @classmethod
+    def from_config(cls, transport: str = LIVE_TRANSPORT) -> Optional['RealtimeQuoteDB']:
+        """
+        Get the process-wide database if storage.realtime_quotes_enabled is set.
+
+        Args:
+            transport: Name of the transport the values come from
+
+        Returns:
+            RealtimeQuoteDB or None if disabled or unavailable
+        """
+        storage = SETTINGS['storage']
+        if not storage.get('realtime_quotes_enabled', False):
+            return None
+        path = store_path('realtime_quotes_db', transport)
+        with cls._shared_lock:
+            db = cls._shared.get(path)
+            if db is None or db.env is None:
+                try:
+                    db = cls._shared[path] = cls(path)
+                except Exception as e:
+                    logger.warning(f"Realtime quote database disabled: {e}")
+                    return None
+            return db
+
+    def write_batch(
+        self,
+        keys: Sequence[str],
+        values: Sequence[float],
+        timestamps: Sequence[float]
+    ) -> int:
+        """
+        Store the latest values of one refresh batch in a single transaction.
+
+        Args:
+            keys: Topic keys ("symbol:QUOTE_TYPE")
+            values: Latest value per key
+            timestamps: Arrival time per key (epoch seconds)
+
+        Returns:
+            int: Number of keys written
+        """
+        if not keys:
+            return 0
+        pack = _RECORD.pack
+        items = [
+            (key.encode('utf-8'), pack(value, timestamp))
+            for key, value, timestamp in zip(keys, values, timestamps)
+        ]
+        try:
+            with self.env.begin(write=True) as txn:
+                _, added = txn.cursor().putmulti(items)
+        except lmdb.MapFullError:
+            self.stats['errors'] += 1
+            logger.error(f"Realtime quote database full ({self.path}); raise realtime_quotes_map_size")
+            return 0
+        self.stats['batches'] += 1
+        self.stats['writes'] += added
+        return added
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        """
+        Read one topic.
+
+        Args:
+            key: Topic key ("symbol:QUOTE_TYPE")
+
+        Returns:
+            tuple: (value, timestamp), None if never stored
+        """
+        with self.env.begin(buffers=True) as txn:
+            data = txn.get(key.encode('utf-8'))
+            return None if data is None else _RECORD.unpack(data)
+
+    def read(self, keys: Iterable[str]) -> Dict[str, float]:
+        """
+        Read the latest values of several topics.
+
+        Args:
+            keys: Topic keys ("symbol:QUOTE_TYPE")
+
+        Returns:
+            dict: {key: value} for the keys that have been stored
+        """
+        result = {}
+        unpack = _RECORD.unpack_from
+        with self.env.begin(buffers=True) as txn:
+            get = txn.get
+            for key in keys:
+                data = get(key.encode('utf-8'))
+                if data is not None:
+                    result[key] = unpack(data)[0]
+        return result
+
+    def read_records(self, keys: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """
+        Read the latest values of several topics with their arrival times.
+
+        Args:
+            keys: Topic keys ("symbol:QUOTE_TYPE")
+
+        Returns:
+            dict: {key: (value, timestamp)} for the keys that have been stored
+        """
+        result = {}
+        unpack = _RECORD.unpack_from
+        with self.env.begin(buffers=True) as txn:
+            get = txn.get
+            for key in keys:
+                data = get(key.encode('utf-8'))
+                if data is not None:
+                    result[key] = unpack(data)
+        return result
+
+    def items(self, prefix: str = '') -> Dict[str, Tuple[float, float]]:
+        """
+        Read every stored topic, optionally limited to keys with a prefix.
+
+        Args:
+            prefix: Key prefix, e.g. a symbol or '.SPXW250117' for one chain
+
+        Returns:
+            dict: {key: (value, timestamp)}
+        """
+        result = {}
+        raw_prefix = prefix.encode('utf-8')
+        with self.env.begin() as txn:
+            cursor = txn.cursor()
+            if raw_prefix and not cursor.set_range(raw_prefix):
+                return result
+            for key, data in cursor:
+                if not key.startswith(raw_prefix):
+                    break
+                result[key.decode('utf-8')] = _RECORD.unpack(data)
+        return result
+
+    def delete(self, keys: Iterable[str]) -> int:
+        """
+        Remove topics.
+
+        Args:
+            keys: Topic keys ("symbol:QUOTE_TYPE")
+
+        Returns:
+            int: Number of keys removed
+        """
+        removed = 0
+        with self.env.begin(write=True) as txn:
+            for key in keys:
+                removed += txn.delete(key.encode('utf-8'))
+        return removed
+
+    def sync(self) -> None:
+        """Flush written batches to disk."""
+        if self.env is not None:
+            try:
+                self.env.sync(True)
+            except lmdb.Error:
+                pass  # read-only environments cannot sync
+
+    def close(self) -> None:
+        """Flush and close the environment."""
+        if self.env is not None:
+            self.sync()
+            self.env.close()
+            self.env = None
+
+    def __len__(self) -> int:
+        return self.env.stat()['entries']
@@ -0,0 +1,311 @@
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import struct
+import time
+
+import numpy as np
+
+from src.core.logger import get_logger
+from src.core.settings import SETTINGS
+from src.storage.paths import LIVE_TRANSPORT, store_path
+
+try:
+    import lmdb
+except ImportError:
+    lmdb = None
+
+
+logger = get_logger(__name__)
+
+# Named sub-database per segment: SEGMENT_PREFIX + segment start (epoch seconds)
+SEGMENT_PREFIX = 'ticks:'
+# Tick key: topic key (utf-8) | NUL | arrival time (big-endian uint64 ns),
+# so a topic's ticks sort by time inside a segment
+_TIMESTAMP = struct.Struct('>Q')
+_VALUE = struct.Struct('<d')
+
+
+def _tick_prefix(key: str) -> bytes:
+    return key.encode('utf-8') + b'\x00'
+
+
+class TickHistoryDB:
+    """
+    Time-partitioned LMDB history of every value change.
+
+    Ticks go to one named sub-database per segment (storage.tick_segment_seconds,
+    an hour by default), keyed by topic key and big-endian timestamp. A
+    range query for one topic only opens the segments overlapping the
+    range and seeks straight to the topic inside each, and expiring old
+    data drops whole segments instead of deleting ticks one by one.
+
+    Attributes:
+        segment_seconds (int): Length of one segment
+        retention_period (float): Seconds of history kept by compact()
+        stats (dict): Counters of batches, ticks and dropped segments
+    """
+
+    _shared: Dict[Path, 'TickHistoryDB'] = {}
+    _shared_lock = Lock()
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        map_size: Optional[int] = None,
+        segment_seconds: Optional[int] = None,
+        retention_period: Optional[float] = None,
+        readonly: bool = False
+    ) -> None:
+        """
+        Open (or create) the history.
+
+        Args:
+            path: Environment directory. Defaults to storage.lmdb_path /
+                  storage.message_retention_db from config.
+            map_size: Maximum database size in bytes. Defaults to
+                      storage.message_retention_map_size from config.
+            segment_seconds: Segment length. Defaults to storage.tick_segment_seconds.
+            retention_period: Seconds of history to keep. Defaults to
+                              consumer.retention_period.
+            readonly: Open for reading only (other processes)
+
+        Raises:
+            RuntimeError: If the lmdb package is not installed
+        """
+        if lmdb is None:
+            raise RuntimeError("TickHistoryDB requires the lmdb package (pip install lmdb)")
+        storage = SETTINGS['storage']
+        if path is None:
+            path = store_path('message_retention_db')
+        self.path = Path(path)
+        if not readonly:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+        self.segment_seconds = int(segment_seconds or storage.get('tick_segment_seconds', 3600))
+        self.retention_period = float(
+            retention_period or SETTINGS['consumer'].get('retention_period', 7200)
+        )
+        self.readonly = readonly
+        self.env = lmdb.open(
+            str(self.path),
+            map_size=map_size or storage.get('message_retention_map_size', 2 ** 31),
+            max_dbs=storage.get('tick_max_segments', 1024),
+            readonly=readonly,
+            sync=False,
+            metasync=False,
+        )
+        self._lock = Lock()
+        self._segments: Dict[int, object] = {}
+        self._stop_event: Optional[Event] = None
+        self._compactor: Optional[Thread] = None
+        self.stats = {'batches': 0, 'ticks': 0, 'dropped_segments': 0}
+
+    @classmethod
+    def from_config(cls, transport: str = LIVE_TRANSPORT) -> Optional['TickHistoryDB']:
+        """
+        Get the process-wide history if storage.tick_history_enabled is set.
+
+        The shared instance runs the retention compactor. Simulated and
+        replayed sessions get a separate history (see store_path()).
+
+        Args:
+            transport: Name of the transport the ticks come from
+
+        Returns:
+            TickHistoryDB or None if disabled or unavailable
+        """
+        storage = SETTINGS['storage']
+        if not storage.get('tick_history_enabled', False):
+            return None
+        path = store_path('message_retention_db', transport)
+        with cls._shared_lock:
+            db = cls._shared.get(path)
+            if db is None or db.env is None:
+                try:
+                    db = cls._shared[path] = cls(path)
+                except Exception as e:
+                    logger.warning(f"Tick history disabled: {e}")
+                    return None
+                db.start_compactor()
+            return db
+
+    def segment_start(self, timestamp: float) -> int:
+        """Start (epoch seconds) of the segment holding timestamp."""
+        return int(timestamp) // self.segment_seconds * self.segment_seconds
+
+    def segments(self) -> List[int]:
+        """
+        List the stored segments.
+
+        Returns:
+            list: Segment starts (epoch seconds), oldest first
+        """
+        prefix = SEGMENT_PREFIX.encode('ascii')
+        starts = []
+        with self.env.begin() as txn:
+            cursor = txn.cursor()
+            if cursor.set_range(prefix):
+                for name in cursor.iternext(values=False):
+                    if not name.startswith(prefix):
+                        break
+                    starts.append(int(name[len(prefix):]))
+        return sorted(starts)
+
+    def append(
+        self,
+        keys: Sequence[str],
+        values: Sequence[float],
+        timestamps: Sequence[float]
+    ) -> int:
+        """
+        Store the value changes of one refresh batch in a single transaction.
+
+        Args:
+            keys: Topic keys ("symbol:QUOTE_TYPE")
+            values: New value per key
+            timestamps: Arrival time per key (epoch seconds)
+
+        Returns:
+            int: Number of ticks written
+        """
+        if not keys:
+            return 0
+        pack_ts = _TIMESTAMP.pack
+        pack_value = _VALUE.pack
+        by_segment: Dict[int, List[Tuple[bytes, bytes]]] = {}
+        for key, value, timestamp in zip(keys, values, timestamps):
+            items = by_segment.setdefault(self.segment_start(timestamp), [])
+            items.append((_tick_prefix(key) + pack_ts(int(timestamp * 1e9)), pack_value(value)))
+
+        written = 0
+        try:
+            with self.env.begin(write=True) as txn:
+                for start, items in by_segment.items():
+                    db = self._segment_db(start, txn)
+                    written += txn.cursor(db).putmulti(items)[1]
+        except lmdb.MapFullError:
+            logger.error(f"Tick history full ({self.path}); raise message_retention_map_size")
+            return 0
+        self.stats['batches'] += 1
+        self.stats['ticks'] += written
+        return written
+
+    def query(self, key: str, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the ticks of one topic in a time range.
+
+        Args:
+            key: Topic key ("symbol:QUOTE_TYPE")
+            start: Range start (epoch seconds, inclusive)
+            end: Range end (epoch seconds, inclusive)
+
+        Returns:
+            tuple: (timestamps, values) as float64 arrays, oldest first
+        """
+        prefix = _tick_prefix(key)
+        low = prefix + _TIMESTAMP.pack(max(0, int(start * 1e9)))
+        high = prefix + _TIMESTAMP.pack(int(end * 1e9))
+        first = self.segment_start(start)
+        last = self.segment_start(end)
+
+        stamps: List[int] = []
+        values: List[float] = []
+        unpack_ts = _TIMESTAMP.unpack_from
+        unpack_value = _VALUE.unpack
+        offset = len(prefix)
+        with self.env.begin(buffers=True) as txn:
+            for segment in self.segments():
+                if segment < first or segment > last:
+                    continue
+                db = self._segment_db(segment, txn, create=False)
+                if db is None:
+                    continue
+                cursor = txn.cursor(db)
+                if not cursor.set_range(low):
+                    continue
+                for tick_key, data in cursor:
+                    if bytes(tick_key) > high:
+                        break
+                    stamps.append(unpack_ts(tick_key, offset)[0])
+                    values.append(unpack_value(data)[0])
+
+        return np.asarray(stamps, dtype=np.float64) / 1e9, np.asarray(values, dtype=np.float64)
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Drop segments that ended before the retention period.
+
+        Args:
+            now: Reference time, defaults to the current time
+
+        Returns:
+            int: Number of segments dropped
+        """
+        cutoff = (now or time.time()) - self.retention_period
+        expired = [start for start in self.segments() if start + self.segment_seconds <= cutoff]
+        for start in expired:
+            with self.env.begin(write=True) as txn:
+                db = self._segment_db(start, txn, create=False)
+                if db is not None:
+                    txn.drop(db, delete=True)
+            with self._lock:
+                self._segments.pop(start, None)
+        if expired:
+            self.stats['dropped_segments'] += len(expired)
+            logger.info(f"Dropped {len(expired)} tick history segments older than {self.retention_period:.0f}s")
+        return len(expired)
+
+    def start_compactor(self, interval: Optional[float] = None) -> None:
+        """
+        Run compact() in a background thread.
+
+        Args:
+            interval: Seconds between runs. Defaults to consumer.cleanup_interval.
+        """
+        if self._compactor is not None or self.readonly:
+            return
+        interval = interval or SETTINGS['consumer'].get('cleanup_interval', 3600)
+        self._stop_event = Event()
+        self._compactor = Thread(
+            target=self._run_compactor, args=(self._stop_event, interval), daemon=True
+        )
+        self._compactor.start()
+
+    def _run_compactor(self, stop_event: Event, interval: float) -> None:
+        while True:
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Tick history compaction failed: {e}")
+            if stop_event.wait(interval):
+                return
+
+    def _segment_db(self, start: int, txn: object, create: bool = True) -> Optional[object]:
+        """Get the handle of a segment's sub-database, opening it once."""
+        with self._lock:
+            db = self._segments.get(start)
+            if db is None:
+                name = f"{SEGMENT_PREFIX}{start}".encode('ascii')
+                try:
+                    db = self.env.open_db(name, txn=txn, create=create)
+                except lmdb.NotFoundError:
+                    return None
+                self._segments[start] = db
+            return db
+
+    def sync(self) -> None:
+        """Flush written batches to disk."""
+        if self.env is not None and not self.readonly:
+            self.env.sync(True)
+
+    def close(self) -> None:
+        """Stop the compactor, flush and close the environment."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._compactor.join(timeout=1.0)
+            self._compactor = None
+        if self.env is not None:
+            self.sync()
+            self.env.close()
+            self.env = None
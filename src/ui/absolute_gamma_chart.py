@@ -1,5 +1,10 @@
+from typing import Optional
+
+import numpy as np
 import plotly.graph_objects as go
 
+from src.analytics.chain_frame import ChainFrame
+
 class AbsoluteGammaChartBuilder:
     def __init__(self, symbol: str):
         self.symbol = symbol
@@ -10,16 +15,18 @@ class AbsoluteGammaChartBuilder:
         self._set_layout(fig, 1, None)
         return fig
 
-    def create_chart(self, data: dict, strikes: list, option_symbols: list) -> go.Figure:
+    def create_chart(self, data: dict, strikes: list, option_symbols: list, frame: Optional[ChainFrame] = None) -> go.Figure:
         """Build and return the absolute gamma exposure chart (Call OI + Put OI)"""
         fig = go.Figure()
+        if frame is None:
+            frame = ChainFrame.from_snapshot(data, self.symbol, strikes, option_symbols)
         
         # Get current price first
-        current_price = float(data.get(f"{self.symbol}:LAST", 0))
+        current_price = frame.price
         if current_price == 0:
             return self.create_empty_chart()
         
-        call_oi_values, put_oi_values, total_abs_gex = self._calculate_absolute_gex_values(data, strikes, option_symbols)
+        call_oi_values, put_oi_values, total_abs_gex = self._calculate_absolute_gex_values(frame)
 
         # Find max values and their strikes
         max_call_oi = max(call_oi_values) if call_oi_values else 0
@@ -69,60 +76,15 @@ class AbsoluteGammaChartBuilder:
         
         return fig
 
-    def _calculate_absolute_gex_values(self, data, strikes, option_symbols):
-        call_oi_values = []
-        put_oi_values = []
-        total_abs_gex = []
-        
-        try:
-            underlying_price = float(data.get(f"{self.symbol}:LAST", 0))
-        except (ValueError, TypeError):
-            underlying_price = 0
-            
-        if underlying_price == 0:
+    def _calculate_absolute_gex_values(self, frame):
+        if frame.price == 0:
             return [], [], []
-        
-        for strike in strikes:
-            try:
-                call_symbol = next(sym for sym in option_symbols if f'C{strike}' in sym)
-                put_symbol = next(sym for sym in option_symbols if f'P{strike}' in sym)
-                
-                # Get gamma and OI values
-                try:
-                    call_gamma = float(data.get(f"{call_symbol}:GAMMA", 0))
-                except (ValueError, TypeError):
-                    call_gamma = 0
-                    
-                try:
-                    put_gamma = float(data.get(f"{put_symbol}:GAMMA", 0))
-                except (ValueError, TypeError):
-                    put_gamma = 0
-                    
-                try:
-                    call_oi = float(data.get(f"{call_symbol}:OPEN_INT", 0))
-                except (ValueError, TypeError):
-                    call_oi = 0
-                    
-                try:
-                    put_oi = float(data.get(f"{put_symbol}:OPEN_INT", 0))
-                except (ValueError, TypeError):
-                    put_oi = 0
-                
-                # Calculate absolute gamma exposure per 1% change
-                call_gex = abs(call_oi * call_gamma * 100 * (underlying_price * underlying_price) * 0.01)
-                put_gex = abs(put_oi * put_gamma * 100 * (underlying_price * underlying_price) * 0.01)
-                
-                call_oi_values.append(call_gex)
-                put_oi_values.append(put_gex)
-                total_abs_gex.append(call_gex + put_gex)
-                
-            except StopIteration:
-                print(f"Error calculating absolute GEX for strike {strike}: {e}")
-                call_oi_values.append(0)
-                put_oi_values.append(0)
-                total_abs_gex.append(0)
-        
-        return call_oi_values, put_oi_values, total_abs_gex
+
+        # Absolute gamma exposure per 1% change, 0 for strikes without data
+        call_gex, put_gex = frame.gex_per_contract()
+        call_gex = np.abs(call_gex)
+        put_gex = np.abs(put_gex)
+        return call_gex.tolist(), put_gex.tolist(), (call_gex + put_gex).tolist()
 
     def _add_traces(self, fig, call_values, put_values, strikes):
         # Add Call OI trace
@@ -153,7 +115,7 @@ class AbsoluteGammaChartBuilder:
             fig.add_annotation(
                 x=max_call_oi,
                 y=max_call_strike,
-                text=f"Max Call GEX<br>${max_call_oi/1000000:.2f}M<br>{max_call_strike}",
+                text=f"Max Call GEX<br>${max_call_oi/1000000:.2f}M<br>{max_call_strike:g}",
                 showarrow=True,
                 arrowhead=2,
                 arrowcolor="royalblue",
@@ -171,7 +133,7 @@ class AbsoluteGammaChartBuilder:
             fig.add_annotation(
                 x=max_put_oi,
                 y=max_put_strike,
-                text=f"Max Put GEX<br>${max_put_oi/1000000:.2f}M<br>{max_put_strike}",
+                text=f"Max Put GEX<br>${max_put_oi/1000000:.2f}M<br>{max_put_strike:g}",
                 showarrow=True,
                 arrowhead=2,
                 arrowcolor="crimson",
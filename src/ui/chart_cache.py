@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from src.core.settings import SETTINGS
+from src.utils.option_chain import OptionChain
+
+
+class ChartCache:
+    """
+    Snapshot-versioned LRU cache of chart figures and derived metrics.
+
+    Entries are keyed by (snapshot version, symbol, expiry, strike params,
+    chart type), so a figure built once for a snapshot is reused by every
+    rerun, page and session that shows the same chain at that version. A
+    new snapshot version simply misses; old versions age out by LRU.
+
+    Cached figures are shared: finish them (overlays, reference lines)
+    inside the factory and don't modify them after get_or_create().
+
+    Attributes:
+        max_entries (int): Entries kept before the least recently used is evicted
+        stats (dict): hits, misses and evictions
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        """
+        Args:
+            max_entries: Cache size. Defaults to charts.cache_size from config.
+        """
+        self.max_entries = max_entries or SETTINGS.get('charts', {}).get('cache_size', 256)
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def chain_key(version: int, chain: OptionChain, strike_range: float, strike_spacing: float) -> Tuple:
+        """
+        Build the key prefix of a chain at a snapshot version.
+
+        Args:
+            version: Snapshot version
+            chain: Displayed option chain
+            strike_range: Strike range the chain was built with
+            strike_spacing: Strike spacing the chain was built with
+
+        Returns:
+            tuple: (version, symbol, expiry, strike params); append the chart type
+        """
+        first_strike = float(chain.strikes[0]) if len(chain) else None
+        return (version, chain.underlying, chain.expiry, strike_range, strike_spacing, first_strike)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, building and caching it on a miss.
+
+        The factory runs outside the lock; if two sessions miss the same
+        key at once both build it and the first stored value wins.
+
+        Args:
+            key: Cache key, normally chain_key(...) + (chart type,)
+            factory: Builds the value
+
+        Returns:
+            Cached or newly built value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key]
+            self.stats['misses'] += 1
+
+        value = factory()
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
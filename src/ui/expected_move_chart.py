@@ -1,3 +1,5 @@
+from typing import Optional
+
 import plotly.graph_objects as go
 
 
@@ -56,9 +58,10 @@ class ExpectedMoveChartBuilder:
             "current_price": current_price
         }
 
-    def create_reference_lines(self, fig, data: dict):
-        """Add expected move reference lines to an existing figure (for Gamma chart)"""
-        metrics = self.extract_metrics(data)
+    def create_reference_lines(self, fig, data: dict, metrics: Optional[dict] = None):
+        """Add expected move reference lines to an existing figure (for Gamma chart); pass metrics to reuse extract_metrics()"""
+        if metrics is None:
+            metrics = self.extract_metrics(data)
 
         if metrics["current_price"] is None or metrics["current_price"] == 0:
             return
@@ -84,9 +87,10 @@ class ExpectedMoveChartBuilder:
                 annotation_position="right"
             )
 
-    def get_display_text(self, data: dict) -> str:
-        """Get formatted text for metrics display"""
-        metrics = self.extract_metrics(data)
+    def get_display_text(self, data: dict, metrics: Optional[dict] = None) -> str:
+        """Get formatted text for metrics display; pass metrics to reuse extract_metrics()"""
+        if metrics is None:
+            metrics = self.extract_metrics(data)
 
         if metrics["current_price"] is None:
             return "No data available"
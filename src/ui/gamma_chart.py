@@ -1,5 +1,10 @@
+from typing import Optional
+
+import numpy as np
 import plotly.graph_objects as go
 
+from src.analytics.chain_frame import ChainFrame
+
 class GammaChartBuilder:
     def __init__(self, symbol: str):
         self.symbol = symbol
@@ -11,17 +16,20 @@ class GammaChartBuilder:
         self._set_layout(fig, 1, None)  # Use 1 as default range, no price
         return fig
 
-    def create_chart(self, data: dict, strikes: list, option_symbols: list) -> go.Figure:
-        """Build and return the gamma exposure chart"""
+    def create_chart(self, data: dict, strikes: list, option_symbols: list, frame: Optional[ChainFrame] = None,
+                     zero_gamma: Optional[float] = None) -> go.Figure:
+        """Build and return the gamma exposure chart; frame is built from data if not given"""
         fig = go.Figure()
+        if frame is None:
+            frame = ChainFrame.from_snapshot(data, self.symbol, strikes, option_symbols)
         
         # Get current price first
-        current_price = float(data.get(f"{self.symbol}:LAST", 0))
+        current_price = frame.price
         #print(f"Gamma Chart: create_chart with Current price: {current_price}")
         if current_price == 0:
             return self.create_empty_chart()
         
-        pos_gex_values, neg_gex_values = self._calculate_gex_values(data, strikes, option_symbols)
+        pos_gex_values, neg_gex_values = self._calculate_gex_values(frame)
 
         pos_values = [x for x in pos_gex_values]
         neg_values = [x for x in neg_gex_values]
@@ -64,70 +72,33 @@ class GammaChartBuilder:
             max_pos_idx,  max_pos_strike, max_neg_idx, max_neg_strike
         )
 
+        if zero_gamma is not None:
+            self.add_zero_gamma_line(fig, zero_gamma)
+
         self._set_layout(fig, chart_range, current_price)
         
         return fig
 
-    def _calculate_gex_values(self, data, strikes, option_symbols):
-        pos_gex_values = []
-        neg_gex_values = []
-        
-        try:
-            underlying_price = float(data.get(f"{self.symbol}:LAST", 0))
-        except (ValueError, TypeError):
-            underlying_price = 0
-            
-        if underlying_price == 0:
+    def _calculate_gex_values(self, frame):
+        if frame.price == 0:
             return [], []
-        
-        for strike in strikes:
-            try:
-                call_symbol = next(sym for sym in option_symbols if f'C{strike}' in sym)
-                put_symbol = next(sym for sym in option_symbols if f'P{strike}' in sym)
-                #print(f"Call: {call_symbol}")
-                
-                # Safely get and convert values, defaulting to 0 if any errors
-                try:
-                    call_gamma = float(data.get(f"{call_symbol}:GAMMA", 0))
-                except (ValueError, TypeError):
-                    call_gamma = 0
-                    
-                try:
-                    put_gamma = float(data.get(f"{put_symbol}:GAMMA", 0))
-                except (ValueError, TypeError):
-                    put_gamma = 0
-                    
-                try:
-                    call_oi = float(data.get(f"{call_symbol}:OPEN_INT", 0))
-                except (ValueError, TypeError):
-                    call_oi = 0
-                    
-                try:
-                    put_oi = float(data.get(f"{put_symbol}:OPEN_INT", 0))
-                except (ValueError, TypeError):
-                    put_oi = 0
-                
-                # gamma exposure per $1 change in the underlying price
-                # gex = ((call_oi*call_gamma) - (put_oi*put_gamma)) * 100 * underlying_price
-
-                # gamma exposure per 1% change in the underlying price
-                gex = ((call_oi*call_gamma) - (put_oi*put_gamma)) * 100 * (underlying_price*underlying_price) * .01
-
-            except Exception:
-                # If anything goes wrong with this strike, use 0
-                print(f"Error calculating GEX strike: {strike}")
-                gex = 0
-            
-            if gex > 0:
-                pos_gex_values.append(gex)
-                neg_gex_values.append(0)
-            else:
-                pos_gex_values.append(0)
-                neg_gex_values.append(gex)
-        
-        #print("pos_gex_values: ", pos_gex_values)
-        #print("neg_gex_values: ", neg_gex_values)
-        return pos_gex_values, neg_gex_values
+
+        # gamma exposure per 1% change in the underlying price:
+        # ((call_oi*call_gamma) - (put_oi*put_gamma)) * 100 * price^2 * .01
+        gex = frame.net_gex()
+        return np.where(gex > 0, gex, 0.0).tolist(), np.where(gex > 0, 0.0, gex).tolist()
+
+    def add_zero_gamma_line(self, fig, level):
+        """Mark the zero-gamma (gamma flip) level, see ZeroGammaSolver"""
+        fig.add_hline(
+            y=level,
+            line_color="orange",
+            line_width=2,
+            line_dash="dash",
+            annotation_text=f"Zero Gamma {level:.2f}",
+            annotation_position="bottom left",
+            annotation=dict(font=dict(color="orange"))
+        )
 
     def _add_traces(self, fig, pos_values, neg_values, strikes):
         fig.add_trace(go.Bar(
@@ -167,7 +138,7 @@ class GammaChartBuilder:
             fig.add_annotation(
                 x=0,  # Position at zero line
                 y=max_pos_strike,
-                text=f"Strike: {max_pos_strike}",
+                text=f"Strike: {max_pos_strike:g}",
                 showarrow=False,
                 xanchor="right",
                 xshift=-10  # Shift slightly left of the zero line
@@ -189,7 +160,7 @@ class GammaChartBuilder:
             fig.add_annotation(
                 x=0,  # Position at zero line
                 y=max_neg_strike,
-                text=f"Strike: {max_neg_strike}",
+                text=f"Strike: {max_neg_strike:g}",
                 showarrow=False,
                 xanchor="left",
                 xshift=10  # Shift slightly right of the zero line
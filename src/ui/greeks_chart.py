@@ -1,6 +1,11 @@
+from typing import Optional
+
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from src.analytics.chain_frame import ChainFrame
+
 
 class GreeksChartBuilder:
     def __init__(self, symbol: str):
@@ -17,7 +22,7 @@ class GreeksChartBuilder:
         self._set_layout(fig)
         return fig
 
-    def create_chart(self, data: dict, strikes: list, option_symbols: list) -> go.Figure:
+    def create_chart(self, data: dict, strikes: list, option_symbols: list, frame: Optional[ChainFrame] = None) -> go.Figure:
         """Build and return the Greeks chart"""
         fig = make_subplots(
             rows=2, cols=2,
@@ -26,19 +31,22 @@ class GreeksChartBuilder:
                    [{"secondary_y": False}, {"secondary_y": False}]]
         )
 
+        if frame is None:
+            frame = ChainFrame.from_snapshot(data, self.symbol, strikes, option_symbols)
+
         # Get current price
-        current_price = float(data.get(f"{self.symbol}:LAST", 0))
+        current_price = frame.price
         if current_price == 0:
             return self.create_empty_chart()
 
         # Extract Greeks
-        deltas, gammas, thetas, vegas = self._extract_greeks(data, strikes, option_symbols)
+        deltas, gammas, thetas, vegas = self._extract_greeks(frame)
 
         # Calculate totals
-        total_delta = sum(d for d in deltas if d is not None)
-        total_gamma = sum(g for g in gammas if g is not None)
-        total_theta = sum(t for t in thetas if t is not None)
-        total_vega = sum(v for v in vegas if v is not None)
+        total_delta = float(np.nansum(deltas))
+        total_gamma = float(np.nansum(gammas))
+        total_theta = float(np.nansum(thetas))
+        total_vega = float(np.nansum(vegas))
 
         # Add Delta subplot
         fig.add_trace(
@@ -124,63 +132,14 @@ class GreeksChartBuilder:
 
         return fig
 
-    def _extract_greeks(self, data, strikes, option_symbols):
-        deltas = []
-        gammas = []
-        thetas = []
-        vegas = []
-
-        for strike in strikes:
-            try:
-                call_symbol = next(sym for sym in option_symbols if f'C{strike}' in sym)
-                put_symbol = next(sym for sym in option_symbols if f'P{strike}' in sym)
-
-                # Extract and sum call and put greeks
-                try:
-                    call_delta = float(data.get(f"{call_symbol}:DELTA", 0))
-                    put_delta = float(data.get(f"{put_symbol}:DELTA", 0))
-                    delta = call_delta + put_delta
-                except (ValueError, TypeError):
-                    delta = 0
-
-                try:
-                    call_gamma = float(data.get(f"{call_symbol}:GAMMA", 0))
-                    put_gamma = float(data.get(f"{put_symbol}:GAMMA", 0))
-                    gamma = call_gamma + put_gamma
-                except (ValueError, TypeError):
-                    gamma = 0
-
-                try:
-                    call_theta = float(data.get(f"{call_symbol}:THETA", 0))
-                    put_theta = float(data.get(f"{put_symbol}:THETA", 0))
-                    theta = call_theta + put_theta
-                except (ValueError, TypeError):
-                    theta = 0
-
-                try:
-                    call_vega = float(data.get(f"{call_symbol}:VEGA", 0))
-                    put_vega = float(data.get(f"{put_symbol}:VEGA", 0))
-                    vega = call_vega + put_vega
-                except (ValueError, TypeError):
-                    vega = 0
-
-                deltas.append(delta)
-                gammas.append(gamma)
-                thetas.append(theta)
-                vegas.append(vega)
-
-            except StopIteration:
-                deltas.append(None)
-                gammas.append(None)
-                thetas.append(None)
-                vegas.append(None)
-            except Exception:
-                deltas.append(None)
-                gammas.append(None)
-                thetas.append(None)
-                vegas.append(None)
-
-        return deltas, gammas, thetas, vegas
+    def _extract_greeks(self, frame):
+        # Call + put per strike; NaN (a gap) where a contract is not listed
+        return (
+            frame.combined('DELTA').tolist(),
+            frame.combined('GAMMA').tolist(),
+            frame.combined('THETA').tolist(),
+            frame.combined('VEGA').tolist(),
+        )
 
     def _set_layout(self, fig, current_price=None, total_delta=None, total_gamma=None, total_theta=None, total_vega=None):
         price_str = f" Price: ${current_price:.2f}" if current_price else ""
@@ -1,6 +1,10 @@
+from typing import Optional
+
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from src.analytics.chain_frame import ChainFrame
+
 
 class IVChartBuilder:
     def __init__(self, symbol: str):
@@ -12,16 +16,18 @@ class IVChartBuilder:
         self._set_layout(fig)
         return fig
 
-    def create_chart(self, data: dict, strikes: list, option_symbols: list) -> go.Figure:
+    def create_chart(self, data: dict, strikes: list, option_symbols: list, frame: Optional[ChainFrame] = None) -> go.Figure:
         """Build and return the implied volatility chart"""
         fig = make_subplots(specs=[[{"secondary_y": False}]])
+        if frame is None:
+            frame = ChainFrame.from_snapshot(data, self.symbol, strikes, option_symbols)
 
         # Get current price
-        current_price = float(data.get(f"{self.symbol}:LAST", 0))
+        current_price = frame.price
         if current_price == 0:
             return self.create_empty_chart()
 
-        call_iv_values, put_iv_values = self._extract_iv_values(data, strikes, option_symbols)
+        call_iv_values, put_iv_values = self._extract_iv_values(frame)
 
         # Add call IV trace
         fig.add_trace(
@@ -60,38 +66,9 @@ class IVChartBuilder:
 
         return fig
 
-    def _extract_iv_values(self, data, strikes, option_symbols):
-        call_iv_values = []
-        put_iv_values = []
-
-        for strike in strikes:
-            try:
-                call_symbol = next(sym for sym in option_symbols if f'C{strike}' in sym)
-                put_symbol = next(sym for sym in option_symbols if f'P{strike}' in sym)
-
-                # Get IV values, defaulting to 0 if not available
-                try:
-                    call_iv = float(data.get(f"{call_symbol}:IMPL_VOL", 0))
-                except (ValueError, TypeError):
-                    call_iv = 0
-
-                try:
-                    put_iv = float(data.get(f"{put_symbol}:IMPL_VOL", 0))
-                except (ValueError, TypeError):
-                    put_iv = 0
-
-                call_iv_values.append(call_iv)
-                put_iv_values.append(put_iv)
-
-            except StopIteration:
-                # Strike not found in option_symbols
-                call_iv_values.append(None)
-                put_iv_values.append(None)
-            except Exception:
-                call_iv_values.append(None)
-                put_iv_values.append(None)
-
-        return call_iv_values, put_iv_values
+    def _extract_iv_values(self, frame):
+        # 0 where a listed contract has no IV yet, NaN (a gap) where none is listed
+        return frame.call('IMPL_VOL', 0.0).tolist(), frame.put('IMPL_VOL', 0.0).tolist()
 
     def _set_layout(self, fig, current_price=None):
         price_str = f" Price: ${current_price:.2f}" if current_price else ""
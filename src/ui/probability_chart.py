@@ -1,6 +1,10 @@
+from typing import Optional
+
 import plotly.graph_objects as go
 import numpy as np
 
+from src.analytics.chain_frame import ChainFrame
+
 
 class ProbabilityChartBuilder:
     def __init__(self, symbol: str):
@@ -12,17 +16,19 @@ class ProbabilityChartBuilder:
         self._set_layout(fig)
         return fig
 
-    def create_chart(self, data: dict, strikes: list, option_symbols: list) -> go.Figure:
+    def create_chart(self, data: dict, strikes: list, option_symbols: list, frame: Optional[ChainFrame] = None) -> go.Figure:
         """Build and return the probability metrics chart"""
         fig = go.Figure()
+        if frame is None:
+            frame = ChainFrame.from_snapshot(data, self.symbol, strikes, option_symbols)
 
         # Get current price
-        current_price = float(data.get(f"{self.symbol}:LAST", 0))
+        current_price = frame.price
         if current_price == 0:
             return self.create_empty_chart()
 
         # Extract probability values
-        prob_expiring, prob_otm, prob_touching = self._extract_probabilities(data, strikes, option_symbols)
+        prob_expiring, prob_otm, prob_touching = self._extract_probabilities(frame)
 
         # Add Probability of Expiring ITM trace
         fig.add_trace(
@@ -85,47 +91,13 @@ class ProbabilityChartBuilder:
 
         return fig
 
-    def _extract_probabilities(self, data, strikes, option_symbols):
-        prob_expiring = []
-        prob_otm = []
-        prob_touching = []
-
-        for strike in strikes:
-            try:
-                call_symbol = next(sym for sym in option_symbols if f'C{strike}' in sym)
-                put_symbol = next(sym for sym in option_symbols if f'P{strike}' in sym)
-
-                # Get probability values, defaulting to 0 if not available
-                try:
-                    call_prob_exp = float(data.get(f"{call_symbol}:PROB_OF_EXPIRING", 0))
-                except (ValueError, TypeError):
-                    call_prob_exp = 0
-
-                try:
-                    call_prob_otm = float(data.get(f"{call_symbol}:PROB_OTM", 0))
-                except (ValueError, TypeError):
-                    call_prob_otm = 0
-
-                try:
-                    call_prob_touch = float(data.get(f"{call_symbol}:PROB_OF_TOUCHING", 0))
-                except (ValueError, TypeError):
-                    call_prob_touch = 0
-
-                # Use call values for now (could also use put values or average)
-                prob_expiring.append(call_prob_exp)
-                prob_otm.append(call_prob_otm)
-                prob_touching.append(call_prob_touch)
-
-            except StopIteration:
-                prob_expiring.append(None)
-                prob_otm.append(None)
-                prob_touching.append(None)
-            except Exception:
-                prob_expiring.append(None)
-                prob_otm.append(None)
-                prob_touching.append(None)
-
-        return prob_expiring, prob_otm, prob_touching
+    def _extract_probabilities(self, frame):
+        # Use call values for now (could also use put values or average)
+        return (
+            frame.call('PROB_OF_EXPIRING', 0.0).tolist(),
+            frame.call('PROB_OTM', 0.0).tolist(),
+            frame.call('PROB_OF_TOUCHING', 0.0).tolist(),
+        )
 
     def _set_layout(self, fig, current_price=None):
         price_str = f" Price: ${current_price:.2f}" if current_price else ""
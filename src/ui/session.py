@@ -0,0 +1,42 @@
+import uuid
+import streamlit as st
+from src.core.settings import SETTINGS
+from src.rtd.broker import RTDBroker
+from src.rtd.gateway import GatewayClient
+from src.ui.chart_cache import ChartCache
+
+
+@st.cache_resource
+def get_broker():
+    """
+    Get the process-wide RTD broker shared by every session and page.
+
+    With gateway.enabled the broker runs in the separate gateway process
+    and this returns a client for it; otherwise RTD runs in-process.
+    """
+    if SETTINGS.get('gateway', {}).get('enabled', False):
+        return GatewayClient()
+    return RTDBroker()
+
+
+@st.cache_resource
+def get_chart_cache():
+    """
+    Get the process-wide chart cache shared by every session and page.
+
+    Figures and derived metrics are keyed by snapshot version, so a chart
+    built by one session is reused by the others until data changes.
+    """
+    return ChartCache()
+
+
+def get_lease_id(page: str) -> str:
+    """
+    Get this session's broker lease ID for a page.
+
+    Each page holds its own lease so switching pages in one browser tab
+    does not drop the other page's subscriptions until it expires.
+    """
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return f"{st.session_state.session_id}:{page}"
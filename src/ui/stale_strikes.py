@@ -0,0 +1,85 @@
+import time
+from typing import List, Optional
+
+import numpy as np
+import plotly.graph_objects as go
+
+from src.analytics.chain_frame import ChainFrame
+from src.core.settings import SETTINGS
+from src.utils.quote_store import LAST_CHANGED_FIELD
+
+
+class StaleStrikeOverlay:
+    """
+    Greys out strikes whose quotes stopped changing.
+
+    RTDWorker publishes "symbol:LAST_CHANGED" (epoch seconds of the
+    symbol's newest value change) next to the quotes, so a strike is stale
+    when neither its call nor its put changed within the threshold.
+    Strikes that never received data are left alone; they have nothing
+    plotted to grey out.
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        """
+        Args:
+            threshold: Seconds without a change before a strike is stale.
+                       Defaults to staleness.ui_threshold, 0 disables.
+        """
+        if threshold is None:
+            threshold = SETTINGS.get('staleness', {}).get('ui_threshold', 30)
+        self.threshold = threshold
+
+    def stale_strikes(self, data: dict, frame: ChainFrame, now: Optional[float] = None) -> List[float]:
+        """
+        Find the strikes without a call or put value change within the threshold.
+
+        Args:
+            data: Snapshot data
+            frame: Chain frame of the snapshot
+            now: Reference time, defaults to time.time()
+
+        Returns:
+            list: Stale strikes, in the order of frame.strikes
+        """
+        if not self.threshold:
+            return []
+        cutoff = (now or time.time()) - self.threshold
+
+        changed_at = np.fmax(
+            ChainFrame.gather(data, frame.call_symbols, LAST_CHANGED_FIELD),
+            ChainFrame.gather(data, frame.put_symbols, LAST_CHANGED_FIELD),
+        )
+        # NaN (no data yet) compares False
+        return frame.strikes[changed_at < cutoff].tolist()
+
+    def add_to_chart(self, fig: go.Figure, strikes: list, stale: list, orientation: str = 'h') -> None:
+        """
+        Shade the stale strikes of a chart.
+
+        Args:
+            fig: Chart to annotate in place
+            strikes: All strikes on the chart, sorted
+            stale: Strikes to shade
+            orientation: 'h' if strikes are on the y axis, 'v' if on the x axis
+        """
+        if not stale:
+            return
+        half_width = (strikes[1] - strikes[0]) / 2 if len(strikes) > 1 else 0.5
+        add_band = fig.add_hrect if orientation == 'h' else fig.add_vrect
+        for strike in stale:
+            add_band(
+                strike - half_width, strike + half_width,
+                fillcolor="grey",
+                opacity=0.25,
+                line_width=0,
+                layer="above"
+            )
+        fig.add_annotation(
+            text=f"{len(stale)} stale strikes (no change in {self.threshold:.0f}s)",
+            xref="paper", yref="paper",
+            x=1, y=1.02,
+            xanchor="right", yanchor="bottom",
+            showarrow=False,
+            font=dict(color="grey", size=11)
+        )
@@ -1,5 +1,10 @@
+from typing import Optional
+
+import numpy as np
 import plotly.graph_objects as go
 
+from src.analytics.chain_frame import ChainFrame
+
 class VolumeChartBuilder:
     def __init__(self, symbol: str):
         self.symbol = symbol
@@ -10,16 +15,18 @@ class VolumeChartBuilder:
         self._set_layout(fig, 1, None)
         return fig
 
-    def create_chart(self, data: dict, strikes: list, option_symbols: list) -> go.Figure:
+    def create_chart(self, data: dict, strikes: list, option_symbols: list, frame: Optional[ChainFrame] = None) -> go.Figure:
         """Build and return the option volume chart"""
         fig = go.Figure()
+        if frame is None:
+            frame = ChainFrame.from_snapshot(data, self.symbol, strikes, option_symbols)
         
         # Get current price first
-        current_price = float(data.get(f"{self.symbol}:LAST", 0))
+        current_price = frame.price
         if current_price == 0:
             return self.create_empty_chart()
         
-        call_volumes, put_volumes = self._calculate_volumes(data, strikes, option_symbols)
+        call_volumes, put_volumes = self._calculate_volumes(frame)
 
         # Convert put volumes to negative for left side display
         neg_put_volumes = [-v for v in put_volumes]
@@ -56,35 +63,10 @@ class VolumeChartBuilder:
         
         return fig
 
-    def _calculate_volumes(self, data, strikes, option_symbols):
-        call_volumes = []
-        put_volumes = []
-        
-        for strike in strikes:
-            try:
-                call_symbol = next(sym for sym in option_symbols if f'C{strike}' in sym)
-                put_symbol = next(sym for sym in option_symbols if f'P{strike}' in sym)
-                
-                # Get volume data
-                try:
-                    call_vol = float(data.get(f"{call_symbol}:VOLUME", 0))
-                except (ValueError, TypeError):
-                    call_vol = 0
-                    
-                try:
-                    put_vol = float(data.get(f"{put_symbol}:VOLUME", 0))
-                except (ValueError, TypeError):
-                    put_vol = 0
-                
-                call_volumes.append(call_vol)
-                put_volumes.append(put_vol)
-                
-            except StopIteration:
-                print(f"Error calculating volume for strike {strike}: {e}")
-                call_volumes.append(0)
-                put_volumes.append(0)
-        
-        return call_volumes, put_volumes
+    def _calculate_volumes(self, frame):
+        call_volumes = np.nan_to_num(frame.call('VOLUME', 0.0))
+        put_volumes = np.nan_to_num(frame.put('VOLUME', 0.0))
+        return call_volumes.tolist(), put_volumes.tolist()
 
     def _add_traces(self, fig, call_volumes, put_volumes, strikes):
         fig.add_trace(go.Bar(
@@ -14,7 +14,7 @@ from .state import (
     check_connection_status
 )
 from .topic import (
-    generate_topic_id,
+    TopicRegistry,
     find_topic_id,
     get_topic_stats,
     get_subscriptions,
@@ -36,7 +36,7 @@ __all__ = [
     'get_server_health',
     'get_time_since_refresh',
     'check_connection_status',
-    'generate_topic_id',
+    'TopicRegistry',
     'find_topic_id',
     'get_topic_stats',
     'get_subscriptions',
@@ -1,6 +1,9 @@
 from typing import Dict, Tuple
 
-import pythoncom
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None
 
 from src.core.logger import get_logger
 
@@ -13,6 +16,8 @@ def cleanup_com() -> None:
     
     Ensures proper COM unintialization.
     """
+    if pythoncom is None:
+        return
     try:
         pythoncom.CoUninitialize()
         logger.debug("COM uninitialized")
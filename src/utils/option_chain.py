@@ -0,0 +1,129 @@
+from datetime import date
+from types import MappingProxyType
+from typing import Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+def _frozen(values: Sequence, dtype) -> np.ndarray:
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+class OptionChain:
+    """
+    Immutable option chain of one underlying and expiry.
+
+    Built by OptionSymbolBuilder.build_chain(). Row i holds strikes[i]
+    with its call and put symbols; the indexes map a strike or a symbol
+    back to its row. Arrays are read-only and the indexes are mapping
+    proxies, so one cached chain can be shared by pages and analytics.
+
+    Attributes:
+        underlying (str): Underlying symbol as requested, e.g. "SPX"
+        root (str): Option root used in the symbols, e.g. "SPXW"
+        expiry (date): Expiration date
+        strikes (np.ndarray): Ascending strikes (float64)
+        call_symbols (np.ndarray): Call symbol per strike
+        put_symbols (np.ndarray): Put symbol per strike
+        strike_index (Mapping): {strike: row}
+        symbol_index (Mapping): {call or put symbol: row}
+    """
+
+    __slots__ = (
+        'underlying', 'root', 'expiry', 'strikes', 'call_symbols', 'put_symbols',
+        'strike_index', 'symbol_index', '_symbols',
+    )
+
+    def __init__(
+        self,
+        underlying: str,
+        root: str,
+        expiry: date,
+        strikes: Sequence[float],
+        call_symbols: Sequence[str],
+        put_symbols: Sequence[str]
+    ) -> None:
+        """
+        Args:
+            underlying: Underlying symbol
+            root: Option root used in the symbols
+            expiry: Expiration date
+            strikes: Ascending strikes
+            call_symbols: Call symbol per strike
+            put_symbols: Put symbol per strike
+        """
+        if not len(strikes) == len(call_symbols) == len(put_symbols):
+            raise ValueError("strikes, call_symbols and put_symbols must have the same length")
+        setter = object.__setattr__
+        setter(self, 'underlying', underlying)
+        setter(self, 'root', root)
+        setter(self, 'expiry', expiry)
+        setter(self, 'strikes', _frozen(strikes, np.float64))
+        setter(self, 'call_symbols', _frozen(call_symbols, object))
+        setter(self, 'put_symbols', _frozen(put_symbols, object))
+        setter(self, 'strike_index', MappingProxyType(
+            {strike: row for row, strike in enumerate(self.strikes.tolist())}
+        ))
+        symbol_index = {sym: row for row, sym in enumerate(call_symbols)}
+        symbol_index.update((sym, row) for row, sym in enumerate(put_symbols))
+        setter(self, 'symbol_index', MappingProxyType(symbol_index))
+        # Subscription order: call, put per strike
+        setter(self, '_symbols', tuple(
+            sym for pair in zip(call_symbols, put_symbols) for sym in pair
+        ))
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("OptionChain is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("OptionChain is immutable")
+
+    @property
+    def symbols(self) -> Tuple[str, ...]:
+        """All option symbols, call then put for each strike (subscription order)."""
+        return self._symbols
+
+    def strike_list(self) -> List[float]:
+        """Strikes as a list of floats, for chart axes."""
+        return self.strikes.tolist()
+
+    def row(self, symbol: str) -> int:
+        """
+        Get the row of a call or put symbol.
+
+        Raises:
+            KeyError: If the symbol is not in the chain
+        """
+        return self.symbol_index[symbol]
+
+    def is_call(self, symbol: str) -> bool:
+        """Whether a symbol of the chain is the call of its row."""
+        return self.call_symbols[self.symbol_index[symbol]] == symbol
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    def __iter__(self) -> Iterator[Tuple[float, str, str]]:
+        """Iterate (strike, call symbol, put symbol) rows."""
+        return zip(self.strikes.tolist(), self.call_symbols.tolist(), self.put_symbols.tolist())
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self.symbol_index
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OptionChain):
+            return NotImplemented
+        return self._symbols == other._symbols
+
+    def __hash__(self) -> int:
+        return hash(self._symbols)
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"OptionChain({self.root} {self.expiry:%Y-%m-%d}, empty)"
+        return (
+            f"OptionChain({self.root} {self.expiry:%Y-%m-%d}, {len(self)} strikes "
+            f"{self.strikes[0]:g}-{self.strikes[-1]:g})"
+        )
@@ -1,6 +1,12 @@
 from datetime import date, timedelta
+from functools import lru_cache
 import numpy as np
 
+from src.utils.option_chain import OptionChain
+
+# Chains kept by OptionSymbolBuilder.build_chain
+CHAIN_CACHE_SIZE = 32
+
 class OptionSymbolBuilder:
     @staticmethod
     def _round_to_nearest_strike(price: float, spacing: float) -> float:
@@ -26,20 +32,37 @@ class OptionSymbolBuilder:
         Returns: List of option symbols in ThinkorSwim format
         Example: .SPY250129C601
         """
+        chain = OptionSymbolBuilder.build_chain(base_symbol, expiry, current_price, strike_range, strike_spacing)
+        return list(chain.symbols)
+
+    @staticmethod
+    def build_chain(base_symbol: str, expiry: date, current_price: float, strike_range: int, strike_spacing: float) -> OptionChain:
+        """
+        Builds the option chain around the strike nearest to current_price.
+
+        Chains are cached by symbol, expiry, range, spacing and center
+        strike, so asking again with a price that rounds to the same
+        strike returns the same immutable OptionChain.
+
+        Returns: OptionChain with strikes, call/put symbols and their indexes
+        """
+        rounded_price = OptionSymbolBuilder._round_to_nearest_strike(current_price, strike_spacing)
+        return OptionSymbolBuilder._build_chain(base_symbol, expiry, rounded_price, strike_range, strike_spacing)
 
+    @staticmethod
+    @lru_cache(maxsize=CHAIN_CACHE_SIZE)
+    def _build_chain(base_symbol: str, expiry: date, rounded_price: float, strike_range: int, strike_spacing: float) -> OptionChain:
+        root = base_symbol
         # Only convert symbols if it's NOT the third Friday of the month
         # I need to figure out how to display SPX afternoon expiry contract on 3rd friday
         if not OptionSymbolBuilder._is_third_friday(expiry):
             if base_symbol == "SPX":
-                base_symbol = "SPXW"
+                root = "SPXW"
             elif base_symbol == "NDX":
-                base_symbol = "NDXP"
+                root = "NDXP"
             elif base_symbol == "RUT":
-                base_symbol = "RUTW"
-  
-        # Round current price to nearest valid strike
-        rounded_price = OptionSymbolBuilder._round_to_nearest_strike(current_price, strike_spacing)
-        
+                root = "RUTW"
+
         # Generate strike prices using numpy arange
         num_strikes = int(2 * strike_range / strike_spacing) + 1
         #print(f"Num Strikes: {num_strikes}")
@@ -48,20 +71,22 @@ class OptionSymbolBuilder:
             rounded_price + strike_range,
             num_strikes
         )
-        
-        symbols = []
+
+        quoted_strikes = []
+        call_symbols = []
+        put_symbols = []
         date_str = expiry.strftime("%y%m%d")
-        
+
         for strike in strikes:
             # Format strike string: only show decimal for .5 strikes
-            if (strike_spacing in [0.5, 2.5] and 
+            if (strike_spacing in [0.5, 2.5] and
                 abs(strike % 1 - 0.5) < 0.001):  # Handle floating point comparison
                 strike_str = f"{strike:.1f}"
             else:
                 strike_str = f"{int(strike)}"
-                
-            call_symbol = f".{base_symbol}{date_str}C{strike_str}"
-            put_symbol = f".{base_symbol}{date_str}P{strike_str}"
-            symbols.extend([call_symbol, put_symbol])
-        
-        return symbols
+
+            quoted_strikes.append(float(strike_str))
+            call_symbols.append(f".{root}{date_str}C{strike_str}")
+            put_symbols.append(f".{root}{date_str}P{strike_str}")
+
+        return OptionChain(base_symbol, root, expiry, quoted_strikes, call_symbols, put_symbols)
@@ -1,3 +1,4 @@
+import sys
 import time
 from typing import Any, Dict, Union
 
@@ -5,9 +6,12 @@ from config import QuoteType
 
 
 class Quote:
+    # No per-instance __dict__; symbols are interned so quotes share them
+    __slots__ = ('quote_type', 'symbol', 'value', 'timestamp')
+
     def __init__(self, quote_type: Union[str, QuoteType], symbol: str, value: Any, timestamp: float = None):
         self.quote_type = self._parse_quote_type(quote_type)
-        self.symbol = symbol
+        self.symbol = sys.intern(symbol)
         self.value = self._process_value(value)
         self.timestamp = timestamp or time.time()
 
@@ -23,18 +27,30 @@ class Quote:
         raise ValueError(f"Invalid quote type: {quote_type}")
 
     def _process_value(self, value: Any) -> Any:
+        return self._convert(self.quote_type, value)
+
+    @classmethod
+    def _convert(cls, quote_type: QuoteType, value: Any) -> Any:
         if value is None or value in ['N/A', '!N/A']:
             return None
 
-        if self.quote_type in [QuoteType.LAST, QuoteType.BID, QuoteType.ASK, QuoteType.HIGH, QuoteType.LOW, QuoteType.OPEN, QuoteType.CLOSE, QuoteType.MARK, QuoteType.DELTA, QuoteType.GAMMA]:
-            return self._to_float(value)
-        elif self.quote_type in [QuoteType.VOLUME, QuoteType.ASK_SIZE, QuoteType.BID_SIZE, QuoteType.LAST_SIZE, QuoteType.OPEN_INT]:
-            return self._to_int(value)
-        elif self.quote_type == QuoteType.IMPL_VOL:
-            float_value = self._to_float(value, percentage=True)
+        if quote_type in [QuoteType.LAST, QuoteType.BID, QuoteType.ASK, QuoteType.HIGH, QuoteType.LOW, QuoteType.OPEN, QuoteType.CLOSE, QuoteType.MARK, QuoteType.DELTA, QuoteType.GAMMA]:
+            return cls._to_float(value)
+        elif quote_type in [QuoteType.VOLUME, QuoteType.ASK_SIZE, QuoteType.BID_SIZE, QuoteType.LAST_SIZE, QuoteType.OPEN_INT]:
+            return cls._to_int(value)
+        elif quote_type == QuoteType.IMPL_VOL:
+            float_value = cls._to_float(value, percentage=True)
             return round(float_value, 4) if float_value is not None else None
         return value
 
+    @classmethod
+    def numeric_value(cls, quote_type: Union[str, QuoteType], value: Any) -> Union[float, None]:
+        """Parse a raw RTD value into the float kept by the columnar quote store."""
+        converted = cls._convert(cls._parse_quote_type(quote_type), value)
+        if converted is None or isinstance(converted, float):
+            return converted
+        return cls._to_float(converted)
+
     @staticmethod
     def _to_float(value: Any, percentage: bool = False) -> Union[float, None]:
         try:
@@ -0,0 +1,495 @@
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import sys
+import time
+
+import numpy as np
+
+from src.core.logger import get_logger
+from src.utils.value_parser import parse_batch, parse_kind
+
+
+logger = get_logger(__name__)
+
+# Pseudo quote type under which drain_changes() reports a symbol's newest
+# value change (epoch seconds)
+LAST_CHANGED_FIELD = 'LAST_CHANGED'
+
+class QuoteStore:
+    """
+    Columnar latest-value store for RTD topics.
+
+    Symbols map to rows and quote types map to columns of preallocated
+    NumPy arrays holding the latest value, the time it arrived and an
+    update counter. Topic IDs resolve to their (row, column) slot through
+    dense index arrays, so the refresh path writes straight into the
+    arrays instead of allocating a Quote per tick.
+
+    Topics whose value changed (or that were removed) since the last
+    drain_changes() call are tracked so publishers can send deltas. A
+    symbol's row is released when its last topic is removed and reused
+    by the next new symbol, so the arrays stay sized to the live chain.
+
+    Each slot also keeps the time its value last changed next to the time
+    it was last seen, so stale_topics() answers "which topics have not
+    updated in N seconds" with one vectorized comparison, on demand
+    rather than on every refresh.
+
+    The parser kind of each topic's quote type is resolved when it is
+    added, so update_batch() parses a whole RefreshData batch without
+    looking up quote types per value.
+
+    Attributes:
+        values (np.ndarray): Latest value per slot, NaN until one arrives
+        timestamps (np.ndarray): Arrival time of the latest value (int64 epoch
+                                 nanoseconds, 0 until one arrives)
+        changed_at (np.ndarray): Time the value last changed (int64 epoch
+                                 nanoseconds, the subscription time until
+                                 a value arrives, 0 for free slots)
+        update_counts (np.ndarray): Number of updates received per slot (uint32)
+    """
+
+    def __init__(self, row_capacity: int = 256, column_capacity: int = 16) -> None:
+        """
+        Initialize an empty store.
+
+        Args:
+            row_capacity: Initial number of symbol rows to preallocate
+            column_capacity: Initial number of quote type columns to preallocate
+        """
+        self._lock = Lock()
+
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._quote_types: List[str] = []
+
+        self.values = np.full((row_capacity, column_capacity), np.nan, dtype=np.float64)
+        self.timestamps = np.zeros((row_capacity, column_capacity), dtype=np.int64)
+        self.changed_at = np.zeros((row_capacity, column_capacity), dtype=np.int64)
+        self.update_counts = np.zeros((row_capacity, column_capacity), dtype=np.uint32)
+
+        # topic_id -> slot, -1 where the topic is unknown
+        self._topic_rows = np.full(1024, -1, dtype=np.int32)
+        self._topic_cols = np.full(1024, -1, dtype=np.int32)
+        self._topic_kinds = np.zeros(1024, dtype=np.int8)
+        self._topic_keys: Dict[int, str] = {}
+
+        # Change tracking for delta publishing
+        self._dirty: Set[int] = set()
+        self._removed_keys: List[str] = []
+        # Subscribed topics per symbol row, to tell when a symbol is gone
+        self._row_topics = np.zeros(row_capacity, dtype=np.int32)
+        self._removed_symbols: List[str] = []
+        # Rows released by removed symbols, reused before new rows
+        self._free_rows: List[int] = []
+
+    @property
+    def lock(self) -> Lock:
+        """
+        Lock guarding the arrays.
+
+        Hold it while reading views returned by column() so the writer
+        cannot grow (and reallocate) the arrays underneath the reader.
+        """
+        return self._lock
+
+    def add_topic(self, topic_id: int, symbol: str, quote_type: str) -> Tuple[int, int]:
+        """
+        Assign a slot to a subscribed topic.
+
+        Args:
+            topic_id: Topic ID used with the RTD server
+            symbol: Trading symbol
+            quote_type: Quote type string
+
+        Returns:
+            tuple: (row, column) slot of the topic
+        """
+        symbol = sys.intern(symbol)
+        quote_type = sys.intern(quote_type)
+        with self._lock:
+            row = self._rows.get(symbol)
+            if row is None and self._free_rows:
+                row = self._free_rows.pop()
+                self._rows[symbol] = row
+                self._symbols[row] = symbol
+            elif row is None:
+                row = len(self._symbols)
+                self._ensure_capacity(row + 1, len(self._quote_types))
+                self._rows[symbol] = row
+                self._symbols.append(symbol)
+
+            col = self._columns.get(quote_type)
+            if col is None:
+                col = len(self._quote_types)
+                self._ensure_capacity(len(self._symbols), col + 1)
+                self._columns[quote_type] = col
+                self._quote_types.append(quote_type)
+
+            if topic_id >= len(self._topic_rows):
+                size = max(topic_id + 1, 2 * len(self._topic_rows))
+                self._topic_rows = self._grow_index(self._topic_rows, size)
+                self._topic_cols = self._grow_index(self._topic_cols, size)
+                kinds = np.zeros(size, dtype=np.int8)
+                kinds[:len(self._topic_kinds)] = self._topic_kinds
+                self._topic_kinds = kinds
+
+            if topic_id in self._topic_keys:
+                self._row_topics[self._topic_rows[topic_id]] -= 1
+            self._row_topics[row] += 1
+            self._topic_rows[topic_id] = row
+            self._topic_cols[topic_id] = col
+            self._topic_kinds[topic_id] = parse_kind(quote_type)
+            self.changed_at[row, col] = time.time_ns()
+            key = f"{symbol}:{quote_type}"
+            self._topic_keys[topic_id] = key
+            if self._removed_keys and key in self._removed_keys:
+                # Re-subscribed before the removal was published: readers
+                # keep the last value until a new one arrives
+                self._removed_keys.remove(key)
+            return row, col
+
+    def remove_topic(self, topic_id: int) -> None:
+        """
+        Release a topic's slot and forget its last value.
+
+        Args:
+            topic_id: Topic ID to remove
+        """
+        with self._lock:
+            if topic_id not in self._topic_keys:
+                return
+            row = int(self._topic_rows[topic_id])
+            col = self._topic_cols[topic_id]
+            self.values[row, col] = np.nan
+            self.timestamps[row, col] = 0
+            self.changed_at[row, col] = 0
+            self.update_counts[row, col] = 0
+            self._topic_rows[topic_id] = -1
+            self._topic_cols[topic_id] = -1
+            self._dirty.discard(topic_id)
+            self._removed_keys.append(self._topic_keys.pop(topic_id))
+            self._row_topics[row] -= 1
+            if not self._row_topics[row]:
+                # Every slot of the row has been reset; hand it to the next symbol
+                symbol = self._symbols[row]
+                self._removed_symbols.append(symbol)
+                del self._rows[symbol]
+                self._symbols[row] = ''
+                self._free_rows.append(row)
+
+    def update(self, topic_id: int, value: float, timestamp: Optional[float] = None) -> Optional[bool]:
+        """
+        Write the latest value for a topic.
+
+        Args:
+            topic_id: Topic ID the value belongs to
+            value: Parsed numeric value
+            timestamp: Arrival time (epoch seconds), defaults to now
+
+        Returns:
+            bool: True if the value changed, None if the topic is unknown
+        """
+        with self._lock:
+            if topic_id >= len(self._topic_rows):
+                return None
+            row = self._topic_rows[topic_id]
+            if row < 0:
+                return None
+            col = self._topic_cols[topic_id]
+
+            old_value = self.values[row, col]
+            now_ns = int(timestamp * 1e9) if timestamp else time.time_ns()
+            self.values[row, col] = value
+            self.timestamps[row, col] = now_ns
+            self.update_counts[row, col] += 1
+            changed = bool(old_value != value)
+            if changed:
+                self.changed_at[row, col] = now_ns
+                self._dirty.add(topic_id)
+            return changed
+
+    def update_batch(self, topic_ids: Sequence[int], raw_values: Sequence[Any], timestamp: float) -> np.ndarray:
+        """
+        Parse and write a whole RefreshData batch.
+
+        Unknown topics and values that do not parse ('N/A', '!N/A') are
+        skipped. If a topic appears more than once, its last value wins.
+
+        Args:
+            topic_ids: Topic IDs as received
+            raw_values: Raw values as received
+            timestamp: Arrival time of the batch (epoch seconds)
+
+        Returns:
+            np.ndarray: IDs of the topics whose value changed
+        """
+        ids = np.asarray(topic_ids, dtype=np.int64)
+        with self._lock:
+            known = (ids >= 0) & (ids < len(self._topic_rows))
+            rows = np.full(len(ids), -1, dtype=np.int64)
+            rows[known] = self._topic_rows[ids[known]]
+            known = rows >= 0
+            if not known.all():
+                ids = ids[known]
+                rows = rows[known]
+                raw_values = [value for value, ok in zip(raw_values, known) if ok]
+
+            values = parse_batch(raw_values, self._topic_kinds[ids])
+            valid = ~np.isnan(values)
+            if not valid.all():
+                ids, rows, values = ids[valid], rows[valid], values[valid]
+            if not len(ids):
+                return ids
+            cols = self._topic_cols[ids]
+
+            changed = self.values[rows, cols] != values
+            now_ns = int(timestamp * 1e9)
+            self.values[rows, cols] = values
+            self.timestamps[rows, cols] = now_ns
+            self.changed_at[rows[changed], cols[changed]] = now_ns
+            np.add.at(self.update_counts, (rows, cols), 1)
+            changed_ids = ids[changed]
+            self._dirty.update(changed_ids.tolist())
+            return changed_ids
+
+    def get(self, symbol: str, quote_type: str) -> Optional[float]:
+        """
+        Get the latest value for a symbol and quote type.
+
+        Args:
+            symbol: Trading symbol
+            quote_type: Quote type string
+
+        Returns:
+            float: Latest value, None if nothing has been received
+        """
+        with self._lock:
+            row = self._rows.get(symbol)
+            col = self._columns.get(quote_type)
+            if row is None or col is None:
+                return None
+            value = self.values[row, col]
+            return None if np.isnan(value) else float(value)
+
+    def column(self, quote_type: str) -> np.ndarray:
+        """
+        Get a zero-copy view of one quote type across all symbol rows.
+
+        The view is only valid until the store grows; hold lock while
+        using it if subscriptions may change concurrently.
+
+        Args:
+            quote_type: Quote type string
+
+        Returns:
+            np.ndarray: View of values, aligned with rows_for()
+
+        Raises:
+            KeyError: If the quote type has never been subscribed
+        """
+        col = self._columns[quote_type]
+        return self.values[:len(self._symbols), col]
+
+    def rows_for(self, symbols: Iterable[str]) -> np.ndarray:
+        """
+        Map symbols to their row indexes.
+
+        Args:
+            symbols: Trading symbols
+
+        Returns:
+            np.ndarray: Row index per symbol, -1 for unknown symbols
+        """
+        rows = self._rows
+        return np.fromiter((rows.get(sym, -1) for sym in symbols), dtype=np.int64)
+
+    def take(self, symbols: Iterable[str], quote_type: str) -> np.ndarray:
+        """
+        Gather values of one quote type for a list of symbols.
+
+        Args:
+            symbols: Trading symbols
+            quote_type: Quote type string
+
+        Returns:
+            np.ndarray: Values aligned with symbols, NaN where missing
+        """
+        with self._lock:
+            rows = self.rows_for(symbols)
+            result = np.full(len(rows), np.nan, dtype=np.float64)
+            col = self._columns.get(quote_type)
+            if col is None:
+                return result
+            known = rows >= 0
+            result[known] = self.values[rows[known], col]
+            return result
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Build a {"symbol:QUOTE_TYPE": value} mapping of all received values.
+
+        Returns:
+            dict: Latest value per topic key, topics without data omitted
+        """
+        with self._lock:
+            if not self._topic_keys:
+                return {}
+            return self._collect(self._topic_keys.keys())
+
+    def drain_changes(self, last_changed_field: Optional[str] = None) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Collect and reset the topics changed since the previous call.
+
+        Args:
+            last_changed_field: If given, also report for every symbol with a
+                                changed topic its newest change time (epoch
+                                seconds) under "symbol:<last_changed_field>",
+                                and remove that key once the symbol's last
+                                topic is removed.
+
+        Returns:
+            tuple: ({"symbol:QUOTE_TYPE": value} of changed topics,
+                    list of keys of topics removed since the previous call)
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            removed, self._removed_keys = self._removed_keys, []
+            removed_symbols, self._removed_symbols = self._removed_symbols, []
+            changes = self._collect(dirty)
+            if last_changed_field and dirty:
+                rows = np.unique(self._topic_rows[np.fromiter(dirty, dtype=np.int64)])
+                newest = self.changed_at[rows, :len(self._quote_types)].max(axis=1) / 1e9
+                symbols = self._symbols
+                for row, changed_at in zip(rows.tolist(), newest.tolist()):
+                    changes[f"{symbols[row]}:{last_changed_field}"] = changed_at
+            if last_changed_field and removed_symbols:
+                # Symbols subscribed again since their removal keep the key
+                removed.extend(
+                    f"{symbol}:{last_changed_field}" for symbol in dict.fromkeys(removed_symbols)
+                    if symbol not in self._rows
+                )
+            return changes, removed
+
+    def stale_topics(self, max_age: float, now: Optional[float] = None, changed: bool = True) -> np.ndarray:
+        """
+        Find subscribed topics that have not updated in max_age seconds.
+
+        One vectorized comparison over the subscribed slots; nothing is
+        scanned per refresh. Topics that never received a value count
+        from the time they were subscribed.
+
+        Args:
+            max_age: Age in seconds
+            now: Reference time (epoch seconds), defaults to now
+            changed: True to age by the last value change, False by the
+                     last time any value (even an unchanged one) arrived
+
+        Returns:
+            np.ndarray: IDs of the stale topics
+        """
+        cutoff = (int(now * 1e9) if now else time.time_ns()) - int(max_age * 1e9)
+        with self._lock:
+            ids = np.flatnonzero(self._topic_rows >= 0)
+            rows = self._topic_rows[ids]
+            cols = self._topic_cols[ids]
+            last = self.changed_at[rows, cols]
+            if not changed:
+                last = np.maximum(last, self.timestamps[rows, cols])
+            return ids[last < cutoff]
+
+    def entries(self, topic_ids: Iterable[int]) -> Tuple[List[str], List[float], List[float]]:
+        """
+        Get the keys, latest values and arrival times of topics.
+
+        Args:
+            topic_ids: Subscribed topic IDs
+
+        Returns:
+            tuple: (keys, values, timestamps in epoch seconds) aligned lists,
+                   unknown topics omitted
+        """
+        with self._lock:
+            keys = self._topic_keys
+            ids = np.fromiter((i for i in topic_ids if i in keys), dtype=np.int64)
+            if not len(ids):
+                return [], [], []
+            rows = self._topic_rows[ids]
+            cols = self._topic_cols[ids]
+            return (
+                [keys[topic_id] for topic_id in ids.tolist()],
+                self.values[rows, cols].tolist(),
+                (self.timestamps[rows, cols] / 1e9).tolist(),
+            )
+
+    def _collect(self, topic_ids: Iterable[int]) -> Dict[str, float]:
+        """Build the key -> value mapping for topic IDs; caller holds the lock."""
+        ids = np.fromiter(topic_ids, dtype=np.int64)
+        if not len(ids):
+            return {}
+        values = self.values[self._topic_rows[ids], self._topic_cols[ids]].tolist()
+        keys = self._topic_keys
+        return {
+            keys[topic_id]: value
+            for topic_id, value in zip(ids.tolist(), values)
+            if value == value  # skip NaN
+        }
+
+    def clear(self) -> None:
+        """Drop all topics and values."""
+        with self._lock:
+            self._rows.clear()
+            self._columns.clear()
+            self._symbols.clear()
+            self._quote_types.clear()
+            self._topic_keys.clear()
+            self._dirty.clear()
+            self._removed_keys.clear()
+            self._removed_symbols.clear()
+            self._free_rows.clear()
+            self._row_topics.fill(0)
+            self.values.fill(np.nan)
+            self.timestamps.fill(0)
+            self.changed_at.fill(0)
+            self.update_counts.fill(0)
+            self._topic_rows.fill(-1)
+            self._topic_cols.fill(-1)
+            self._topic_kinds.fill(0)
+
+    def __len__(self) -> int:
+        return len(self._topic_keys)
+
+    def _ensure_capacity(self, rows: int, cols: int) -> None:
+        """Grow the value arrays (doubling) to hold at least rows x cols."""
+        cur_rows, cur_cols = self.values.shape
+        if rows <= cur_rows and cols <= cur_cols:
+            return
+
+        new_rows = cur_rows if rows <= cur_rows else max(rows, 2 * cur_rows)
+        new_cols = cur_cols if cols <= cur_cols else max(cols, 2 * cur_cols)
+
+        values = np.full((new_rows, new_cols), np.nan, dtype=np.float64)
+        timestamps = np.zeros((new_rows, new_cols), dtype=np.int64)
+        changed_at = np.zeros((new_rows, new_cols), dtype=np.int64)
+        update_counts = np.zeros((new_rows, new_cols), dtype=np.uint32)
+        values[:cur_rows, :cur_cols] = self.values
+        timestamps[:cur_rows, :cur_cols] = self.timestamps
+        changed_at[:cur_rows, :cur_cols] = self.changed_at
+        update_counts[:cur_rows, :cur_cols] = self.update_counts
+        if new_rows > cur_rows:
+            row_topics = np.zeros(new_rows, dtype=np.int32)
+            row_topics[:cur_rows] = self._row_topics
+            self._row_topics = row_topics
+
+        self.values = values
+        self.timestamps = timestamps
+        self.changed_at = changed_at
+        self.update_counts = update_counts
+        logger.debug(f"Quote store grown to {new_rows} rows x {new_cols} columns")
+
+    @staticmethod
+    def _grow_index(index: np.ndarray, size: int) -> np.ndarray:
+        grown = np.full(size, -1, dtype=index.dtype)
+        grown[:len(index)] = index
+        return grown
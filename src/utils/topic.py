@@ -1,6 +1,9 @@
-import hashlib
+from collections import deque
+from collections.abc import MutableMapping
+import sys
+import time
 from threading import Lock
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from src.core.logger import get_logger
 from src.utils.quote import Quote, QuoteType
@@ -8,19 +11,156 @@ from src.utils.quote import Quote, QuoteType
 
 logger = get_logger(__name__)
 
-def generate_topic_id(quote_type: str, symbol: str) -> int:
+class TopicRegistry(MutableMapping):
     """
-    Generate a unique topic ID for a quote type and symbol combination.
-    
-    Args:
-        quote_type: Type of quote
-        symbol: Trading symbol
-        
-    Returns:
-        int: Unique topic ID
+    Registry of active topic subscriptions.
+
+    Topic IDs come from a counter, so two topics can never share an ID no
+    matter how large the chain is. IDs of removed topics are reused once
+    they have been free for reuse_delay seconds, which keeps IDs (and the
+    QuoteStore index arrays sized by them) bounded by the number of live
+    topics instead of growing with every strike or expiry change. A reverse
+    (symbol, quote_type) index and per-symbol / per-quote-type counters are
+    maintained as topics are added and removed, which keeps lookups and
+    stats O(1).
+
+    Behaves like the Dict[int, Tuple[str, str]] of topic ID to
+    (symbol, quote_type) it replaces.
     """
-    value = f"{quote_type}:{symbol}"
-    return int(hashlib.md5(value.encode()).hexdigest(), 16) % (2**16)
+
+    def __init__(self, first_id: int = 1, reuse_delay: float = 60.0) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            first_id: First topic ID handed out by allocate()
+            reuse_delay: Seconds a removed topic's ID stays unused
+        """
+        self._next_id = first_id
+        self.reuse_delay = reuse_delay
+        # (release time, topic ID) in release order
+        self._free: Deque[Tuple[float, int]] = deque()
+        self._by_id: Dict[int, Tuple[str, str]] = {}
+        self._by_key: Dict[Tuple[str, str], int] = {}
+        self._symbol_counts: Dict[str, int] = {}
+        self._quote_type_counts: Dict[str, int] = {}
+
+    def allocate(self) -> int:
+        """
+        Reserve a new topic ID.
+
+        The oldest released ID is reused once it has been free for
+        reuse_delay seconds, long enough that late RefreshData values for
+        a topic that was just disconnected cannot be attributed to a newer
+        one; otherwise a new ID is taken from the counter.
+
+        Returns:
+            int: Unused topic ID
+        """
+        free = self._free
+        while free and free[0][0] <= time.monotonic() - self.reuse_delay:
+            _, topic_id = free.popleft()
+            if topic_id not in self._by_id:
+                return topic_id
+        topic_id = self._next_id
+        self._next_id += 1
+        return topic_id
+
+    def release(self, topic_id: int) -> None:
+        """
+        Return an allocated ID that was never registered (e.g. ConnectData failed).
+
+        Args:
+            topic_id: ID from allocate()
+        """
+        self._free.append((time.monotonic(), topic_id))
+
+    def find(self, symbol: str, quote_type: str) -> Optional[int]:
+        """
+        Find the topic ID of a symbol and quote type.
+
+        Args:
+            symbol: Trading symbol
+            quote_type: Quote type string
+
+        Returns:
+            int: Topic ID if registered, None otherwise
+        """
+        return self._by_key.get((symbol, quote_type))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get statistics about registered topics.
+
+        Returns:
+            dict: Total topics, unique symbols and quote types count
+        """
+        return {
+            'total_topics': len(self._by_id),
+            'unique_symbols': len(self._symbol_counts),
+            'quote_types_count': len(self._quote_type_counts)
+        }
+
+    def subscriptions(self) -> List[Tuple[str, str]]:
+        """
+        Get all registered (symbol, quote_type) pairs.
+
+        Returns:
+            list: List of (symbol, quote_type) tuples
+        """
+        return list(self._by_key)
+
+    def __getitem__(self, topic_id: int) -> Tuple[str, str]:
+        return self._by_id[topic_id]
+
+    def __setitem__(self, topic_id: int, topic: Tuple[str, str]) -> None:
+        if topic_id in self._by_id:
+            del self[topic_id]
+        # Interned, so every structure keyed by a symbol shares one string
+        symbol, quote_type = topic = (sys.intern(str(topic[0])), sys.intern(str(topic[1])))
+        existing = self._by_key.get(topic)
+        if existing is not None:
+            raise ValueError(f"{topic[0]} {topic[1]} already registered as topic {existing}")
+
+        self._by_id[topic_id] = topic
+        self._by_key[topic] = topic_id
+        self._symbol_counts[symbol] = self._symbol_counts.get(symbol, 0) + 1
+        self._quote_type_counts[quote_type] = self._quote_type_counts.get(quote_type, 0) + 1
+        if topic_id >= self._next_id:
+            self._next_id = topic_id + 1
+
+    def __delitem__(self, topic_id: int) -> None:
+        topic = self._by_id.pop(topic_id)
+        del self._by_key[topic]
+        symbol, quote_type = topic
+        self._decrement(self._symbol_counts, symbol)
+        self._decrement(self._quote_type_counts, quote_type)
+        self.release(topic_id)
+
+    def __contains__(self, topic_id: object) -> bool:
+        return topic_id in self._by_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def clear(self) -> None:
+        released = time.monotonic()
+        self._free.extend((released, topic_id) for topic_id in self._by_id)
+        self._by_id.clear()
+        self._by_key.clear()
+        self._symbol_counts.clear()
+        self._quote_type_counts.clear()
+
+    @staticmethod
+    def _decrement(counts: Dict[str, int], key: str) -> None:
+        remaining = counts[key] - 1
+        if remaining:
+            counts[key] = remaining
+        else:
+            del counts[key]
 
 def find_topic_id(topics: Dict[int, Tuple[str, str]], 
                  symbol: str, quote_type: str) -> Optional[int]:
@@ -35,6 +175,8 @@ def find_topic_id(topics: Dict[int, Tuple[str, str]],
     Returns:
         int: Topic ID if found, None otherwise
     """
+    if isinstance(topics, TopicRegistry):
+        return topics.find(symbol, quote_type)
     for id, (sym, qt) in topics.items():
         if sym == symbol and qt == quote_type:
             return id
@@ -50,6 +192,9 @@ def get_topic_stats(topics: Dict[int, Tuple[str, str]]) -> Dict[str, int]:
     Returns:
         dict: Statistics including total topics, unique symbols, and quote types
     """
+    if isinstance(topics, TopicRegistry):
+        return topics.stats()
+
     symbols: Set[str] = set()
     quote_types: Set[str] = set()
     
@@ -73,6 +218,8 @@ def get_subscriptions(topics: Dict[int, Tuple[str, str]]) -> List[Tuple[str, str
     Returns:
         list: List of (symbol, quote_type) tuples
     """
+    if isinstance(topics, TopicRegistry):
+        return topics.subscriptions()
     return [(symbol, quote_type) for symbol, quote_type in topics.values()]
 
 def is_subscribed(topics: Dict[int, Tuple[str, str]], 
@@ -0,0 +1,113 @@
+from typing import Any, Callable, Optional, Sequence, Union
+
+import numpy as np
+
+from config.quote_types import QuoteType
+
+
+# Parser kinds, resolved once per subscribed topic
+PARSE_FLOAT = 0
+PARSE_INT = 1
+PARSE_IMPL_VOL = 2
+
+_INT_TYPES = {
+    QuoteType.VOLUME.value, QuoteType.ASK_SIZE.value, QuoteType.BID_SIZE.value,
+    QuoteType.LAST_SIZE.value, QuoteType.OPEN_INT.value,
+}
+_NULL_VALUES = frozenset(('N/A', '!N/A'))
+
+
+def parse_kind(quote_type: Union[str, QuoteType]) -> int:
+    """
+    Get the parser kind of a quote type.
+
+    Matches Quote.numeric_value: size/volume/open interest types are
+    truncated to whole numbers, IMPL_VOL is rounded to 4 places and
+    everything else is a plain float.
+
+    Args:
+        quote_type: Quote type or its string
+
+    Returns:
+        int: PARSE_FLOAT, PARSE_INT or PARSE_IMPL_VOL
+    """
+    name = quote_type.value if isinstance(quote_type, QuoteType) else str(quote_type).upper()
+    if name in _INT_TYPES:
+        return PARSE_INT
+    if name == QuoteType.IMPL_VOL.value:
+        return PARSE_IMPL_VOL
+    return PARSE_FLOAT
+
+
+def parse_float(raw: Any) -> Optional[float]:
+    """Parse a raw RTD value to float; None for 'N/A', '!N/A' and junk."""
+    if type(raw) is float:
+        return raw
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        if raw in _NULL_VALUES:
+            return None
+        raw = raw.rstrip('%')
+    try:
+        return float(raw)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_int(raw: Any) -> Optional[float]:
+    """Parse a raw RTD value truncated to a whole number (as float)."""
+    value = parse_float(raw)
+    return None if value is None else float(int(value))
+
+
+def parse_impl_vol(raw: Any) -> Optional[float]:
+    """Parse a raw implied volatility ('18.25%' or 18.25), rounded to 4 places."""
+    value = parse_float(raw)
+    return None if value is None else round(value, 4)
+
+
+CONVERTERS = {
+    PARSE_FLOAT: parse_float,
+    PARSE_INT: parse_int,
+    PARSE_IMPL_VOL: parse_impl_vol,
+}
+
+
+def converter_for(quote_type: Union[str, QuoteType]) -> Callable[[Any], Optional[float]]:
+    """Get the scalar converter of a quote type."""
+    return CONVERTERS[parse_kind(quote_type)]
+
+
+def parse_batch(raw_values: Sequence[Any], kinds: np.ndarray) -> np.ndarray:
+    """
+    Parse a RefreshData raw_values tuple into a float64 column.
+
+    All-numeric batches convert in a single NumPy call. Batches holding
+    strings ('N/A', '!N/A', '18.25%') fall back to one parse_float() per
+    value. Whole-number and IMPL_VOL rounding is then applied per kind
+    with vectorized operations.
+
+    Args:
+        raw_values: Values as received from RefreshData
+        kinds: Parser kind per value (see parse_kind)
+
+    Returns:
+        np.ndarray: Parsed values, NaN where no value could be parsed
+    """
+    try:
+        values = np.array(raw_values, dtype=np.float64)
+    except (ValueError, TypeError):
+        values = np.fromiter(
+            (np.nan if v is None else v for v in map(parse_float, raw_values)),
+            dtype=np.float64,
+            count=len(raw_values),
+        )
+
+    ints = kinds == PARSE_INT
+    if ints.any():
+        values[ints] = np.trunc(values[ints])
+    vols = kinds == PARSE_IMPL_VOL
+    if vols.any():
+        values[vols] = np.round(values[vols], 4)
+    return values
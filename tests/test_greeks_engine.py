@@ -0,0 +1,13 @@
+from datetime import date
+
+import numpy as np
+
+from src.analytics.greeks_engine import LocalGreeksEngine
+from src.analytics.zero_gamma import expiry_close
+
+
+def test_contract_expiry_is_new_york_close():
+    engine = LocalGreeksEngine(rate=0.0)
+    engine.set_contracts(['SPX', '.SPXW260320C5800', '.SPXW260320P5800'])
+    assert engine.stats['contracts'] == 2
+    np.testing.assert_array_equal(engine._expiries, expiry_close(date(2026, 3, 20)))
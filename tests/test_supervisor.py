@@ -0,0 +1,62 @@
+import time
+
+from src.rtd.supervisor import HeartbeatSupervisor
+from src.utils.quote_store import QuoteStore
+from src.utils.topic import TopicRegistry
+
+
+class FakeClient:
+    """Just what resubscribe_stale() touches: topics, store and batch (un)subscribe."""
+
+    def __init__(self):
+        self.topics = TopicRegistry()
+        self.store = QuoteStore()
+        self.unsubscribed = []
+        self.subscribed = []
+
+    def add(self, symbol, quote_type):
+        topic_id = self.topics.allocate()
+        self.topics[topic_id] = (symbol, quote_type)
+        self.store.add_topic(topic_id, symbol, quote_type)
+        return topic_id
+
+    def batch_unsubscribe(self, topics):
+        self.unsubscribed.extend(topics)
+
+    def batch_subscribe(self, topics):
+        self.subscribed.extend(topics)
+        return {topic: True for topic in topics}
+
+
+def make_supervisor():
+    supervisor = HeartbeatSupervisor()
+    supervisor.resubscribe = True
+    supervisor.resubscribe_after = 120
+    supervisor.stale_check_interval = 0
+    supervisor.static_quote_types = {'OPEN_INT'}
+    return supervisor
+
+
+def test_static_open_interest_is_not_churned():
+    client = FakeClient()
+    start = time.time()
+    open_int = client.add('.SPXW260320C5800', 'OPEN_INT')
+    gamma = client.add('.SPXW260320C5800', 'GAMMA')
+    client.store.update(open_int, 1200.0, start)
+
+    now = start + 600
+    client.store.update(gamma, 0.01, now - 5)  # ticking
+    assert make_supervisor().resubscribe_stale(client, now) == 0
+    assert client.unsubscribed == client.subscribed == []
+
+
+def test_symbol_with_all_ticking_fields_stale_is_resubscribed():
+    client = FakeClient()
+    start = time.time()
+    open_int = client.add('.SPXW260320C5800', 'OPEN_INT')
+    client.add('.SPXW260320C5800', 'GAMMA')
+    client.add('.SPXW260320C5800', 'IMPL_VOL')
+    client.store.update(open_int, 1200.0, start)
+
+    assert make_supervisor().resubscribe_stale(client, start + 600) == 2
+    assert sorted(client.subscribed) == [('GAMMA', '.SPXW260320C5800'), ('IMPL_VOL', '.SPXW260320C5800')]
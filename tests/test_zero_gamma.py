@@ -0,0 +1,32 @@
+from datetime import date, datetime, timezone
+import time
+
+import pytest
+
+from src.analytics.zero_gamma import SECONDS_PER_YEAR, expiry_close, time_to_expiry
+
+
+@pytest.fixture(params=['America/Los_Angeles', 'Europe/Berlin', 'UTC'])
+def machine_timezone(request, monkeypatch):
+    """Run with the process in a timezone other than New York."""
+    if not hasattr(time, 'tzset'):
+        pytest.skip("time.tzset is not available on this platform")
+    monkeypatch.setenv('TZ', request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize('expiry, close_utc', [
+    (date(2026, 1, 16), datetime(2026, 1, 16, 21, tzinfo=timezone.utc)),  # EST
+    (date(2026, 3, 20), datetime(2026, 3, 20, 20, tzinfo=timezone.utc)),  # EDT
+])
+def test_expiry_close_is_4pm_new_york(machine_timezone, expiry, close_utc):
+    assert expiry_close(expiry) == close_utc.timestamp()
+
+
+def test_time_to_expiry_pinned_now(machine_timezone):
+    close = datetime(2026, 3, 20, 20, tzinfo=timezone.utc).timestamp()
+    assert time_to_expiry(date(2026, 3, 20), now=close - 3600) == pytest.approx(3600 / SECONDS_PER_YEAR)
+    assert time_to_expiry(date(2026, 3, 20), now=close + 60) == 0.0